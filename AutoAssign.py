@@ -10,111 +10,237 @@ This also handles generating new instances of chores which repeat.
 """
 
 # other modules in the software
+import ChoreViews
 import DataInput
+import Forecast
+import Recurrence
 from DataInput import CHORE_STATUS, Chore
 
+# instrumentation
+import Metrics
+
 # python libraries
-import re
-from datetime import datetime, timedelta, date
+import copy
+import os
+from datetime import timedelta, date
+
+# enhanced typing
+from typing import Union
+
+# Whether the assignment also balances the repeating chores projected by Forecast.py, by default
+USE_FORECAST = os.environ.get('HAUS_ASSIGN_WITH_FORECAST', '').lower() in ('1', 'true', 'yes', 'on')
 
-def assign_unassigned_chores() -> None:
+# Whether the assignment also balances the minutes of each category between users (see balance_chores), by default
+BALANCE_BY_CATEGORY = os.environ.get('HAUS_ASSIGN_BY_CATEGORY', '').lower() in ('1', 'true', 'yes', 'on')
+
+# A user's workload counts the chores due this many days before or after today
+WORKLOAD_WINDOW_DAYS = 7
+
+@Metrics.timed('assign_unassigned_chores')
+def assign_unassigned_chores(today: Union[date, None] = None, use_forecast: Union[bool, None] = None,
+                             by_category: Union[bool, None] = None) -> None:
     """
     Find unassigned chores and assign them to users based on workload.
+    With use_forecast (USE_FORECAST if not given), each user's workload also includes the repeating chores
+    projected for the coming days (see Forecast.py), so that load is balanced over the whole horizon.
+    With by_category (BALANCE_BY_CATEGORY if not given), each category is also balanced between users,
+    so that the same user does not get all the chores of a category.
+    Open chores still assigned to someone who is no longer an occupant (e.g. when offboard_occupant
+    was interrupted between the removal and the rebalance) are released and assigned as well.
+    """
+    if ChoreViews.views.open_assignee_ids() - set(DataInput.get_user_ids()):
+        rebalance_departed_chores(today)
+        return
+    # read the chores and the workloads from the same version of the chores CSV
+    with DataInput.snapshot_reads():
+        # Check if there are any unassigned chores
+        unassigned_chores = DataInput.get_chores_by_filters(status=CHORE_STATUS.UNASSIGNED)
+        if not unassigned_chores:
+            # No unassigned chores
+            print("Called assign_chores() but no unassigned chores found")
+            return
+        # Get the workload of each user, reading the date once for the whole assignment
+        if today is None:
+            today = DataInput.today()
+        if use_forecast is None:
+            use_forecast = USE_FORECAST
+        if by_category is None:
+            by_category = BALANCE_BY_CATEGORY
+        projected_workloads = Forecast.forecast.loads(today) if use_forecast else {}
+        if by_category:
+            workloads, category_workloads = user_category_workloads(DataInput.get_user_ids(), today)
+        else:
+            workloads, category_workloads = user_workloads(DataInput.get_user_ids(), today), None
+    for user_id in workloads:
+        workloads[user_id] += projected_workloads.get(user_id, 0)
+    balance_chores(unassigned_chores, workloads, category_workloads)
+    # store every assignment in a single write
+    DataInput.save_chores(updated_chores=unassigned_chores)
+
+def balance_chores(chores: list[Chore], workloads: dict[str, int],
+                   category_workloads: Union[dict[str, dict[str, int]], None] = None) -> None:
+    """
+    Assign each chore (longest first) to the user with the lowest workload so far.
+    workloads maps the IDs of the users to choose from to their current workload.
+    With category_workloads (see user_category_workloads), each chore goes to the user with the lowest workload
+    in the chore's category instead, and among those, to the one with the lowest workload overall.
+    The chores are only changed in memory: storing them is up to the caller.
     """
-    # Check if there are any unassigned chores
-    unassigned_chores = DataInput.get_chores_by_filters(status=CHORE_STATUS.UNASSIGNED)
-    if not unassigned_chores:
-        # No unassigned chores
-        print("Called assign_chores() but no unassigned chores found")
+    # copies, updated as chores are assigned
+    workloads = dict(workloads)
+    if not workloads:
         return
-    # Get the workload of each user
-    workloads = []
-    for user_id in DataInput.get_user_ids():
-        # append a (user_id, workload) tuple to the workloads list
-        workloads.append((user_id, user_workload(user_id)))
+    if category_workloads is not None:
+        category_workloads = {category: dict(loads) for category, loads in category_workloads.items()}
     # Sort the chores by expected duration, descending
-    unassigned_chores.sort(key=lambda x: x.expected_duration, reverse=True)
-    for chore in unassigned_chores:
-        # Assign the chore to the user with the lowest workload
-        workloads.sort(key=lambda x: x[1])
-        assign_chore(chore, workloads[0][0])
+    chores.sort(key=lambda x: x.expected_duration, reverse=True)
+    for chore in chores:
+        # Assign the chore to the user with the lowest workload (the first such user, on ties)
+        if category_workloads is None:
+            assignee_id = min(workloads, key=workloads.get)
+        else:
+            category_loads = category_workloads.setdefault(chore.category, {})
+            assignee_id = min(workloads, key=lambda user_id: (category_loads.get(user_id, 0), workloads[user_id]))
+            category_loads[assignee_id] = category_loads.get(assignee_id, 0) + chore.expected_duration
+        chore.status = CHORE_STATUS.ASSIGNED
+        chore.assignee_id = assignee_id
         # Update the workload of the user who was assigned the chore
-        workloads[0] = (workloads[0][0], workloads[0][1] + chore.expected_duration)
+        workloads[assignee_id] += chore.expected_duration
 
-def assign_chore(chore: Chore, assignee_id: str) -> None:
+@Metrics.timed('user_workload')
+def user_workload(user_id: str, today: Union[date, None] = None) -> int:
     """
-    Assign a chore to a user.
+    Calculate the workload of a given user within the past seven and next seven days (of today, if given).
+    This is entirely based off of the work they are supposed to do, regardless of whether they have done it.
     """
-    # Update the Chore object's status and assignee_id
-    chore.status = CHORE_STATUS.ASSIGNED
-    chore.assignee_id = assignee_id
-    # Update the database using DataInput
-    DataInput.update_chore_by_object(chore)
+    # add up the time it takes to do each chore of the desired timeframe, from the occupant's view
+    week_ago, next_week = workload_window(today)
+    return ChoreViews.views.workload(user_id, week_ago, next_week)
 
-def user_workload(user_id: str) -> int:
+@Metrics.timed('user_workloads')
+def user_workloads(user_ids: list[str], today: Union[date, None] = None) -> dict[str, int]:
     """
-    Calculate the workload of a given user within the past seven and next seven days.
-    This is entirely based off of the work they are supposed to do, regardless of whether they have done it.
+    Calculate the workload (see user_workload) of every given user in a single pass over the chores.
+    Returns a dict mapping each user ID to its workload, in the order of user_ids.
     """
-    # Get chores from the desired timeframe
-    week_ago = (datetime.today() - timedelta(days=7)).date()
-    next_week = (datetime.today() + timedelta(days=7)).date()
-    work_chores = DataInput.get_chores_by_filters(assignee_id=user_id, min_deadline_date=week_ago, max_deadline_date=next_week)
-    # add up the time it takes to do each chore
-    workload = 0
-    for chore in work_chores:
-        workload += chore.expected_duration
-    return workload
+    week_ago, next_week = workload_window(today)
+    return ChoreViews.views.workloads(user_ids, week_ago, next_week)
 
-def renew_repeating_chores() -> None:
+@Metrics.timed('user_category_workloads')
+def user_category_workloads(user_ids: list[str],
+                            today: Union[date, None] = None) -> tuple[dict[str, int], dict[str, dict[str, int]]]:
+    """
+    Calculate the workload (see user_workload) of every given user, and their workload in each category,
+    in the same single pass over the chores.
+    Returns the workloads (as user_workloads does), and a dict mapping each category to the workloads of
+    the users in that category. Users without chores in a category are left out of it.
+    """
+    week_ago, next_week = workload_window(today)
+    workloads = dict.fromkeys(user_ids, 0)
+    category_workloads: dict[str, dict[str, int]] = {}
+    for user_id, loads in ChoreViews.views.category_workloads(user_ids, week_ago, next_week).items():
+        for category, minutes in loads.items():
+            workloads[user_id] += minutes
+            category_workloads.setdefault(category, {})[user_id] = minutes
+    return workloads, category_workloads
+
+def workload_window(today: Union[date, None] = None) -> tuple[date, date]:
+    """Return the earliest and latest deadlines counted in workloads around today (DataInput.today() if not given)."""
+    if today is None:
+        today = DataInput.today()
+    return today - timedelta(days=WORKLOAD_WINDOW_DAYS), today + timedelta(days=WORKLOAD_WINDOW_DAYS)
+
+@Metrics.timed('offboard_occupant')
+def offboard_occupant(username: str) -> bool:
+    """
+    Remove an occupant from the household, then hand their open chores to the remaining occupants
+    (see rebalance_departed_chores). Returns False if there is no occupant with this username.
+    These are two writes: if the process stops in between, the next assignment (see assign_unassigned_chores)
+    hands the chores over instead.
+    This does not verify that the removal is authorized, as that should be left to the login module.
+    """
+    if DataInput.retrieve_occupant_uid_from_username(username, DataInput.OCCUPANTS_FILEPATH) is None:
+        return False
+    DataInput.remove_user(username, DataInput.OCCUPANTS_FILEPATH)
+    rebalance_departed_chores()
+    return True
+
+@Metrics.timed('rebalance_departed_chores')
+def rebalance_departed_chores(today: Union[date, None] = None) -> list[Chore]:
+    """
+    Release the open chores of everyone who is no longer an occupant, and assign them together with
+    the unassigned chores, in a single pass over the chores and a single write.
+    If nobody is left to take them, the released chores become unassigned.
+    Chores that a concurrent request changed in the meantime are left alone.
+    Returns the chores which were released or assigned.
+    """
+    if today is None:
+        today = DataInput.today()
+    week_ago, next_week = workload_window(today)
+    workloads = dict.fromkeys(DataInput.get_user_ids(), 0)
+    category_workloads = {} if BALANCE_BY_CATEGORY else None
+    # (chore as read, chore to update) pairs
+    updates = []
+    for chore in DataInput.iter_chores():
+        if chore.assignee_id in workloads:
+            # counted like user_category_workloads does
+            if chore.deadline_date and week_ago <= chore.deadline_date <= next_week:
+                workloads[chore.assignee_id] += chore.expected_duration
+                if category_workloads is not None:
+                    category_loads = category_workloads.setdefault(chore.category, {})
+                    category_loads[chore.assignee_id] = category_loads.get(chore.assignee_id, 0) + \
+                        chore.expected_duration
+        elif chore.status in (CHORE_STATUS.UNASSIGNED, CHORE_STATUS.ASSIGNED):
+            released_chore = copy.copy(chore)
+            released_chore.status = CHORE_STATUS.UNASSIGNED
+            released_chore.assignee_id = None
+            updates.append((chore, released_chore))
+    balance_chores([chore for _, chore in updates], workloads, category_workloads)
+    skipped = set(DataInput.update_chores_if_unchanged(updates))
+    return [chore for _, chore in updates if chore.id not in skipped]
+
+@Metrics.timed('renew_repeating_chores')
+def renew_repeating_chores(today: Union[date, None] = None) -> None:
     """
     Renew all repeating chores that are ready to be renewed.
-    (i.e. they are both completed and the deadline has passed)
+    (i.e. they are both completed and the deadline has passed, as of today if given)
 
     This also marks these chores as renewed such that they will never be renewed again.
     (instead, the new instance of the chore will be renewed later, when it is completed)
     """
-    def increment_id(old_id: str) -> str:
-        """
-        Given a Chore ID in one of the two following formats, increment the number indicating repetitions.
-        uuid
-        uuid(repetitions)
-        """
-        # make sure the old id is in a valid format (prevent undefined behavior)
-        pattern = r'^[\w-]+(\(\d+\))?$'
-        if not re.match(pattern, old_id):
-            raise ValueError(f"Invalid id format: {old_id}")
-        # no parentheses? add them
-        if "(" not in old_id:
-            return f"{old_id}(1)"
-        # get the unique uuid part and the parentheses part
-        uuid_part, parentheses_part = old_id.split("(")
-        parentheses_part = parentheses_part.split(")")[0]
-        # increment the number and return the new id
-        repetition = int(parentheses_part) + 1
-        return f"{uuid_part}({repetition})"
-
+    # read the date once, for the renewal and the assignment that follows
+    if today is None:
+        today = DataInput.today()
+    renewed_chores = []
+    new_chores = []
+    # find the chores to renew and their planned instances in one scan of the repeating chores
+    # (the instances of a repeating chore repeat as well)
+    repeating_chores = DataInput.get_chores_by_filters(repeating_only=True)
+    existing_ids = {chore.id for chore in repeating_chores}
     # Get all repeating chores that are ready for renewal
-    chores_to_renew: list[Chore] = DataInput.get_chores_by_filters(
-        repeating_only=True,
-        status=CHORE_STATUS.COMPLETED,
-        max_deadline_date=date.today()
-    )
+    chores_to_renew = [chore for chore in repeating_chores if chore.status == CHORE_STATUS.COMPLETED
+                       and chore.deadline_date and chore.deadline_date <= today]
 
     # renew each applicable chore
     for chore in chores_to_renew:
+        next_chore = copy.copy(chore)
         # mark the chore as renewed
         chore.status = CHORE_STATUS.RENEWED
-        DataInput.update_chore_by_object(chore)
+        renewed_chores.append(chore)
+        # the next instance may already have been planned ahead by Recurrence.materialize_upcoming
+        next_chore.id = Recurrence.increment_id(chore.id)
+        if next_chore.id in existing_ids:
+            continue
         # edit the chore attributes to be used for the new instance
         assert isinstance(chore.completion_date, date)  # Python linter freaks out without this line
-        chore.deadline_date = chore.completion_date + timedelta(days=chore.frequency)
-        chore.status = CHORE_STATUS.UNASSIGNED
-        chore.assignee_id = None
-        chore.completion_date = None
-        chore.id = increment_id(chore.id)
-        # add the new chore to the database
-        DataInput.new_chore_by_object(chore)
+        next_chore.deadline_date = Recurrence.rule_for(chore).next_deadline(chore)
+        next_chore.status = CHORE_STATUS.UNASSIGNED
+        next_chore.assignee_id = None
+        next_chore.completion_date = None
+        new_chores.append(next_chore)
+
+    # store the renewed chores and their new instances in a single write
+    DataInput.save_chores(new_chores=new_chores, updated_chores=renewed_chores)
 
     # assign the renewed chores
-    assign_unassigned_chores()
\ No newline at end of file
+    assign_unassigned_chores(today)
\ No newline at end of file
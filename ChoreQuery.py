@@ -0,0 +1,510 @@
+"""
+Chore Queries
+Author: Haus Team
+Date: 10/19/2026
+
+This module finds chores with filter expressions which DataInput.get_chores_by_filters cannot express:
+alternatives (OR), sets of values (IN) and ranges over any column, sorted and limited.
+
+    from ChoreQuery import Field, Query
+    overdue_or_today = Query().where(
+        Field('Status').in_([CHORE_STATUS.ASSIGNED, CHORE_STATUS.UNASSIGNED])
+        & ((Field('Deadline Date') < today) | (Field('Deadline Date') == today))
+    ).order_by('Deadline Date').limit(20)
+    chores = overdue_or_today.run()
+    print(overdue_or_today.explain())
+
+A query is compiled into a plan before it runs. When the filter narrows the chores down through the indexes of
+the chores CSV (the Chore ID offset index, and the hash and range indexes of _ChoreOffsetIndex.column_indexes),
+only the matching rows are read. Otherwise, or when the indexes would select too many of the chores to be worth it,
+the chores CSV is read in a single streaming scan. explain() describes the chosen plan.
+
+Values are compared the way the CSV stores them: dates as ISO dates, statuses by their value,
+durations and frequencies as integers, and everything else as text. A chore without a date never matches
+a comparison on that date, and comes last when sorting by it.
+"""
+
+# other modules in the software
+import DataInput
+import Metrics
+from DataInput import CHORE_ATTRIBUTES, DATE_FORMAT, Chore
+
+# python libraries
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import date
+from enum import Enum
+from itertools import islice
+
+# enhanced typing
+from typing import Union, Iterator, Iterable, Callable
+
+# Columns compared as integers rather than text
+INT_COLUMNS = ['Expected Duration', 'Frequency']
+
+# Columns holding dates, which a chore may leave empty
+DATE_COLUMNS = ['Deadline Date', 'Completion Date']
+
+# Indexes are only used when they select at most this fraction of the chores:
+# reading scattered rows one at a time costs more per row than a streaming scan
+INDEX_MAX_FRACTION = 0.3
+
+
+def _column(name: str) -> str:
+    if name not in CHORE_ATTRIBUTES:
+        raise ValueError(f"Unknown chore column: {name!r}")
+    return name
+
+
+def _stored(column: str, value) -> Union[str, int]:
+    """Return the value the way it compares against the column's values (see _getter)."""
+    if column in INT_COLUMNS:
+        return int(value or 0)
+    if value is None:
+        return ''
+    if isinstance(value, date):
+        return value.strftime(DATE_FORMAT)
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _getter(column: str) -> Callable[[dict], Union[str, int]]:
+    """Return a function reading the column out of a CSV row, as compared by the filters."""
+    if column in INT_COLUMNS:
+        return lambda row: int(row[column] or 0)
+    return lambda row: row.get(column) or ''
+
+
+"""
+Filter Expressions
+"""
+
+
+class Expression:
+    """A filter on chores, combined with & (AND) and | (OR)."""
+
+    def __and__(self, other: 'Expression') -> 'Expression':
+        return And(self, other)
+
+    def __or__(self, other: 'Expression') -> 'Expression':
+        return Or(self, other)
+
+    def matcher(self) -> Callable[[dict], bool]:
+        """Return a function telling whether a CSV row matches the filter."""
+        raise NotImplementedError
+
+    def lookup(self, indexes: '_Indexes') -> Union['_IndexAccess', None]:
+        """Return the chores possibly matching the filter according to the indexes, or None if they cannot tell."""
+        return None
+
+
+class Field:
+    """A column of the chores CSV, compared with ==, !=, <, <=, >, >=, in_ and between to make filters."""
+
+    def __init__(self, column: str):
+        self.column = _column(column)
+
+    def __eq__(self, value) -> 'Expression':
+        return In(self.column, [value])
+
+    def __ne__(self, value) -> 'Expression':
+        return NotIn(self.column, [value])
+
+    def __lt__(self, value) -> 'Expression':
+        return Range(self.column, high=value, include_high=False)
+
+    def __le__(self, value) -> 'Expression':
+        return Range(self.column, high=value)
+
+    def __gt__(self, value) -> 'Expression':
+        return Range(self.column, low=value, include_low=False)
+
+    def __ge__(self, value) -> 'Expression':
+        return Range(self.column, low=value)
+
+    # comparisons make filters, so fields cannot be dictionary keys
+    __hash__ = None
+
+    def in_(self, values: Iterable) -> 'Expression':
+        return In(self.column, values)
+
+    def not_in(self, values: Iterable) -> 'Expression':
+        return NotIn(self.column, values)
+
+    def between(self, low, high) -> 'Expression':
+        """Values from low to high, both included."""
+        return Range(self.column, low=low, high=high)
+
+
+class In(Expression):
+    """The column has one of the values."""
+
+    def __init__(self, column: str, values: Iterable):
+        self.column = _column(column)
+        self.values = list(dict.fromkeys(_stored(column, value) for value in values))
+
+    def matcher(self) -> Callable[[dict], bool]:
+        get = _getter(self.column)
+        values = set(self.values)
+        return lambda row: get(row) in values
+
+    def lookup(self, indexes: '_Indexes') -> Union['_IndexAccess', None]:
+        if self.column == 'Chore ID':
+            return _IndexAccess(f"ID index on {self}", indexes.ids(self.values))
+        if self.column in DataInput.HASH_INDEXED_COLUMNS:
+            return _IndexAccess(f"Hash index on {self}", indexes.hashed(self.column, self.values))
+        if self.column in DataInput.RANGE_INDEXED_COLUMNS:
+            # an empty value is not in the range index, and only matches an empty value
+            if '' in self.values:
+                return None
+            chore_ids = set()
+            for value in self.values:
+                chore_ids.update(indexes.ranged(self.column, value, True, value, True))
+            return _IndexAccess(f"Range index on {self}", chore_ids)
+        return None
+
+    def __str__(self) -> str:
+        if len(self.values) == 1:
+            return f"{self.column} = {self.values[0]!r}"
+        return f"{self.column} IN ({', '.join(repr(value) for value in self.values)})"
+
+
+class NotIn(In):
+    """The column has none of the values."""
+
+    def matcher(self) -> Callable[[dict], bool]:
+        get = _getter(self.column)
+        values = set(self.values)
+        return lambda row: get(row) not in values
+
+    def lookup(self, indexes: '_Indexes') -> Union['_IndexAccess', None]:
+        return None
+
+    def __str__(self) -> str:
+        if len(self.values) == 1:
+            return f"{self.column} != {self.values[0]!r}"
+        return f"{self.column} NOT IN ({', '.join(repr(value) for value in self.values)})"
+
+
+class Range(Expression):
+    """The column is between low and high (either may be left open). Empty dates never match."""
+
+    def __init__(self, column: str, low=None, high=None, include_low: bool = True, include_high: bool = True):
+        self.column = _column(column)
+        self.low = _stored(column, low) if low is not None else None
+        self.high = _stored(column, high) if high is not None else None
+        self.include_low = include_low
+        self.include_high = include_high
+
+    def matcher(self) -> Callable[[dict], bool]:
+        get = _getter(self.column)
+        low, high = self.low, self.high
+        include_low, include_high = self.include_low, self.include_high
+        skip_empty = self.column in DATE_COLUMNS
+
+        def matches(row: dict) -> bool:
+            value = get(row)
+            if skip_empty and not value:
+                return False
+            if low is not None and (value < low if include_low else value <= low):
+                return False
+            if high is not None and (value > high if include_high else value >= high):
+                return False
+            return True
+        return matches
+
+    def lookup(self, indexes: '_Indexes') -> Union['_IndexAccess', None]:
+        if self.column not in DataInput.RANGE_INDEXED_COLUMNS:
+            return None
+        return _IndexAccess(f"Range index on {self}",
+                            indexes.ranged(self.column, self.low, self.include_low, self.high, self.include_high))
+
+    def __str__(self) -> str:
+        bounds = []
+        if self.low is not None:
+            bounds.append(f"{self.column} {'>=' if self.include_low else '>'} {self.low!r}")
+        if self.high is not None:
+            bounds.append(f"{self.column} {'<=' if self.include_high else '<'} {self.high!r}")
+        return ' AND '.join(bounds) or f"{self.column} IS ANY"
+
+
+class And(Expression):
+    """Every part matches."""
+
+    def __init__(self, *parts: Expression):
+        # flatten nested ANDs, so the planner sees every part
+        self.parts = [part for expression in parts
+                      for part in (expression.parts if isinstance(expression, And) else [expression])]
+
+    def matcher(self) -> Callable[[dict], bool]:
+        matchers = [part.matcher() for part in self.parts]
+        return lambda row: all(matches(row) for matches in matchers)
+
+    def lookup(self, indexes: '_Indexes') -> Union['_IndexAccess', None]:
+        # the chores matching every part are among those the indexes select for each part
+        accesses = [access for access in (part.lookup(indexes) for part in self.parts) if access is not None]
+        if len(accesses) <= 1:
+            return accesses[0] if accesses else None
+        accesses.sort(key=len)
+        chore_ids = set(accesses[0].chore_ids)
+        for access in accesses[1:]:
+            chore_ids.intersection_update(access.chore_ids)
+        return _IndexAccess("Index intersection", chore_ids, accesses)
+
+    def __str__(self) -> str:
+        return ' AND '.join(f"({part})" if isinstance(part, Or) else str(part) for part in self.parts)
+
+
+class Or(Expression):
+    """At least one part matches."""
+
+    def __init__(self, *parts: Expression):
+        self.parts = [part for expression in parts
+                      for part in (expression.parts if isinstance(expression, Or) else [expression])]
+
+    def matcher(self) -> Callable[[dict], bool]:
+        matchers = [part.matcher() for part in self.parts]
+        return lambda row: any(matches(row) for matches in matchers)
+
+    def lookup(self, indexes: '_Indexes') -> Union['_IndexAccess', None]:
+        # the indexes can only tell if they can for every alternative
+        accesses = []
+        for part in self.parts:
+            access = part.lookup(indexes)
+            if access is None:
+                return None
+            accesses.append(access)
+        chore_ids = set()
+        for access in accesses:
+            chore_ids.update(access.chore_ids)
+        return _IndexAccess("Index union", chore_ids, accesses)
+
+    def __str__(self) -> str:
+        return ' OR '.join(f"({part})" if isinstance(part, And) else str(part) for part in self.parts)
+
+
+"""
+Indexes and Plans
+"""
+
+
+class _NoIndex(Exception):
+    """The column indexes of the chores CSV cannot be built."""
+
+
+class _Indexes:
+    """
+    The indexes of the current version of the chores CSV (see DataInput._ChoreOffsetIndex).
+    The column indexes are only built once a filter looks a value up in them.
+    """
+
+    def __init__(self, index: DataInput._ChoreOffsetIndex):
+        self.index = index
+
+    def _column_indexes(self) -> DataInput._ChoreOffsetIndex:
+        if not self.index.column_indexes():
+            raise _NoIndex
+        return self.index
+
+    def __len__(self) -> int:
+        return len(self.index.offsets)
+
+    def ids(self, chore_ids: list[str]) -> list[str]:
+        return [chore_id for chore_id in chore_ids if chore_id in self.index.offsets]
+
+    def hashed(self, column: str, values: list[str]) -> list[str]:
+        index = self._column_indexes().hash_indexes[column]
+        return [chore_id for value in values for chore_id in index.get(value, ())]
+
+    def ranged(self, column: str, low: Union[str, None], include_low: bool,
+               high: Union[str, None], include_high: bool) -> list[str]:
+        values, chore_ids = self._column_indexes().range_indexes[column]
+        start = 0 if low is None else (bisect_left(values, low) if include_low else bisect_right(values, low))
+        end = len(values) if high is None else \
+            (bisect_right(values, high) if include_high else bisect_left(values, high))
+        return chore_ids[start:end]
+
+    def in_file_order(self, chore_ids: Iterable[str]) -> list[str]:
+        offsets = self.index.offsets
+        return sorted(chore_ids, key=lambda chore_id: offsets[chore_id][0])
+
+
+class _IndexAccess:
+    """The chores an index lookup selects, and how it was made (with the lookups it combines)."""
+
+    def __init__(self, description: str, chore_ids: Iterable[str], children: Iterable['_IndexAccess'] = ()):
+        self.description = description
+        self.chore_ids = chore_ids
+        self.children = list(children)
+
+    def __len__(self) -> int:
+        return len(self.chore_ids)
+
+    def explain(self, depth: int) -> list[str]:
+        lines = ['  ' * depth + f"{self.description} ({len(self)} chores)"]
+        for child in self.children:
+            lines.extend(child.explain(depth + 1))
+        return lines
+
+
+class QueryPlan:
+    """
+    How a query runs: the rows it reads (through the indexes, or by scanning the chores CSV),
+    then the filter, sort and limit applied to them.
+    """
+
+    def __init__(self, query: 'Query', access: Union[_IndexAccess, None] = None,
+                 index: Union[DataInput._ChoreOffsetIndex, None] = None,
+                 chore_ids: Union[list[str], None] = None, reason: str = ''):
+        self.query = query
+        self.access = access
+        # the offset index the chores are read through, and the IDs of the chores to read, in file order
+        # (None: scan the chores CSV)
+        self.index = index
+        self.chore_ids = chore_ids
+        # why the indexes were not used
+        self.reason = reason
+
+    @property
+    def uses_index(self) -> bool:
+        return self.chore_ids is not None
+
+    def rows(self) -> Iterator[dict[str, str]]:
+        """Yield the rows matching the query, sorted and limited."""
+        query = self.query
+        matches = query.filter.matcher() if query.filter is not None else None
+        Metrics.QUERY_PLANS.inc(access='index' if self.uses_index else 'scan')
+        rows = None
+        if self.chore_ids is not None:
+            rows = self._read_selected_rows()
+        if rows is None:
+            rows = DataInput._iter_chore_rows()
+        if matches is not None:
+            rows = filter(matches, rows)
+        if query.sort_keys:
+            yield from _sorted(rows, query.sort_keys, query.max_rows)
+        elif query.max_rows is not None:
+            # stops reading the chores CSV once enough chores match
+            yield from islice(rows, query.max_rows)
+        else:
+            yield from rows
+
+    def _read_selected_rows(self) -> Union[list[dict[str, str]], None]:
+        """Read the selected rows, or return None if the chores CSV has changed since the plan was made."""
+        return self.index.read_rows(self.chore_ids)
+
+    def explain(self) -> str:
+        """Describe the plan, one step per line, each indented under the step it feeds."""
+        query = self.query
+        steps = []
+        if query.max_rows is not None:
+            steps.append(f"Limit {query.max_rows}" + ("" if query.sort_keys else " (stops reading early)"))
+        if query.sort_keys:
+            steps.append("Sort by " + ', '.join(column + (" descending" if descending else "")
+                                                for column, descending in query.sort_keys))
+        if query.filter is not None:
+            steps.append(f"Filter {query.filter}")
+        lines = ['  ' * depth + step for depth, step in enumerate(steps)]
+        if self.uses_index:
+            lines.extend(self.access.explain(len(steps)))
+        else:
+            lines.append('  ' * len(steps) + "Scan chores CSV" + (f" ({self.reason})" if self.reason else ""))
+        return '\n'.join(lines)
+
+
+def _sort_key(column: str, descending: bool) -> Callable[[dict], tuple]:
+    get = _getter(column)
+    if column in DATE_COLUMNS:
+        # chores without the date come last, whichever the direction
+        if descending:
+            return lambda row: (get(row) != '', get(row))
+        return lambda row: (get(row) == '', get(row))
+    return lambda row: (get(row),)
+
+
+def _sorted(rows: Iterable[dict], sort_keys: list[tuple[str, bool]], limit: Union[int, None]) -> list[dict]:
+    """Sort the rows by the keys (ties keep the file order), keeping the first limit rows."""
+    if len(sort_keys) == 1:
+        column, descending = sort_keys[0]
+        key = _sort_key(column, descending)
+        if limit is not None:
+            return (heapq.nlargest if descending else heapq.nsmallest)(limit, rows, key=key)
+        return sorted(rows, key=key, reverse=descending)
+    rows = list(rows)
+    # sort by the last key first: each stable sort keeps the order of the keys after it
+    for column, descending in reversed(sort_keys):
+        rows.sort(key=_sort_key(column, descending), reverse=descending)
+    return rows[:limit] if limit is not None else rows
+
+
+"""
+Queries
+"""
+
+
+class Query:
+    """
+    A query on the chores: a filter, the columns to sort by, and a limit.
+    Queries are immutable, each method returns a new query.
+    """
+
+    def __init__(self, filter: Union[Expression, None] = None,
+                 sort_keys: Union[list[tuple[str, bool]], None] = None, max_rows: Union[int, None] = None):
+        self.filter = filter
+        self.sort_keys = sort_keys or []
+        self.max_rows = max_rows
+
+    def where(self, expression: Expression) -> 'Query':
+        """Return the query keeping only the chores which also match the expression."""
+        combined = expression if self.filter is None else And(self.filter, expression)
+        return Query(combined, self.sort_keys, self.max_rows)
+
+    def order_by(self, column: str, descending: bool = False) -> 'Query':
+        """Return the query sorted by the column, after the columns it is already sorted by."""
+        return Query(self.filter, self.sort_keys + [(_column(column), descending)], self.max_rows)
+
+    def limit(self, max_rows: int) -> 'Query':
+        """Return the query stopping at the first max_rows chores."""
+        if max_rows < 0:
+            raise ValueError("A query limit cannot be negative")
+        return Query(self.filter, self.sort_keys, max_rows)
+
+    def plan(self) -> QueryPlan:
+        """
+        Compile the query against the indexes of the current chores CSV.
+        The indexes are used if they narrow the chores down to at most INDEX_MAX_FRACTION of them.
+        """
+        if self.filter is None:
+            return QueryPlan(self, reason="no filter")
+        index = DataInput._get_chore_offset_index()
+        if index is None:
+            return QueryPlan(self, reason="no index")
+        indexes = _Indexes(index)
+        try:
+            access = self.filter.lookup(indexes)
+        except _NoIndex:
+            return QueryPlan(self, reason="no index")
+        if access is None:
+            return QueryPlan(self, reason="the filter cannot use an index")
+        if len(access) > INDEX_MAX_FRACTION * len(indexes):
+            return QueryPlan(self, access, reason=f"the indexes select {len(access)} of {len(indexes)} chores")
+        return QueryPlan(self, access, index, indexes.in_file_order(access.chore_ids))
+
+    def explain(self) -> str:
+        """Describe how the query would run now (see QueryPlan.explain)."""
+        return self.plan().explain()
+
+    def iter_rows(self) -> Iterator[dict[str, str]]:
+        """Yield the CSV rows of the chores matching the query."""
+        return self.plan().rows()
+
+    @Metrics.timed('query_chores')
+    def run(self) -> list[Chore]:
+        """Return the chores matching the query, planned and read in the same version of the chores CSV."""
+        with DataInput.snapshot_reads():
+            return [Chore(row) for row in self.iter_rows()]
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
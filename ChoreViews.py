@@ -0,0 +1,210 @@
+"""
+Occupant Chore Views
+Author: Haus Team
+Date: 10/19/2026
+
+This module keeps a materialized view of the chores of every occupant, so that the most frequent reads
+do not filter the whole chores CSV: the open (assigned) chores of an occupant, sorted by deadline, as served
+by /chore/serve, and the deadlines and durations of every chore assigned to them, for their workload
+(see AutoAssign.user_workload).
+
+The views are built from the chores CSV on the first read, and kept up to date from the changes reported
+by DataInput after each write (assignments, completions and renewals alike): each changed chore is found
+in the sorted lists of its occupant with a binary search, and inserted or deleted there (which shifts the
+rest of that occupant's list, but never touches the other occupants' chores). They are only rebuilt when
+another process has written to the chores CSV.
+
+The views always hold the newest version of the chores CSV. Reads within DataInput.snapshot_reads which
+pinned an older version are answered by filtering that version instead, so they never move the views back.
+"""
+
+# other modules in the software
+import DataInput
+from DataInput import Chore, CHORE_STATUS
+
+# python libraries
+import bisect
+import threading
+from datetime import date
+
+# enhanced typing
+from typing import Union
+
+# Sorts chores without a deadline after those with one (deadlines are ISO dates, which sort as text)
+_NO_DEADLINE = "\uffff"
+
+
+def deadline_order(row: dict[str, str]) -> tuple[str, str]:
+    """Return the key sorting CSV rows the way the views list open chores: by deadline, then by chore ID."""
+    return row["Deadline Date"] or _NO_DEADLINE, row["Chore ID"]
+
+
+class _OccupantView:
+    """The chores of one occupant."""
+    __slots__ = ('open_keys', 'open_rows', 'scheduled', 'work')
+
+    def __init__(self):
+        # (deadline, chore ID) of every open chore, sorted, and the chores by ID
+        self.open_keys: list[tuple[str, str]] = []
+        self.open_rows: dict[str, dict[str, str]] = {}
+        # (deadline, chore ID) of every chore with a deadline, whatever its status, sorted,
+        # and the (expected duration, category) of each of them
+        self.scheduled: list[tuple[str, str]] = []
+        self.work: dict[str, tuple[int, str]] = {}
+
+
+class OccupantChoreViews:
+    """
+    The views of the chores of every occupant, by occupant ID.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # chores CSV signature the views reflect (None: not built, or out of date)
+        self._signature: Union[list[int], None] = None
+        self._views: dict[str, _OccupantView] = {}
+        self.rebuilds = 0
+
+    def open_chores(self, assignee_id: str, category: Union[str, None] = None) -> list[Chore]:
+        """Return the open chores of the occupant (of one category, if given), by deadline."""
+        with self._lock:
+            if not self._up_to_date():
+                rows = None
+            else:
+                view = self._views.get(assignee_id)
+                rows = [view.open_rows[chore_id] for _, chore_id in view.open_keys] if view is not None else []
+        if rows is None:
+            # the version pinned by the current thread is older than the views
+            rows = sorted((chore.to_csv_row() for chore in DataInput.iter_chores(
+                assignee_id=assignee_id, status=CHORE_STATUS.ASSIGNED, category=category)), key=deadline_order)
+        return [Chore(row) for row in rows if category is None or row["Category"] == category]
+
+    def workload(self, assignee_id: str, start: date, end: date) -> int:
+        """Return the expected minutes of the chores of the occupant due between start and end (included)."""
+        return self.workloads([assignee_id], start, end)[assignee_id]
+
+    def workloads(self, assignee_ids: list[str], start: date, end: date) -> dict[str, int]:
+        """Return the workload (see workload) of every given occupant, in the order of assignee_ids."""
+        return {assignee_id: sum(loads.values())
+                for assignee_id, loads in self.category_workloads(assignee_ids, start, end).items()}
+
+    def category_workloads(self, assignee_ids: list[str], start: date, end: date) -> dict[str, dict[str, int]]:
+        """Return the workload of every given occupant in each category they have chores due in."""
+        first, last = start.strftime(DataInput.DATE_FORMAT), end.strftime(DataInput.DATE_FORMAT)
+        workloads = {}
+        with self._lock:
+            up_to_date = self._up_to_date()
+            for assignee_id in assignee_ids if up_to_date else ():
+                loads = workloads[assignee_id] = {}
+                view = self._views.get(assignee_id)
+                if view is None:
+                    continue
+                low = bisect.bisect_left(view.scheduled, (first,))
+                high = bisect.bisect_left(view.scheduled, (last, _NO_DEADLINE), low)
+                for _, chore_id in view.scheduled[low:high]:
+                    duration, category = view.work[chore_id]
+                    loads[category] = loads.get(category, 0) + duration
+        if not up_to_date:
+            # the version pinned by the current thread is older than the views
+            for assignee_id in assignee_ids:
+                loads = workloads[assignee_id] = {}
+                for chore in DataInput.get_chores_by_filters(assignee_id=assignee_id, min_deadline_date=start,
+                                                             max_deadline_date=end):
+                    loads[chore.category] = loads.get(chore.category, 0) + chore.expected_duration
+        return workloads
+
+    def open_assignee_ids(self) -> set[str]:
+        """Return the IDs of everyone who has open chores in the newest version of the chores CSV."""
+        with self._lock:
+            self._up_to_date()
+            return {assignee_id for assignee_id, view in self._views.items() if view.open_keys}
+
+    def invalidate(self) -> None:
+        """Forget the views, so that the next read rebuilds them from the chores CSV."""
+        with self._lock:
+            self._signature = None
+
+    def chores_changed(self, changes: list, signature_before: list[int], signature_after: list[int]) -> None:
+        """
+        Update the views after a write of the chores CSV (see DataInput.register_chore_listener).
+        Only the changed chores are moved, in the views of the occupants they were and are assigned to.
+        """
+        with self._lock:
+            if self._signature is None or self._signature != signature_before:
+                # never built, or another process wrote in between: rebuild on the next read
+                self._signature = None
+                return
+            for old_row, new_row in changes:
+                if old_row is not None:
+                    self._remove(old_row)
+                if new_row is not None:
+                    # as it reads back from the CSV, to find it again when it changes
+                    self._add({column: '' if value is None else str(value) for column, value in new_row.items()})
+            self._signature = signature_after
+
+    def _up_to_date(self) -> bool:
+        """
+        Rebuild the views if they are older than the chores CSV, and return whether they hold the version
+        the current thread reads (False if it pinned an older one, see DataInput.snapshot_reads).
+        """
+        if self._signature != DataInput._file_signature(DataInput.CHORES_FILEPATH):
+            self._rebuild()
+        return self._signature == DataInput._chore_signature()
+
+    def _rebuild(self) -> None:
+        """Build the view of every occupant, in one scan of the newest version of the chores CSV."""
+        self._views, self._signature = {}, None
+        # the rows and the signature recorded come from the same version, whatever the current thread pinned
+        version = DataInput.pin_chore_version()
+        try:
+            for row in version.iter_rows():
+                self._add(row, keep_sorted=False)
+        finally:
+            DataInput.unpin_chore_version(version)
+        self._signature = version.signature
+        for view in self._views.values():
+            view.open_keys.sort()
+            view.scheduled.sort()
+        self.rebuilds += 1
+
+    def _add(self, row: dict, keep_sorted: bool = True) -> None:
+        assignee_id = row.get("Assignee ID")
+        if not assignee_id:
+            return
+        view = self._views.get(assignee_id)
+        if view is None:
+            view = self._views[assignee_id] = _OccupantView()
+        insert = bisect.insort if keep_sorted else list.append
+        chore_id = row["Chore ID"]
+        if row["Status"] == CHORE_STATUS.ASSIGNED.value:
+            insert(view.open_keys, deadline_order(row))
+            view.open_rows[chore_id] = row
+        if row["Deadline Date"]:
+            insert(view.scheduled, (row["Deadline Date"], chore_id))
+            view.work[chore_id] = (int(row["Expected Duration"] or 0), row["Category"])
+
+    def _remove(self, row: dict) -> None:
+        view = self._views.get(row.get("Assignee ID"))
+        if view is None:
+            return
+        chore_id = row["Chore ID"]
+        if view.open_rows.pop(chore_id, None) is not None:
+            _remove_sorted(view.open_keys, deadline_order(row))
+        if view.work.pop(chore_id, None) is not None:
+            _remove_sorted(view.scheduled, (row["Deadline Date"], chore_id))
+
+
+def _remove_sorted(keys: list, key) -> None:
+    """Remove the key from the sorted list, if it is in it."""
+    position = bisect.bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
+
+
+# views kept up to date with the writes of this process
+views = OccupantChoreViews()
+DataInput.register_chore_listener(views.chores_changed)
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
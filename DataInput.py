@@ -7,15 +7,33 @@ modules can interact with the Household Data Storage database (the CSV files in
 """
 
 # python libraries
+import atexit
+import itertools
 import json
 import csv
+import io
+import mmap
+import os
+import tempfile
+import threading
+import time
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 
 # enhanced typing
-from typing import Union
+from typing import Union, Iterator, Iterable, Callable
 from enum import Enum
 
+# advisory file locks (POSIX only), to number the change log entries of several processes in order
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# instrumentation
+import Metrics
+
 # Constant definitions
 
 # Attributes which every chore must have, coincides with names in line 1 of chores.csv
@@ -28,7 +46,8 @@ CHORE_ATTRIBUTES = ['Chore ID',
                     'Assignee ID',
                     'Deadline Date',
                     'Frequency',
-                    'Completion Date']
+                    'Completion Date',
+                    'Recurrence']
 
 
 # Symbolic constants for chore statuses
@@ -39,18 +58,135 @@ class CHORE_STATUS(Enum):
     RENEWED = "renewed"  # (of repeating chores) chore is renewed and should not be renewed again
 
 
+# Directory of the CSV files (set HAUS_DATA_DIRECTORY to keep the data elsewhere, e.g. for benchmarks)
+DATA_DIRECTORY = os.environ.get('HAUS_DATA_DIRECTORY', 'csvs')
+
 # Chore CSV file location
-CHORES_FILEPATH = 'csvs/chores.csv'
+CHORES_FILEPATH = DATA_DIRECTORY + '/chores.csv'
 
 # Occupants CSV file location
-OCCUPANTS_FILEPATH = 'csvs/occupants.csv'
+OCCUPANTS_FILEPATH = DATA_DIRECTORY + '/occupants.csv'
 
 # Chore rankings file location
-CHORE_RANKINGS_FILEPATH = 'csvs/chore_rankings.csv'
+CHORE_RANKINGS_FILEPATH = DATA_DIRECTORY + '/chore_rankings.csv'
 
 # date format to be used in all CSVs
 DATE_FORMAT = '%Y-%m-%d'
 
+# Seconds the first of several concurrent chore mutations waits for others to join its write (group commit).
+# With 0, mutations arriving while a write is in progress are still combined into the next write.
+GROUP_COMMIT_WINDOW = float(os.environ.get('HAUS_GROUP_COMMIT_WINDOW_MS', '0') or 0) / 1000
+
+# How writes to the data files are made durable (see _sync_after_write):
+# 'strict' fsyncs every write before it returns, 'batched' fsyncs in the background
+# every DURABILITY_BATCH_INTERVAL seconds, and 'relaxed' leaves flushing to the operating system.
+# Whatever the mode, files are replaced atomically, so a process crashing (or killed) while writing never leaves
+# them partially written. Only 'strict' also guarantees it after a power loss: in the other modes, the rename
+# may reach the disk before the data.
+DURABILITY_MODES = ('strict', 'batched', 'relaxed')
+DURABILITY_MODE = os.environ.get('HAUS_DURABILITY', 'strict')
+DURABILITY_BATCH_INTERVAL = float(os.environ.get('HAUS_DURABILITY_BATCH_MS', '50') or 50) / 1000
+if DURABILITY_MODE not in DURABILITY_MODES:
+    raise ValueError(f"Unknown durability mode: {DURABILITY_MODE}")
+
+# Suffix of the temporary files data files are written to before replacing them
+TEMP_FILE_SUFFIX = '.tmp'
+
+# Suffix of the sidecar file, next to the chores CSV, mapping chore IDs to their byte offset in the CSV
+CHORE_INDEX_SUFFIX = '.idx'
+
+# Columns of the chores CSV indexed by value (hash indexes) and by order (range indexes, ISO dates sort as text),
+# next to the Chore ID of the offset index, see _ChoreOffsetIndex.column_indexes
+HASH_INDEXED_COLUMNS = ['Category', 'Status', 'Assignee ID']
+RANGE_INDEXED_COLUMNS = ['Deadline Date', 'Completion Date']
+
+# Name of the change log next to the chores CSV: every write of the data files is appended to it (as JSON lines)
+# with a sequence number, for followers to keep read replicas up to date (see Replication.py).
+# Logging costs an append per write, so it is off unless the HAUS_CHANGE_LOG environment variable is set.
+CHANGE_LOG_FILENAME = 'changes.jsonl'
+CHANGE_LOG = os.environ.get('HAUS_CHANGE_LOG', '').lower() in ('1', 'true', 'yes', 'on')
+
+# How generate_uid makes new IDs: 'uuid4' (random UUIDs) or 'sequence' (see SequenceIdGenerator)
+ID_MODES = ('uuid4', 'sequence')
+ID_MODE = os.environ.get('HAUS_ID_MODE', 'uuid4')
+if ID_MODE not in ID_MODES:
+    raise ValueError(f"Unknown ID mode: {ID_MODE}")
+
+"""
+Clock and ID Generation
+"""
+
+# returns the current date, see set_clock
+_clock: Callable[[], date] = date.today
+
+# date pinned for the operation running in each thread, see pinned_today
+_pinned = threading.local()
+
+
+def today() -> date:
+    """
+    Return the current date. This is the system date, unless another clock was set with set_clock,
+    or the date pinned for the current operation (see pinned_today).
+    Every module should get the date from here, so that simulations can run on a virtual clock.
+    """
+    pinned = getattr(_pinned, 'today', None)
+    return pinned if pinned is not None else _clock()
+
+
+def set_clock(clock: Union[Callable[[], date], None]) -> None:
+    """Make today() return clock() rather than the system date (or the system date again, if clock is None)."""
+    global _clock
+    _clock = clock if clock is not None else date.today
+
+
+@contextmanager
+def pinned_today() -> Iterator[date]:
+    """
+    Within the block, today() returns the same date in the current thread: the clock is read once,
+    so an operation spanning several calls (and midnight) works with a single date,
+    and results computed for that date can be reused. Nested blocks keep the outer block's date.
+    """
+    pinned = getattr(_pinned, 'today', None)
+    if pinned is not None:
+        yield pinned
+        return
+    _pinned.today = _clock()
+    try:
+        yield _pinned.today
+    finally:
+        _pinned.today = None
+
+
+class SequenceIdGenerator:
+    """
+    Generates the IDs "<prefix>-<n>" with n counting up from start (in hexadecimal).
+    This is much cheaper than random UUIDs, and reproducible for a given prefix.
+    IDs are only unique if no other generator uses the same prefix, so by default
+    the prefix is drawn at random once, when the generator is created.
+    """
+
+    def __init__(self, prefix: Union[str, None] = None, start: int = 0):
+        self.prefix = prefix if prefix is not None else uuid.uuid4().hex[:16]
+        self._counter = itertools.count(start)
+
+    def __call__(self) -> str:
+        return f"{self.prefix}-{next(self._counter):x}"
+
+
+def _uuid4() -> str:
+    return str(uuid.uuid4())
+
+
+# makes the IDs returned by generate_uid, see set_id_generator
+_id_generator: Callable[[], str] = SequenceIdGenerator() if ID_MODE == 'sequence' else _uuid4
+
+
+def set_id_generator(generator: Union[Callable[[], str], None]) -> None:
+    """Make generate_uid return generator() rather than a random UUID (or random UUIDs again, if None)."""
+    global _id_generator
+    _id_generator = generator if generator is not None else _uuid4
+
+
 """
 Chore Class
 """
@@ -72,6 +208,7 @@ class Chore:
     deadline_date: Union[date, None]
     frequency: int
     completion_date: Union[date, None]
+    recurrence: str
 
     def __init__(self, csv_chore_row: dict):
         """
@@ -93,6 +230,8 @@ class Chore:
         self.frequency = int(csv_chore_row["Frequency"]) if csv_chore_row["Frequency"] else 0
         self.completion_date = datetime.strptime(csv_chore_row["Completion Date"], DATE_FORMAT).date() \
             if csv_chore_row["Completion Date"] else None
+        # recurrence rule text (see Recurrence.py), absent from CSVs written before it was introduced
+        self.recurrence = csv_chore_row.get("Recurrence") or ""
 
     def __str__(self):
         """Return a string representation of every aspect of the chore"""
@@ -107,6 +246,7 @@ class Chore:
         Deadline Date: {self.deadline_date}
         Frequency: {self.frequency}
         Completion Date: {self.completion_date}
+        Recurrence: {self.recurrence}
         """
 
     def to_csv_row(self) -> dict[str, str]:
@@ -123,7 +263,8 @@ class Chore:
             "Assignee ID": self.assignee_id,
             "Deadline Date": self.deadline_date.strftime(DATE_FORMAT) if self.deadline_date else "",
             "Frequency": str(self.frequency),
-            "Completion Date": self.completion_date.strftime(DATE_FORMAT) if self.completion_date else ""
+            "Completion Date": self.completion_date.strftime(DATE_FORMAT) if self.completion_date else "",
+            "Recurrence": self.recurrence
         }
 
 
@@ -132,41 +273,43 @@ Setter Functions
 """
 
 
+@Metrics.timed('add_occupant_name')
 def add_occupant_name(filename: str, occupant_uid: str, occupant_username: str, occupant_password: str) -> bool:
     """Adds a username and password to the occupants CSV file. Also generates a UID for the new user.
     Note: does not verify if this name already exists. That functionality is covered in the login.py module
     as this module is strictly concerned with passing data."""
-    with open(filename, mode='a', newline='') as file:
+    with _open(filename, mode='a', newline='') as file:
         writer = csv.writer(file)
         writer.writerow([occupant_uid, occupant_username, occupant_password])
+    _sync_after_write(filename)
+    if _is_occupants_file(filename):
+        _log_changes('occupants', {occupant_uid: [occupant_uid, occupant_username, occupant_password]})
     # print(f"Added {occupant_username} with UID {occupant_uid} and password {occupant_password} to house.")
     return True
 
 
+@Metrics.timed('new_chore_by_object')
 def new_chore_by_object(chore: Chore) -> None:
     """
     Given a Chore object, add a new entry to the CSV database.
     The Chore object may or may not have an ID already.
     If not, a new ID will be generated for it.
     """
-    # if chore does not have an id, generate a unique one
-    if not chore.id:
-        chore.id = generate_uid()
+    _commit_chore_mutations([_new_chore_mutation(chore)])
 
-    # read existing chores to check that it does not already exist (based on id)
-    with open(CHORES_FILEPATH, 'r') as file:
-        reader = csv.DictReader(file)
-        lines = list(reader)
-    for line in lines:
-        if line["Chore ID"] == chore.id:
-            raise ValueError("Chore ID already exists in database")
 
-    # add new chore to the list and write back to the file
-    lines.append(chore.to_csv_row())
-    with open(CHORES_FILEPATH, 'w', newline='') as file:
-        writer = csv.DictWriter(file, fieldnames=CHORE_ATTRIBUTES)
-        writer.writeheader()
-        writer.writerows(lines)
+@Metrics.timed('save_chores')
+def save_chores(new_chores: Iterable[Chore] = (), updated_chores: Iterable[Chore] = ()) -> None:
+    """
+    Add the new chores to the CSV database and update the entries of the updated chores,
+    all in a single write of the chores CSV.
+    New chores without an ID are given one. If a new chore's ID already exists, or an updated chore's
+    ID does not, a ValueError is raised after the other chores have been written.
+    """
+    mutations = [_update_chore_mutation(chore) for chore in updated_chores] + \
+        [_new_chore_mutation(chore) for chore in new_chores]
+    if mutations:
+        _commit_chore_mutations(mutations)
 
 
 def new_chore_by_args(name: str,
@@ -178,7 +321,8 @@ def new_chore_by_args(name: str,
                       assignee_id: Union[str, None] = None,
                       frequency: int = 0,
                       deadline_date: Union[date, None] = None,
-                      completion_date: Union[date, None] = None) -> None:
+                      completion_date: Union[date, None] = None,
+                      recurrence: str = "") -> None:
     """
     Adds a new chore to the CSV database with the given attributes.
     """
@@ -188,16 +332,10 @@ def new_chore_by_args(name: str,
 
     # If chore doesn't have a deadline, set it to today + frequency
     if not deadline_date:
-        deadline_date = date.today() + timedelta(days=frequency)
+        deadline_date = today() + timedelta(days=frequency)
     deadline_date_text = deadline_date.strftime(DATE_FORMAT)
 
-    # read existing chores to check that it does not already exist (based on id)
-    with open(CHORES_FILEPATH, 'r') as file:
-        reader = csv.DictReader(file)
-        lines = list(reader)
-    for line in lines:
-        if line["Chore ID"] == id:
-            raise ValueError("Chore ID already exists in database")
+    # uniqueness of the id is checked by new_chore_by_object while it rewrites the file
     csv_row = {
             'Chore ID': id,
             'Chore Name': name,
@@ -208,70 +346,62 @@ def new_chore_by_args(name: str,
             'Assignee ID': assignee_id,
             'Deadline Date': deadline_date_text,
             'Frequency': frequency,
-            'Completion Date': completion_date
+            'Completion Date': completion_date,
+            'Recurrence': recurrence
     }
     new_chore = Chore(csv_row)
     new_chore_by_object(new_chore)
 
 
+@Metrics.timed('update_chores_if_unchanged')
+def update_chores_if_unchanged(updates: Iterable[tuple[Chore, Chore]]) -> list[str]:
+    """
+    Given (chore as it was read, updated chore) pairs, update every chore in a single write of the CSV database,
+    except those whose entry changed since they were read (e.g. a concurrent request completed them).
+    Returns the IDs of the chores which were left alone because of such a change.
+    """
+    mutations = [_update_if_unchanged_mutation(read_chore, chore) for read_chore, chore in updates]
+    if mutations:
+        _group_committer.commit(mutations)
+    return [mutation.chore_id for mutation in mutations if mutation.error is not None]
+
+
+@Metrics.timed('update_chore_by_object')
 def update_chore_by_object(chore: Chore) -> None:
     """
     Given a Chore object, update the CSV database entry to match object's attributes.
     If the chore does not exist (no ID or ID not in CSV database), throw error.
     """
-    # find the chore in the CSV database by id
-    with open(CHORES_FILEPATH, 'r') as file:
-        reader = csv.DictReader(file)
-        lines = list(reader)
-    chore_found = False
-    for i in range(len(lines)):
-        if lines[i]["Chore ID"] == chore.id:
-            chore_found = True
-            # update the line with the new chore attributes
-            lines[i] = chore.to_csv_row()
-            break
-    if not chore_found:
-        raise ValueError("Chore ID not found in database")
-
-    # write everything back to the file
-    with open(CHORES_FILEPATH, 'w', newline='') as file:
-        writer = csv.DictWriter(file, fieldnames=CHORE_ATTRIBUTES)
-        writer.writeheader()
-        writer.writerows(lines)
+    _commit_chore_mutations([_update_chore_mutation(chore)])
 
 
+@Metrics.timed('set_chore_complete')
 def set_chore_complete(chore_id: str) -> None:
     """
     Change the status of the chore with the given id to completed.
     This also sets the "Completion Date" attribute to the current date.
     Updates the chores.csv database file accordingly.
     """
-    # find the chore in the CSV database by id
-    with open(CHORES_FILEPATH, 'r') as file:
-        reader = csv.DictReader(file)
-        lines = list(reader)
-    chore_found = False
-    for i in range(len(lines)):
-        if lines[i]["Chore ID"] == chore_id:
-            chore_found = True
-            # make sure the chore is assigned and has an assignee ID
-            if lines[i]["Status"] != CHORE_STATUS.ASSIGNED.value:
-                raise ValueError("Chore must first be assigned to be completed")
-            if not lines[i]["Assignee ID"]:
-                raise ValueError("Chore must first be assigned to someone to be completed")
-            # update the line with the new chore attributes
-            lines[i]["Status"] = CHORE_STATUS.COMPLETED.value
-            lines[i]["Completion Date"] = date.today().strftime(DATE_FORMAT)
-            break
-    if not chore_found:
-        raise ValueError("Chore ID not found in database")
-    # write everything back to the file
-    with open(CHORES_FILEPATH, 'w', newline='') as file:
-        writer = csv.DictWriter(file, fieldnames=CHORE_ATTRIBUTES)
-        writer.writeheader()
-        writer.writerows(lines)
-        
-
+    # read in the caller's thread, which may have pinned the date (the write may happen in another thread)
+    completion_date = today().strftime(DATE_FORMAT)
+
+    def complete_chore(row: Union[dict, None]) -> dict:
+        if row is None:
+            raise ValueError("Chore ID not found in database")
+        # make sure the chore is assigned and has an assignee ID
+        if row["Status"] != CHORE_STATUS.ASSIGNED.value:
+            raise ValueError("Chore must first be assigned to be completed")
+        if not row["Assignee ID"]:
+            raise ValueError("Chore must first be assigned to someone to be completed")
+        # update the line with the new chore attributes
+        row["Status"] = CHORE_STATUS.COMPLETED.value
+        row["Completion Date"] = completion_date
+        return row
+
+    _commit_chore_mutations([_ChoreMutation(chore_id, complete_chore)])
+
+
+@Metrics.timed('remove_user')
 def remove_user(username: str, occupant_filepath: str) -> None:
     """
     Remove a user from the occupants CSV. Does not verify if the user exists beforehand.
@@ -280,31 +410,39 @@ def remove_user(username: str, occupant_filepath: str) -> None:
     # open the occupants CSV and extract all the info currently there
     # don't extract the data we're removing
     current_user_info = []
-    with open(occupant_filepath, mode='r', newline='') as file:
+    removed_user_info = []
+    with _open(occupant_filepath, mode='r', newline='') as file:
         reader = csv.reader(file)
         headers = next(reader)
         for row in reader:
             if row[1] != username:  # usernames are stored in the second column. Copy all usernames except the one we're deleting
                 current_user_info.append(row)
+            else:
+                removed_user_info.append(row)
 
     # write all extracted data back in
-    with open(occupant_filepath, mode='w', newline='') as file:
+    def write_occupants(file) -> None:
         writer = csv.writer(file)
         writer.writerow(headers)
         writer.writerows(current_user_info)
 
+    _replace_file(occupant_filepath, write_occupants)
+    if removed_user_info and _is_occupants_file(occupant_filepath):
+        _log_changes('occupants', {row[0]: None for row in removed_user_info})
+
 
 """
 Getter Functions
 """
 
 
+@Metrics.timed('get_username_list')
 def get_username_list(filename: str) -> list[str]:
     """
     Returns the list of usernames stored in the occupants CSV file
     """
     current_usernames = []
-    with open(filename, mode='r', newline='') as file:
+    with _open(filename, mode='r', newline='') as file:
         reader = csv.reader(file)
         for row in reader:
             current_usernames.append(row[1])
@@ -315,11 +453,12 @@ def get_username_list(filename: str) -> list[str]:
     return current_usernames
 
 
+@Metrics.timed('get_password')
 def get_password(filename: str, username: str) -> str:
     """
     Returns the password for a given username from the occupants CSV file
     """
-    with open(filename, mode='r', newline='') as file:
+    with _open(filename, mode='r', newline='') as file:
         reader = csv.reader(file)
         for row in reader:
             if row[1] == username:
@@ -328,12 +467,13 @@ def get_password(filename: str, username: str) -> str:
     # username isn't valid, so return nothing
 
 
+@Metrics.timed('retrieve_occupants_names_and_uids')
 def retrieve_occupants_names_and_uids(OCCUPANTS_FILEPATH: str) -> dict[str, str]:
     """
     Return a dictionary object mapping occupant IDs to their names.
     """
     occupants = {}
-    with open(OCCUPANTS_FILEPATH, mode='r') as file:
+    with _open(OCCUPANTS_FILEPATH, mode='r') as file:
         reader = csv.reader(file)
         next(reader)  # Skip the header
 
@@ -342,11 +482,12 @@ def retrieve_occupants_names_and_uids(OCCUPANTS_FILEPATH: str) -> dict[str, str]
     return occupants
   
   
+@Metrics.timed('retrieve_occupant_uid_from_username')
 def retrieve_occupant_uid_from_username(username: str, OCCUPANTS_FILEPATH: str) -> str:
     """
     Returns the first instance of a uid matching the input username
     """
-    with open(OCCUPANTS_FILEPATH, mode='r') as file:
+    with _open(OCCUPANTS_FILEPATH, mode='r') as file:
         reader = csv.reader(file)
         next(reader)  # Skip the header
 
@@ -355,60 +496,101 @@ def retrieve_occupant_uid_from_username(username: str, OCCUPANTS_FILEPATH: str)
                 return row[0]
 
 
-def get_chore_by_id(id: str) -> Chore:
+@Metrics.timed('get_chore_by_id')
+def get_chore_by_id(id: str) -> Union[Chore, None]:
     """
-    Return a Chore object from database by id
+    Return a Chore object from database by id, or None if there is no such chore
     """
-    # first find the chore in the CSV database by id
-    found_csv_row = None
-    file = open(CHORES_FILEPATH, 'r')
-    reader = csv.DictReader(file)
-    for row in reader:
-        if row['Chore ID'] == id:
-            found_csv_row = row
-            break
-    if not found_csv_row:
-        return None
-    # create a chore object from the row
-    chore = Chore(found_csv_row)
-    file.close()
-    return chore
-
-
+    # look the chore up in the byte-offset index, so only its own row is parsed
+    index = _get_chore_offset_index()
+    if index is not None:
+        if id not in index.offsets:
+            return None
+        row = index.read_row(id)
+        if row is not None and row["Chore ID"] == id:
+            return Chore(row)
+    # no usable index (e.g. empty file, or it changed mid-lookup): scan for the chore instead
+    # this stops reading (and closes the file) as soon as the chore is found
+    for chore in iter_chores(chore_id=id, limit=1):
+        return chore
+    return None
+
+
+def iter_chores(chore_id: str = None,
+                assignee_id: str = None,
+                status: CHORE_STATUS = None,
+                min_deadline_date: date = None,
+                max_deadline_date: date = None,
+                repeating_only: bool = False,
+                limit: int = None,
+                category: str = None
+                ) -> Iterator[Chore]:
+    """
+    Lazily yield Chore objects matching the given filters, one CSV row at a time.
+    Only one row is held in memory at once, so this is safe to use over large chore histories.
+    Iteration stops (and the file is closed) once limit chores have been yielded,
+    or as soon as the caller stops consuming the generator.
+    With a category, only the rows of that category are read, using the category index
+    (see _ChoreOffsetIndex.category_ids), and they are read together.
+    """
+    if limit is not None and limit <= 0:
+        return
+    matched = 0
+    rows = None
+    if category is not None:
+        rows = _read_category_rows(category)
+    if rows is None:
+        rows = _iter_chore_rows()
+    for row in rows:
+        # cheap string comparisons first, so rows that do not match are never fully parsed
+        if chore_id and row["Chore ID"] != chore_id:
+            continue
+        if category is not None and row.get("Category") != category:
+            continue
+        if assignee_id and row["Assignee ID"] != assignee_id:
+            continue
+        if status and row["Status"] != status.value:
+            continue
+        if repeating_only and not (row["Frequency"] and int(row["Frequency"])) and not row.get("Recurrence"):
+            continue
+        chore = Chore(row)
+        if min_deadline_date and (not chore.deadline_date or chore.deadline_date < min_deadline_date):
+            continue
+        if max_deadline_date and (not chore.deadline_date or chore.deadline_date > max_deadline_date):
+            continue
+        yield chore
+        matched += 1
+        if limit is not None and matched >= limit:
+            return
+
+
+@Metrics.timed('get_chores_by_filters')
 def get_chores_by_filters(assignee_id: str = None,
                           status: CHORE_STATUS = None,
                           min_deadline_date: date = None,
                           max_deadline_date: date = None,
-                          repeating_only: bool = False
+                          repeating_only: bool = False,
+                          category: str = None
                           ) -> list[Chore]:
     """
     Return a list of Chore objects matching the given filters.
     The list will be empty if none of the chores in the database match.
+    Use iter_chores() instead when the chores can be processed one at a time.
     """
-    matching_chores = []
-    with open(CHORES_FILEPATH, 'r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            chore = Chore(row)
-            if repeating_only and (not chore.frequency or chore.frequency == 0):
-                continue
-            if status and chore.status != status:
-                continue
-            if assignee_id and chore.assignee_id != assignee_id:
-                continue
-            if min_deadline_date and (not chore.deadline_date or chore.deadline_date < min_deadline_date):
-                continue
-            if max_deadline_date and (not chore.deadline_date or chore.deadline_date > max_deadline_date):
-                continue
-            matching_chores.append(Chore(row))
-    return matching_chores
+    return list(iter_chores(assignee_id=assignee_id,
+                            status=status,
+                            min_deadline_date=min_deadline_date,
+                            max_deadline_date=max_deadline_date,
+                            repeating_only=repeating_only,
+                            category=category))
 
 
+@Metrics.timed('get_user_ids')
 def get_user_ids() -> list[str]:
     """
     Return a list of all user IDs in the database.
     """
-    file = open('csvs/occupants.csv', 'r')
+    file = _open(OCCUPANTS_FILEPATH, 'r')
     reader = csv.DictReader(file)
     user_ids = []
     for row in reader:
@@ -417,17 +599,1020 @@ def get_user_ids() -> list[str]:
     return user_ids
 
 
+"""
+Snapshot Reads
+Writers never change the chores CSV in place: they write a new file and rename it over the old one.
+A reader holding the old file open keeps reading its contents, which the system frees once the last
+reader closes it. A version of the chore table is such an open file, pinned by the readers using it.
+"""
+
+
+class ChoreVersion:
+    """
+    An immutable version of the chores CSV: the file as it was when it was pinned, whatever is written since.
+    Its rows are read through a memory map of the open file, so any number of scans can read it at once.
+    """
+
+    def __init__(self, filepath: str, file, signature: list[int]):
+        self.filepath = filepath
+        self.file = file
+        self.signature = signature
+        self.pins = 0
+
+    def iter_rows(self) -> Iterator[dict[str, str]]:
+        """Lazily yield every row of this version as a dict (see _iter_chore_rows)."""
+        filename = os.path.basename(self.filepath)
+        Metrics.FILE_READS.inc(file=filename)
+        # mmap cannot map an empty file
+        if self.signature[1] == 0:
+            return
+        # the map holds its own reference to the file, so a scan started while pinned can outlive the pin
+        with mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            rows_scanned = 0
+            try:
+                for row in csv.DictReader(line.decode('utf-8') for line in iter(data.readline, b'')):
+                    rows_scanned += 1
+                    yield row
+            finally:
+                Metrics.ROWS_SCANNED.inc(rows_scanned, file=filename)
+                Metrics.BYTES_PARSED.inc(data.tell(), file=filename)
+
+
+# versions pinned by at least one reader, by file and signature
+_chore_versions: dict[tuple, ChoreVersion] = {}
+_chore_versions_lock = threading.Lock()
+
+# version pinned by the snapshot_reads block of each thread
+_snapshot_reads = threading.local()
+
+
+def pin_chore_version() -> ChoreVersion:
+    """
+    Pin the current version of the chores CSV, until unpin_chore_version.
+    Readers pinning the same version share it.
+    """
+    file = _open(CHORES_FILEPATH, 'rb')
+    signature = _stat_signature(os.fstat(file.fileno()))
+    key = (CHORES_FILEPATH, *signature)
+    with _chore_versions_lock:
+        version = _chore_versions.get(key)
+        if version is None:
+            version = _chore_versions[key] = ChoreVersion(CHORES_FILEPATH, file, signature)
+        else:
+            file.close()
+        version.pins += 1
+        Metrics.PINNED_CHORE_VERSIONS.set(len(_chore_versions))
+    return version
+
+
+def unpin_chore_version(version: ChoreVersion) -> None:
+    """Release a pinned version. Once it is no longer pinned, its file is closed and its space reclaimed."""
+    with _chore_versions_lock:
+        version.pins -= 1
+        if version.pins == 0:
+            del _chore_versions[(version.filepath, *version.signature)]
+            version.file.close()
+        Metrics.PINNED_CHORE_VERSIONS.set(len(_chore_versions))
+
+
+@contextmanager
+def snapshot_reads() -> Iterator[ChoreVersion]:
+    """
+    Within the block, the chore reads of the current thread (iter_chores, get_chores_by_filters, get_chore_by_id
+    and everything built on them) all see the version of the chores CSV current when the block started,
+    so a long scan or several reads see one consistent state. Writers are not blocked: their writes are made to
+    the latest version as usual, and are not seen by the block, even those of the current thread.
+    Reads must start within the block. Nested blocks share the outermost block's version.
+    """
+    version = getattr(_snapshot_reads, 'version', None)
+    if version is not None:
+        yield version
+        return
+    version = _snapshot_reads.version = pin_chore_version()
+    try:
+        yield version
+    finally:
+        _snapshot_reads.version = None
+        unpin_chore_version(version)
+
+
+def _pinned_chore_version() -> Union[ChoreVersion, None]:
+    """Return the version pinned by the current thread's snapshot_reads block for the chores CSV, if any."""
+    version = getattr(_snapshot_reads, 'version', None)
+    return version if version is not None and version.filepath == CHORES_FILEPATH else None
+
+
+def _chore_signature() -> list[int]:
+    """
+    Return the signature of the version of the chores CSV the current thread reads:
+    its pinned version, or the current file. Caches of the chores record it rather than the file's.
+    """
+    version = _pinned_chore_version()
+    return version.signature if version is not None else _file_signature(CHORES_FILEPATH)
+
+
+"""
+Chore Offset Index
+"""
+
+
+class _ChoreOffsetIndex:
+    """
+    Maps each Chore ID to the byte offset and length of its row in the chores CSV.
+    Lookups memory-map the CSV and parse exactly one row, and every process reading
+    the same file shares the operating system's page cache instead of its own copy.
+    The index is persisted in a sidecar file and rebuilt whenever the chores CSV changes.
+    """
+    filepath: str
+    signature: list[int]
+    header: list[str]
+    offsets: dict[str, tuple[int, int]]
+    hash_indexes: Union[dict[str, dict[str, list[str]]], None]
+    range_indexes: Union[dict[str, tuple[list[str], list[str]]], None]
+
+    def __init__(self, filepath: str, signature: list[int], header: list[str],
+                 offsets: dict[str, tuple[int, int]]):
+        self.filepath = filepath
+        self.signature = signature
+        self.header = header
+        self.offsets = offsets
+        # column indexes, built together on first use (see column_indexes)
+        self.hash_indexes = None
+        self.range_indexes = None
+
+    @classmethod
+    def build(cls, filepath: str, signature: list[int]) -> '_ChoreOffsetIndex':
+        """Scan the CSV once, recording where each row starts and how long it is."""
+        header = None
+        offsets = {}
+        with _open(filepath, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        Metrics.BYTES_PARSED.inc(len(data), file=os.path.basename(filepath))
+        with data:
+            size = len(data)
+            start = 0
+            search_from = 0
+            while start < size:
+                end = data.find(b'\n', search_from)
+                end = size if end == -1 else end + 1
+                record = data[start:end]
+                # a newline inside a quoted field does not end the row
+                if record.count(b'"') % 2 and end < size:
+                    search_from = end
+                    continue
+                if record.strip():
+                    if header is None:
+                        header = _parse_csv_record(record)
+                    else:
+                        # the Chore ID is the first column, only parse the full row when it is quoted
+                        chore_id = _parse_csv_record(record)[0] if record.startswith(b'"') \
+                            else record[:record.find(b',')].decode('utf-8')
+                        offsets.setdefault(chore_id, (start, end - start))
+                start = search_from = end
+        return cls(filepath, signature, header or [], offsets)
+
+    def save(self) -> None:
+        """Persist the index to its sidecar file, so other processes need not rebuild it."""
+        saved = {"signature": self.signature, "header": self.header, "offsets": self.offsets}
+        _replace_file(self.filepath + CHORE_INDEX_SUFFIX, lambda file: json.dump(saved, file))
+
+    @classmethod
+    def load(cls, filepath: str, signature: list[int]) -> Union['_ChoreOffsetIndex', None]:
+        """Load the index from its sidecar file, or return None if it is missing or stale."""
+        try:
+            with open(filepath + CHORE_INDEX_SUFFIX, 'r') as file:
+                saved = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if saved.get("signature") != signature:
+            return None
+        offsets = {chore_id: (offset, length) for chore_id, (offset, length) in saved["offsets"].items()}
+        return cls(filepath, signature, saved["header"], offsets)
+
+    def read_row(self, chore_id: str) -> Union[dict[str, str], None]:
+        """Parse the row of the given chore straight out of the memory-mapped CSV."""
+        offset, length = self.offsets[chore_id]
+        # the file is mapped per lookup rather than kept open, so that it can still be replaced on every platform
+        with _open(self.filepath, 'rb') as file:
+            # make sure the file opened is the version that was indexed
+            if _stat_signature(os.fstat(file.fileno())) != self.signature:
+                return None
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                record = data[offset:offset + length]
+        Metrics.ROWS_SCANNED.inc(file=os.path.basename(self.filepath))
+        Metrics.BYTES_PARSED.inc(len(record), file=os.path.basename(self.filepath))
+        fields = _parse_csv_record(record)
+        if len(fields) != len(self.header):
+            return None
+        return dict(zip(self.header, fields))
+
+    def read_rows(self, chore_ids: list[str]) -> Union[list[dict[str, str]], None]:
+        """
+        Parse the rows of the given chores out of the memory-mapped CSV, mapping it only once.
+        Returns None if the CSV changed since it was indexed, or a row cannot be parsed.
+        """
+        records = []
+        with _open(self.filepath, 'rb') as file:
+            if _stat_signature(os.fstat(file.fileno())) != self.signature:
+                return None
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for chore_id in chore_ids:
+                    offset, length = self.offsets[chore_id]
+                    record = data[offset:offset + length]
+                    # the last row of the file may lack its newline
+                    records.append(record if record.endswith(b'\n') else record + b'\n')
+        # parse the rows together, with a single CSV reader
+        text = b''.join(records)
+        Metrics.ROWS_SCANNED.inc(len(records), file=os.path.basename(self.filepath))
+        Metrics.BYTES_PARSED.inc(len(text), file=os.path.basename(self.filepath))
+        rows = []
+        for fields in csv.reader(io.StringIO(text.decode('utf-8'), newline='')):
+            if len(fields) != len(self.header):
+                return None
+            rows.append(dict(zip(self.header, fields)))
+        return rows if len(rows) == len(records) else None
+
+    @property
+    def categories(self) -> Union[dict[str, list[str]], None]:
+        """The hash index on the Category column, if it has been built."""
+        return self.hash_indexes.get("Category") if self.hash_indexes is not None else None
+
+    def category_ids(self) -> Union[dict[str, list[str]], None]:
+        """
+        Return the IDs of the chores of every category, in file order: a hash index on the Category column.
+        Returns None if it cannot be built (see column_indexes).
+        """
+        if not self.column_indexes():
+            return None
+        return self.categories
+
+    def column_indexes(self) -> bool:
+        """
+        Build the hash indexes (value -> IDs of its chores, in file order) of HASH_INDEXED_COLUMNS,
+        and the range indexes (sorted values, and the IDs of their chores) of RANGE_INDEXED_COLUMNS,
+        in one pass over the indexed rows. They are built on first use, and last as long as this version of the CSV.
+        Returns False if they cannot be built (the CSV changed, or lacks one of the columns).
+        """
+        if self.hash_indexes is not None:
+            return True
+        if any(column not in self.header for column in HASH_INDEXED_COLUMNS + RANGE_INDEXED_COLUMNS):
+            return False
+        hash_indexes: dict[str, dict[str, list[str]]] = {column: {} for column in HASH_INDEXED_COLUMNS}
+        range_entries: dict[str, list[tuple[str, str]]] = {column: [] for column in RANGE_INDEXED_COLUMNS}
+        hashed = [(hash_indexes[column], self.header.index(column)) for column in HASH_INDEXED_COLUMNS]
+        ranged = [(range_entries[column], self.header.index(column)) for column in RANGE_INDEXED_COLUMNS]
+        with _open(self.filepath, 'rb') as file:
+            if _stat_signature(os.fstat(file.fileno())) != self.signature:
+                return False
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for chore_id, (offset, length) in self.offsets.items():
+                    fields = _parse_csv_record(data[offset:offset + length])
+                    if len(fields) != len(self.header):
+                        return False
+                    for index, position in hashed:
+                        index.setdefault(fields[position], []).append(chore_id)
+                    for entries, position in ranged:
+                        # rows without a value (e.g. no completion date) never match a range
+                        if fields[position]:
+                            entries.append((fields[position], chore_id))
+        Metrics.ROWS_SCANNED.inc(len(self.offsets), file=os.path.basename(self.filepath))
+        range_indexes = {}
+        for column, entries in range_entries.items():
+            # a stable sort keeps the chores with the same value in file order
+            entries.sort(key=lambda entry: entry[0])
+            range_indexes[column] = ([value for value, _ in entries], [chore_id for _, chore_id in entries])
+        self.range_indexes = range_indexes
+        self.hash_indexes = hash_indexes
+        return True
+
+
+def _read_category_rows(category: str) -> Union[list[dict[str, str]], None]:
+    """
+    Return the rows of the chores in the category, read through the category index,
+    or None if the index cannot be used (the caller then scans the CSV instead).
+    """
+    index = _get_chore_offset_index()
+    if index is None:
+        return None
+    categories = index.category_ids()
+    if categories is None:
+        return None
+    return index.read_rows(categories.get(category, []))
+
+
+# the chore offset index for the current version of the chores CSV, if it has been loaded
+_chore_offset_index: Union[_ChoreOffsetIndex, None] = None
+
+
+def _get_chore_offset_index() -> Union[_ChoreOffsetIndex, None]:
+    """
+    Return the offset index matching the current chores CSV,
+    loading it from the sidecar file or rebuilding it when the CSV has changed.
+    Returns None if the chores CSV cannot be indexed (e.g. it is empty).
+    """
+    global _chore_offset_index
+    try:
+        signature = _file_signature(CHORES_FILEPATH)
+    except FileNotFoundError:
+        return None
+    index = _chore_offset_index
+    version = _pinned_chore_version()
+    if version is not None and version.signature != signature:
+        # the index reads the current file: of no use for an older pinned version, which is scanned instead
+        return None
+    if index is not None and index.filepath == CHORES_FILEPATH and index.signature == signature:
+        return index
+    # mmap cannot map an empty file
+    if signature[1] == 0:
+        return None
+    index = _ChoreOffsetIndex.load(CHORES_FILEPATH, signature)
+    if index is None:
+        index = _ChoreOffsetIndex.build(CHORES_FILEPATH, signature)
+        try:
+            index.save()
+        except OSError:
+            pass  # the index still works in memory, it just is not shared
+    _chore_offset_index = index
+    return index
+
+
+"""
+Chore Mutations and Group Commit
+"""
+
+
+class _NothingToWrite(Exception):
+    """Raised to abandon a rewrite of the chores CSV which would not change anything."""
+
+
+class _ChoreMutation:
+    """
+    A change to a single chore, applied while the chores CSV is being rewritten.
+    apply receives a copy of the chore's current CSV row (None if there is no such chore),
+    and returns its new row (None to remove it), or raises a ValueError if the change is invalid.
+    """
+    chore_id: str
+    apply: Callable[[Union[dict, None]], Union[dict, None]]
+    error: Union[BaseException, None]
+    done: bool
+    # sequence number of the change log entry of the write which applied the mutation, if any
+    sequence: Union[int, None]
+
+    def __init__(self, chore_id: str, apply: Callable[[Union[dict, None]], Union[dict, None]]):
+        self.chore_id = chore_id
+        self.apply = apply
+        self.error = None
+        self.done = False
+        self.sequence = None
+
+
+def _new_chore_mutation(chore: Chore) -> _ChoreMutation:
+    """Return the mutation adding the chore, giving it an ID first if it has none."""
+    # if chore does not have an id, generate a unique one
+    if not chore.id:
+        chore.id = generate_uid()
+    new_row = chore.to_csv_row()
+
+    def add_chore(row: Union[dict, None]) -> dict:
+        # check that the chore does not already exist (based on id)
+        if row is not None:
+            raise ValueError("Chore ID already exists in database")
+        # new chores are added at the end of the file
+        return new_row
+
+    return _ChoreMutation(chore.id, add_chore)
+
+
+def _update_chore_mutation(chore: Chore) -> _ChoreMutation:
+    """Return the mutation replacing the chore's row with the chore's attributes."""
+    new_row = chore.to_csv_row()
+
+    def update_chore(row: Union[dict, None]) -> dict:
+        if row is None:
+            raise ValueError("Chore ID not found in database")
+        # replace the line with the new chore attributes
+        return new_row
+
+    return _ChoreMutation(chore.id, update_chore)
+
+
+def _update_if_unchanged_mutation(read_chore: Chore, chore: Chore) -> _ChoreMutation:
+    """Return the mutation replacing the chore's row, provided it still matches the chore as it was read."""
+    read_row = read_chore.to_csv_row()
+    new_row = chore.to_csv_row()
+
+    def update_chore(row: Union[dict, None]) -> dict:
+        if row is None or Chore(row).to_csv_row() != read_row:
+            raise ValueError("Chore changed since it was read")
+        return new_row
+
+    return _ChoreMutation(chore.id, update_chore)
+
+
+def _apply_chore_mutations(mutations: list[_ChoreMutation]) -> None:
+    """
+    Apply the mutations, in order, in a single rewrite of the chores CSV.
+    A mutation raising a ValueError is skipped (its error is recorded on it) without affecting the others.
+    Chores which did not exist yet are added at the end of the file.
+    """
+    mutations_by_id: dict[str, list[_ChoreMutation]] = {}
+    for mutation in mutations:
+        mutations_by_id.setdefault(mutation.chore_id, []).append(mutation)
+
+    # (old row, new row) of every chore changed by the write, for the chore listeners
+    changes: list[tuple[Union[dict, None], Union[dict, None]]] = []
+
+    def apply_all(chore_id: str, row: Union[dict, None]) -> Union[dict, None]:
+        old_row = row
+        for mutation in mutations_by_id[chore_id]:
+            try:
+                row = mutation.apply(dict(row) if row is not None else None)
+            except ValueError as error:
+                mutation.error = error
+        if row != old_row:
+            changes.append((old_row, row))
+        return row
+
+    def rewrite(rows: Iterator[dict]) -> Iterator[dict]:
+        seen = set()
+        for row in rows:
+            chore_id = row["Chore ID"]
+            if chore_id in mutations_by_id and chore_id not in seen:
+                seen.add(chore_id)
+                row = apply_all(chore_id, row)
+                if row is None:
+                    continue
+            yield row
+        for chore_id in mutations_by_id:
+            if chore_id not in seen:
+                row = apply_all(chore_id, None)
+                if row is not None:
+                    yield row
+        # leave the file untouched if every mutation failed
+        if all(mutation.error is not None for mutation in mutations):
+            raise _NothingToWrite()
+
+    signature_before = _file_signature(CHORES_FILEPATH)
+    try:
+        _rewrite_chores(rewrite)
+    except _NothingToWrite:
+        return
+    Metrics.GROUP_COMMIT_BATCHES.inc()
+    Metrics.GROUP_COMMIT_MUTATIONS.inc(len(mutations))
+    if changes:
+        sequence = _log_changes('chores', {(old_row or new_row)["Chore ID"]: new_row for old_row, new_row in changes})
+        for mutation in mutations:
+            mutation.sequence = sequence
+    _notify_chore_listeners(changes, signature_before, _file_signature(CHORES_FILEPATH))
+
+
+class _GroupCommitter:
+    """
+    Combines chore mutations from concurrent callers into as few rewrites of the chores CSV as possible.
+    The first caller to arrive becomes the leader: it (optionally) waits GROUP_COMMIT_WINDOW seconds,
+    then writes every queued mutation at once. Callers arriving while a write is in progress queue up
+    for the next one. Each caller blocks only until the write containing its mutations is done.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._queue: list[_ChoreMutation] = []
+        self._writing = False
+
+    def commit(self, mutations: list[_ChoreMutation]) -> None:
+        with self._condition:
+            self._queue.extend(mutations)
+            # wait until either our mutations were written by another leader, or we can lead the next write
+            while not all(mutation.done for mutation in mutations) and self._writing:
+                self._condition.wait()
+            if all(mutation.done for mutation in mutations):
+                _remember_change_sequence(mutations)
+                return
+            self._writing = True
+        try:
+            if GROUP_COMMIT_WINDOW > 0:
+                time.sleep(GROUP_COMMIT_WINDOW)
+        finally:
+            with self._condition:
+                batch, self._queue = self._queue, []
+        try:
+            _apply_chore_mutations(batch)
+        except BaseException as error:
+            # the write failed as a whole, so every mutation in it failed
+            for mutation in batch:
+                mutation.error = mutation.error or error
+            raise
+        finally:
+            with self._condition:
+                for mutation in batch:
+                    mutation.done = True
+                self._writing = False
+                self._condition.notify_all()
+        _remember_change_sequence(mutations)
+
+
+# group committer for all chore mutations made by this process
+_group_committer = _GroupCommitter()
+
+
+# the batch collecting the chore mutations of the current thread, see batched_chore_writes
+_write_batch = threading.local()
+
+
+class ChoreWriteBatch:
+    """
+    The chore mutations made by a thread inside batched_chore_writes, committed together when the block ends.
+    Use mark() before a group of writes and error_since() after the block, to find out whether they succeeded.
+    """
+
+    def __init__(self):
+        self.mutations: list[_ChoreMutation] = []
+
+    def mark(self) -> int:
+        """Return the position of the next write in the batch."""
+        return len(self.mutations)
+
+    def error_since(self, start: int, end: Union[int, None] = None) -> Union[BaseException, None]:
+        """Return the error of the first failed write between the two marks (to the end if not given), if any."""
+        for mutation in self.mutations[start:end]:
+            if mutation.error is not None:
+                return mutation.error
+        return None
+
+
+@contextmanager
+def batched_chore_writes() -> Iterator[ChoreWriteBatch]:
+    """
+    Within the block, the chore writes of the current thread (new, updated and completed chores) are not made
+    right away, but collected and committed in a single write of the chores CSV when the block ends.
+    Errors of individual writes, such as completing an unassigned chore, are not raised but recorded in the batch.
+    Reads within the block do not see the collected writes. If the block raises, nothing is written.
+    Nested blocks join the outermost batch. update_chores_if_unchanged, whose result depends on
+    the write, is not batched.
+    """
+    batch = getattr(_write_batch, 'batch', None)
+    if batch is not None:
+        yield batch
+        return
+    batch = _write_batch.batch = ChoreWriteBatch()
+    try:
+        yield batch
+    finally:
+        _write_batch.batch = None
+    if batch.mutations:
+        _group_committer.commit(batch.mutations)
+
+
+def _commit_chore_mutations(mutations: list[_ChoreMutation]) -> None:
+    """
+    Durably apply the mutations to the chores CSV, possibly together with those of concurrent callers.
+    Raises the error of the first mutation that failed.
+    In a batched_chore_writes block, the mutations are only added to the batch.
+    """
+    batch = getattr(_write_batch, 'batch', None)
+    if batch is not None:
+        batch.mutations.extend(mutations)
+        return
+    _group_committer.commit(mutations)
+    for mutation in mutations:
+        if mutation.error is not None:
+            raise mutation.error
+
+
+# functions called after every write of the chores CSV, see register_chore_listener
+_chore_listeners: list[Callable[[list, list[int], list[int]], None]] = []
+
+
+def register_chore_listener(listener: Callable[[list, list[int], list[int]], None]) -> None:
+    """
+    Call listener(changes, signature_before, signature_after) after every write of the chores CSV
+    made by this process, so that caches derived from the chores can be updated incrementally.
+    changes lists an (old row, new row) pair for every chore the write added, changed or removed
+    (the old row is None for added chores, the new row None for removed ones).
+    The signatures of the chores CSV before and after the write let listeners detect that they
+    missed writes made by other processes. Writers wait for the listeners, so they must be quick.
+    """
+    if listener not in _chore_listeners:
+        _chore_listeners.append(listener)
+
+
+def unregister_chore_listener(listener: Callable[[list, list[int], list[int]], None]) -> None:
+    """Stop calling a listener registered with register_chore_listener."""
+    if listener in _chore_listeners:
+        _chore_listeners.remove(listener)
+
+
+def _notify_chore_listeners(changes: list, signature_before: list[int], signature_after: list[int]) -> None:
+    for listener in list(_chore_listeners):
+        try:
+            listener(changes, signature_before, signature_after)
+        except Exception as error:
+            # the write itself succeeded, a failing listener must not make it look like it did not
+            print(f"Chore listener {getattr(listener, '__qualname__', listener)} failed: {error!r}")
+
+
+"""
+Change Log
+"""
+
+# serializes the writers of the change log in this process, and guards _change_log_end
+_change_log_lock = threading.Lock()
+
+# ((inode, size) of the change log after this process last wrote to it, sequence number of its last entry)
+_change_log_end: tuple[tuple[int, int], int] = ((0, 0), 0)
+
+# sequence number of the change log entry of the last write made by each thread, see take_change_sequence
+_change_sequence = threading.local()
+
+
+def change_log_filepath() -> str:
+    """Return the path of the change log, next to the chores CSV."""
+    return os.path.join(os.path.dirname(CHORES_FILEPATH), CHANGE_LOG_FILENAME)
+
+
+def take_change_sequence() -> Union[int, None]:
+    """
+    Return the sequence number of the change log entry of the last write made by the current thread
+    since the previous call (None if there was none, or the change log is off).
+    Clients given it can read their own writes from a replica, see Replication.ChoreReplica.wait_for.
+    """
+    sequence = getattr(_change_sequence, 'sequence', None)
+    _change_sequence.sequence = None
+    return sequence
+
+
+def compact_change_log() -> int:
+    """
+    Replace the change log with a single snapshot of the data files, numbered like its last entry,
+    so that it stops growing. Followers which had not read every entry yet reload the snapshot.
+    Returns the sequence number of the snapshot (0 if there is no change log).
+    """
+    global _change_log_end
+    filepath = change_log_filepath()
+    if not os.path.exists(filepath):
+        return 0
+    with _change_log_lock, _locked_change_log() as file:
+        sequence = _last_change_sequence(file)
+        if sequence == 0:
+            return 0
+        line = _encode_change(_snapshot_change(sequence))
+        _replace_file(filepath, lambda new_file: new_file.write(line.decode()))
+        stat = os.stat(filepath)
+        _change_log_end = ((stat.st_ino, stat.st_size), sequence)
+    return sequence
+
+
+def _log_changes(table: str, rows: dict[str, Union[dict, list, None]]) -> Union[int, None]:
+    """
+    Append an entry with the new rows of the table ('chores' or 'occupants'), keyed by chore or occupant ID
+    (None for removed rows), to the change log, and return its sequence number (None if the change log is off).
+    A new change log starts with a snapshot of the data files, which already holds the rows, instead.
+    The data files are written before the log, so entries may be applied to state which already holds them:
+    they carry whole rows, so applying them again is harmless.
+    """
+    global _change_log_end
+    if not CHANGE_LOG:
+        return None
+    if table == 'chores':
+        # rows are logged as they read back from the CSV
+        rows = {chore_id: {column: '' if value is None else str(value) for column, value in row.items()}
+                if row is not None else None for chore_id, row in rows.items()}
+    try:
+        with _change_log_lock, _locked_change_log() as file:
+            sequence = _last_change_sequence(file) + 1
+            if sequence == 1:
+                change = _snapshot_change(sequence)
+            else:
+                change = {'seq': sequence, 'time': time.time(), 'table': table, 'rows': rows}
+            file.write(_encode_change(change))
+            file.flush()
+            stat = os.fstat(file.fileno())
+            _change_log_end = ((stat.st_ino, stat.st_size), sequence)
+    except OSError as error:
+        # the write itself succeeded, followers catch up again once the log is compacted
+        print(f"Could not append to the change log: {error!r}")
+        return None
+    _sync_after_write(change_log_filepath())
+    _change_sequence.sequence = sequence
+    return sequence
+
+
+def _remember_change_sequence(mutations: list['_ChoreMutation']) -> None:
+    """Record the last change log entry of the write which applied the mutations, for take_change_sequence."""
+    sequences = [mutation.sequence for mutation in mutations if mutation.sequence is not None]
+    if sequences:
+        _change_sequence.sequence = max(sequences)
+
+
+@contextmanager
+def _locked_change_log() -> Iterator:
+    """Open the change log for appending, holding its lock (shared with other processes) within the block."""
+    filepath = change_log_filepath()
+    while True:
+        file = open(filepath, 'ab+')
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)  # released when the file is closed
+        # another process may have compacted (replaced) the log while this one waited for the lock
+        try:
+            if os.stat(filepath).st_ino == os.fstat(file.fileno()).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        file.close()
+    try:
+        yield file
+    finally:
+        file.close()
+
+
+def _last_change_sequence(file) -> int:
+    """Return the sequence number of the last entry of the (locked) change log, 0 if it is empty."""
+    stat = os.fstat(file.fileno())
+    end = (stat.st_ino, stat.st_size)
+    if _change_log_end[0] == end:
+        return _change_log_end[1]
+    # read back from the end of the file to the start of the last line
+    line, line_start = b'', stat.st_size
+    while line_start > 0:
+        start = max(0, line_start - 65536)
+        file.seek(start)
+        line = file.read(line_start - start) + line
+        line_start = start
+        newline = line.rfind(b'\n', 0, len(line) - 1)
+        if newline >= 0:
+            line, line_start = line[newline + 1:], line_start + newline + 1
+            break
+    if not line:
+        return 0
+    try:
+        return json.loads(line)['seq']
+    except ValueError:
+        # left incomplete by a writer killed while appending: drop it
+        os.ftruncate(file.fileno(), line_start)
+        return _last_change_sequence(file)
+
+
+def _snapshot_change(sequence: int) -> dict:
+    """Return a change log entry holding every row of the data files, as they are now."""
+    try:
+        with _open(OCCUPANTS_FILEPATH, 'r', newline='') as file:
+            occupants = list(csv.reader(file))
+    except FileNotFoundError:
+        occupants = []
+    return {'seq': sequence, 'time': time.time(),
+            'snapshot': {'chores': list(_iter_current_chore_rows()), 'occupants': occupants}}
+
+
+def _encode_change(change: dict) -> bytes:
+    return json.dumps(change, separators=(',', ':')).encode() + b'\n'
+
+
+def _is_occupants_file(filepath: str) -> bool:
+    """Return True if filepath is the household's occupants CSV (rather than e.g. a test's)."""
+    return os.path.abspath(filepath) == os.path.abspath(OCCUPANTS_FILEPATH)
+
+
 """
 Other/Helper Functions
 """
 
 
+def _file_signature(filepath: str) -> list[int]:
+    """
+    Return values which change whenever the file at filepath is rewritten or replaced:
+    its modification time, size and inode number.
+    """
+    return _stat_signature(os.stat(filepath))
+
+
+def _stat_signature(stat: os.stat_result) -> list[int]:
+    """Return the file signature (see _file_signature) from the result of a stat call."""
+    return [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+
+
+def _parse_csv_record(record: bytes) -> list[str]:
+    """Parse a single CSV row (which may contain quoted newlines) into its fields."""
+    return next(csv.reader(io.StringIO(record.decode('utf-8'), newline='')), [])
+
+
 def generate_uid() -> str:
     """
     This function generates a unique key, which can be used to
     identify a chore or a Haus occupant.
+    The IDs are random UUIDs unless another generator was set (see set_id_generator and ID_MODE).
     """
-    return str(uuid.uuid4())
+    return _id_generator()
+
+
+def _open(filepath: str, mode: str = 'r', **kwargs):
+    """Open a data file, counting the access in the instrumentation metrics."""
+    if Metrics.is_enabled():
+        counter = Metrics.FILE_READS if mode in ('r', 'rb') else Metrics.FILE_WRITES
+        counter.inc(file=os.path.basename(filepath))
+    return open(filepath, mode, **kwargs)
+
+
+def _iter_chore_rows() -> Iterator[dict[str, str]]:
+    """
+    Lazily yield every row of the chores CSV as a dict,
+    from the version pinned by the current thread if it is within snapshot_reads.
+    The file is closed once the generator is exhausted or discarded.
+    """
+    version = _pinned_chore_version()
+    if version is not None:
+        return version.iter_rows()
+    return _iter_current_chore_rows()
+
+
+def _iter_current_chore_rows() -> Iterator[dict[str, str]]:
+    """Lazily yield every row of the current chores CSV as a dict, as writers must read it."""
+    with _open(CHORES_FILEPATH, 'r', newline='') as file:
+        rows_scanned = 0
+        try:
+            for row in csv.DictReader(file):
+                rows_scanned += 1
+                yield row
+        finally:
+            filename = os.path.basename(CHORES_FILEPATH)
+            Metrics.ROWS_SCANNED.inc(rows_scanned, file=filename)
+            Metrics.BYTES_PARSED.inc(file.buffer.tell(), file=filename)
+
+
+@Metrics.timed('rewrite_chores')
+def _rewrite_chores(rewrite: Callable[[Iterator[dict]], Iterable[dict]]) -> None:
+    """
+    Stream the chores CSV through the rewrite function into a temporary file,
+    then replace the chores CSV with it.
+    rewrite receives an iterator over the existing rows and yields the rows to write,
+    so only one row needs to be held in memory at a time.
+    If rewrite raises an exception, the chores CSV is left untouched.
+    """
+    def write_chores(file) -> None:
+        writer = csv.DictWriter(file, fieldnames=CHORE_ATTRIBUTES)
+        writer.writeheader()
+        writer.writerows(rewrite(_iter_current_chore_rows()))
+
+    _replace_file(CHORES_FILEPATH, write_chores)
+
+
+def _replace_file(filepath: str, write: Callable) -> None:
+    """
+    Atomically replace the file at filepath with the contents written by write(file) to a temporary file.
+    Readers (and a crash) see either the old or the new file, never a partially written one.
+    How soon the new contents are guaranteed to be on disk depends on the DURABILITY_MODE.
+    If write raises an exception, the file is left untouched and the temporary file is removed.
+    """
+    directory = os.path.dirname(filepath) or '.'
+    Metrics.FILE_WRITES.inc(file=os.path.basename(filepath))
+    # the pid in the name lets recover_interrupted_writes() tell which writer left a temporary file behind
+    prefix = f".{os.path.basename(filepath)}.{os.getpid()}."
+    with tempfile.NamedTemporaryFile('w', dir=directory, prefix=prefix, suffix=TEMP_FILE_SUFFIX,
+                                     newline='', delete=False) as tmp_file:
+        try:
+            write(tmp_file)
+            # keep the permissions of the file being replaced
+            if os.path.exists(filepath):
+                os.chmod(tmp_file.name, os.stat(filepath).st_mode)
+            if DURABILITY_MODE == 'strict':
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+        except BaseException:
+            tmp_file.close()
+            os.remove(tmp_file.name)
+            raise
+    os.replace(tmp_file.name, filepath)
+    _sync_after_write(filepath, replaced=True)
+
+
+def _sync_after_write(filepath: str, replaced: bool = False) -> None:
+    """
+    Make a write to the file at filepath durable according to the DURABILITY_MODE.
+    strict: fsync the file (unless it was already synced before replacing it) and its directory now.
+    batched: leave it to the background flusher, which syncs within DURABILITY_BATCH_INTERVAL.
+    relaxed: do nothing.
+    """
+    if DURABILITY_MODE == 'strict':
+        if not replaced:
+            _fsync_path(filepath)
+        _fsync_directory(os.path.dirname(filepath) or '.')
+    elif DURABILITY_MODE == 'batched':
+        _batched_syncer.add(filepath)
+
+
+def _fsync_path(filepath: str) -> None:
+    """Flush the contents of the file at filepath to disk."""
+    with open(filepath, 'rb') as file:
+        os.fsync(file.fileno())
+
+
+def _fsync_directory(directory: str) -> None:
+    """Flush the directory entries (e.g. a rename) of the directory to disk, where the platform allows it."""
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # directories cannot be opened on Windows, where renames are durable on their own
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+class _BatchedSyncer:
+    """Background thread syncing recently written files (and their directories) at a fixed interval."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._thread = None
+
+    def add(self, filepath: str) -> None:
+        with self._lock:
+            self._pending.add(os.path.abspath(filepath))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='haus-batched-sync', daemon=True)
+                self._thread.start()
+
+    def flush(self) -> None:
+        """Sync every pending file now."""
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        for filepath in pending:
+            try:
+                _fsync_path(filepath)
+            except FileNotFoundError:
+                continue  # replaced again or removed since
+        for directory in {os.path.dirname(filepath) for filepath in pending}:
+            _fsync_directory(directory)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(DURABILITY_BATCH_INTERVAL)
+            self.flush()
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+
+# syncs files written in the batched durability mode
+_batched_syncer = _BatchedSyncer()
+atexit.register(_batched_syncer.flush)
+
+
+def set_durability_mode(mode: str, batch_interval: Union[float, None] = None) -> None:
+    """
+    Select how writes to the data files are made durable, one of DURABILITY_MODES.
+    batch_interval sets the seconds between syncs in the batched mode.
+    """
+    global DURABILITY_MODE, DURABILITY_BATCH_INTERVAL
+    if mode not in DURABILITY_MODES:
+        raise ValueError(f"Unknown durability mode: {mode}")
+    # make whatever is pending durable before switching
+    _batched_syncer.flush()
+    DURABILITY_MODE = mode
+    if batch_interval is not None:
+        DURABILITY_BATCH_INTERVAL = batch_interval
+
+
+def recover_interrupted_writes(directory: str) -> list[str]:
+    """
+    Remove the temporary files left in the directory by writers which were interrupted (e.g. killed)
+    before replacing their target file. The target files themselves are always intact.
+    Temporary files of writers which are still running are left alone.
+    Returns the paths of the removed files.
+    """
+    removed = []
+    for filename in os.listdir(directory):
+        if not (filename.startswith('.') and filename.endswith(TEMP_FILE_SUFFIX)):
+            continue
+        # .<target file name>.<pid>.<random>.tmp
+        parts = filename.split('.')
+        if len(parts) < 5 or not parts[-3].isdigit():
+            continue
+        if _process_is_running(int(parts[-3])):
+            continue
+        filepath = os.path.join(directory, filename)
+        try:
+            os.remove(filepath)
+            removed.append(filepath)
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def _process_is_running(pid: int) -> bool:
+    """Return True if a process with the given pid exists."""
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True  # exists but belongs to someone else, or the platform cannot tell: assume it is running
+    return True
 
 
 def ensure_csv_headers(filename: str, headers: list[str]) -> None:
@@ -435,7 +1620,7 @@ def ensure_csv_headers(filename: str, headers: list[str]) -> None:
     Ensures that the CSV file at filename contains the headers specified in the headers list.
     """
     try:
-        with open(filename, 'r+', newline='') as file:
+        with _open(filename, 'r+', newline='') as file:
             # Try to read the first row and check if the headers match
             reader = csv.reader(file)
             existing_headers = next(reader, None)
@@ -454,12 +1639,15 @@ def ensure_csv_headers(filename: str, headers: list[str]) -> None:
                     file.seek(0, 2)
                     # Write what was read as the first row back into the file, assuming it's actual data
                     writer.writerow(existing_headers)
+                file.flush()
+                _sync_after_write(filename)
 
     except FileNotFoundError:
         # File does not exist, creating new file with headers
-        with open(filename, 'w', newline='') as file:
+        with _open(filename, 'w', newline='') as file:
             writer = csv.writer(file)
             writer.writerow(headers)
+        _sync_after_write(filename)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+"""
+Workload Forecasting
+Author: Haus Team
+Date: 10/19/2026
+
+This module projects how much work the repeating chores will give each occupant over the coming days,
+so that the automatic assignment can balance load beyond the chores which are already stored.
+
+Each series of repeating chores is expected to keep recurring according to its rule (see Recurrence.py),
+and its future instances are attributed to the assignee of its latest instance. The projection is cached:
+it is kept up to date from the changes reported by DataInput after each write, and only rebuilt from the
+chores CSV when another process has written to it.
+"""
+
+# other modules in the software
+import DataInput
+import Recurrence
+from DataInput import Chore
+
+# python libraries
+import os
+import threading
+from datetime import date, timedelta
+
+# enhanced typing
+from typing import Union
+
+# Days ahead of today the forecast covers by default
+FORECAST_HORIZON_DAYS = int(os.environ.get('HAUS_FORECAST_HORIZON_DAYS', '14') or 14)
+
+
+class WorkloadForecast:
+    """
+    Projected minutes of repeating chores per assignee, over the horizon_days following a given day.
+    Instances which are already stored are not part of the projection.
+    """
+
+    def __init__(self, horizon_days: int = FORECAST_HORIZON_DAYS):
+        self.horizon_days = horizon_days
+        self._lock = threading.Lock()
+        # latest stored instance of every series, and the chores CSV signature they reflect (None: unknown)
+        self._series: dict[str, tuple[int, Chore]] = {}
+        self._signature: Union[list[int], None] = None
+        # projection for the current window: (assignee, minutes) per series, and minutes per assignee
+        self._today: Union[date, None] = None
+        self._contributions: dict[str, tuple[Union[str, None], int]] = {}
+        self._loads: dict[Union[str, None], int] = {}
+        self.rebuilds = 0
+
+    def loads(self, today: Union[date, None] = None) -> dict[Union[str, None], int]:
+        """Return the projected minutes per assignee (None for unassigned series) after today."""
+        if today is None:
+            today = DataInput.today()
+        with self._lock:
+            if self._signature != DataInput._chore_signature():
+                self._rebuild()
+            if self._today != today:
+                self._today = today
+                self._contributions = {}
+                self._loads = {}
+                for series_id in self._series:
+                    self._project(series_id)
+            return dict(self._loads)
+
+    def load(self, user_id: str, today: Union[date, None] = None) -> int:
+        """Return the projected minutes of repeating chores for one occupant after today."""
+        return self.loads(today).get(user_id, 0)
+
+    def invalidate(self) -> None:
+        """Forget the cached projection, so that the next query rebuilds it from the chores CSV."""
+        with self._lock:
+            self._signature = None
+
+    def chores_changed(self, changes: list, signature_before: list[int], signature_after: list[int]) -> None:
+        """
+        Update the projection after a write of the chores CSV (see DataInput.register_chore_listener).
+        Only the series of the changed chores are projected again.
+        """
+        with self._lock:
+            if self._signature is None or self._signature != signature_before:
+                # never built, or another process wrote in between: rebuild on the next query
+                self._signature = None
+                return
+            for old_row, new_row in changes:
+                if not self._apply_change(old_row, new_row):
+                    self._signature = None
+                    return
+            self._signature = signature_after
+
+    def _rebuild(self) -> None:
+        """Find the latest instance of every series in one scan of the chores CSV."""
+        self._series = {}
+        # the chores and the signature recorded come from the same version
+        with DataInput.snapshot_reads() as version:
+            self._signature = version.signature
+            for series_id, latest in Recurrence.latest_instances().items():
+                self._series[series_id] = (Recurrence.parse_id(latest.id)[1], latest)
+        self._today = None
+        self.rebuilds += 1
+
+    def _apply_change(self, old_row: Union[dict, None], new_row: Union[dict, None]) -> bool:
+        """Apply one changed chore to the cached series. Returns False if a rebuild is needed instead."""
+        row = new_row if new_row is not None else old_row
+        try:
+            series_id, repetition = Recurrence.parse_id(row["Chore ID"])
+        except ValueError:
+            return True  # not part of any series
+        current = self._series.get(series_id)
+        if current is not None and repetition < current[0]:
+            return True  # an older instance, which does not affect the projection
+        if new_row is None or not _is_repeating(new_row):
+            # the latest instance was removed or stopped repeating: an older one may be the latest now
+            return current is None
+        self._series[series_id] = (repetition, Chore(new_row))
+        if self._today is not None:
+            self._project(series_id)
+        return True
+
+    def _project(self, series_id: str) -> None:
+        """(Re)compute the contribution of one series to the projected loads."""
+        assignee, minutes = self._contributions.pop(series_id, (None, 0))
+        if minutes:
+            self._loads[assignee] -= minutes
+            if not self._loads[assignee]:
+                del self._loads[assignee]
+        _, latest = self._series[series_id]
+        end = self._today + timedelta(days=self.horizon_days)
+        minutes = latest.expected_duration * sum(1 for _ in Recurrence.series_occurrences(latest, end, self._today))
+        if minutes:
+            self._contributions[series_id] = (latest.assignee_id, minutes)
+            self._loads[latest.assignee_id] = self._loads.get(latest.assignee_id, 0) + minutes
+
+
+def _is_repeating(row: dict) -> bool:
+    """Return True if the chore in the CSV row repeats."""
+    return bool(row.get("Frequency") and int(row["Frequency"])) or bool(row.get("Recurrence"))
+
+
+# forecast kept up to date with the writes of this process
+forecast = WorkloadForecast()
+DataInput.register_chore_listener(forecast.chores_changed)
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
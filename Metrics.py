@@ -0,0 +1,221 @@
+"""
+Hot-Path Instrumentation
+Author: Haus Team
+Date: 10/19/2026
+
+This module provides lightweight counters, timers and latency histograms for the backend,
+and renders them in the Prometheus text exposition format (served at /metrics by flask_integration.py).
+
+Instrumentation is disabled by default. Set the HAUS_METRICS environment variable to 1
+(or call enable()) to turn it on. While disabled, every instrumented call costs a single flag check.
+"""
+
+# python libraries
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# enhanced typing
+from typing import Callable, Iterator
+
+# Upper bounds (in seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# whether metrics are currently being recorded
+_enabled: bool = os.environ.get('HAUS_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+
+# guards updates to every metric
+_lock = threading.Lock()
+
+# every metric, in the order they were defined
+_registry: list['_Metric'] = []
+
+
+def enable(enabled: bool = True) -> None:
+    """Turn recording of metrics on (or off)."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Return True if metrics are currently being recorded."""
+    return _enabled
+
+
+def reset() -> None:
+    """Clear the values of every metric."""
+    with _lock:
+        for metric in _registry:
+            metric.values.clear()
+
+
+class _Metric:
+    """Base class of all metrics: a name, a help text, and values keyed by their label values."""
+    type: str = 'untyped'
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+        _registry.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(label, '')) for label in self.labels)
+
+    def _format_labels(self, key: tuple[str, ...], extra: str = '') -> str:
+        pairs = [f'{label}="{_escape(value)}"' for label, value in zip(self.labels, key)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} {self.type}'
+
+
+class Counter(_Metric):
+    """A value that only goes up, e.g. the number of files read."""
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if not _enabled:
+            return
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self._key(labels), 0)
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        for key, value in sorted(self.values.items()):
+            yield f'{self.name}{self._format_labels(key)} {value}'
+
+
+class Gauge(Counter):
+    """A value that can go up and down, e.g. a replication lag."""
+    type = 'gauge'
+
+    def set(self, value: float, **labels: str) -> None:
+        if not _enabled:
+            return
+        with _lock:
+            self.values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed durations (in seconds) over fixed buckets."""
+    type = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, seconds: float, **labels: str) -> None:
+        if not _enabled:
+            return
+        key = self._key(labels)
+        with _lock:
+            # per label set: [count per bucket..., count of larger values, sum]
+            value = self.values.get(key)
+            if value is None:
+                value = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            value[bisect.bisect_left(self.buckets, seconds)] += 1
+            value[-1] += seconds
+
+    def count(self, **labels: str) -> int:
+        value = self.values.get(self._key(labels))
+        return sum(value[:-1]) if value else 0
+
+    def time(self, **labels: str):
+        """Context manager observing how long its body takes (a no-op while metrics are disabled)."""
+        if not _enabled:
+            return nullcontext()
+        return self._time(labels)
+
+    @contextmanager
+    def _time(self, labels: dict[str, str]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        for key, value in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, value):
+                cumulative += count
+                labels = self._format_labels(key, 'le="%s"' % bound)
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            cumulative += value[len(self.buckets)]
+            labels = self._format_labels(key, 'le="+Inf"')
+            yield f'{self.name}_bucket{labels} {cumulative}'
+            yield f'{self.name}_sum{self._format_labels(key)} {value[-1]}'
+            yield f'{self.name}_count{self._format_labels(key)} {cumulative}'
+
+
+"""
+Metrics recorded by the backend
+"""
+
+FILE_READS = Counter('haus_file_reads_total', 'Data files opened for reading.', ('file',))
+FILE_WRITES = Counter('haus_file_writes_total', 'Data files opened for writing.', ('file',))
+BYTES_PARSED = Counter('haus_bytes_parsed_total', 'Bytes of CSV data read by parsers.', ('file',))
+ROWS_SCANNED = Counter('haus_rows_scanned_total', 'CSV rows parsed while scanning.', ('file',))
+GROUP_COMMIT_BATCHES = Counter('haus_group_commit_batches_total', 'Rewrites of the chores CSV by the group committer.')
+GROUP_COMMIT_MUTATIONS = Counter('haus_group_commit_mutations_total', 'Chore mutations written by the group committer.')
+OPERATION_SECONDS = Histogram('haus_operation_seconds', 'Time spent in data layer and assignment operations.',
+                              ('operation',))
+REQUEST_SECONDS = Histogram('haus_request_seconds', 'Latency of HTTP requests, per endpoint.',
+                            ('endpoint', 'method', 'status'))
+LOGIN_THROTTLED = Counter('haus_login_throttled_total', 'Password attempts rejected by the login throttles.',
+                          ('throttle',))
+QUERY_PLANS = Counter('haus_query_plans_total', 'Chore queries run, per way of reading the chores.', ('access',))
+PINNED_CHORE_VERSIONS = Gauge('haus_pinned_chore_versions', 'Versions of the chores CSV pinned by snapshot reads.')
+REPLICATION_LAG = Gauge('haus_replication_lag_seconds',
+                        'Time from the write of the newest change log entry a replica applied to it being applied.')
+REPLICA_SEQUENCE = Gauge('haus_replica_sequence', 'Sequence number of the last change log entry a replica applied.')
+
+
+def timed(operation: str) -> Callable[[Callable], Callable]:
+    """Decorator recording the duration of every call to the function in OPERATION_SECONDS."""
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                OPERATION_SECONDS.observe(time.perf_counter() - start, operation=operation)
+        return wrapper
+    return decorator
+
+
+def timer(operation: str):
+    """Context manager recording the duration of its body in OPERATION_SECONDS."""
+    return OPERATION_SECONDS.time(operation=operation)
+
+
+def render_prometheus() -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    with _lock:
+        lines = [line for metric in _registry for line in metric.render()]
+    return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
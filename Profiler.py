@@ -0,0 +1,217 @@
+"""
+Per-Request Sampling Profiler
+Author: Haus Team
+Date: 10/19/2026
+
+This module captures stack samples of individual requests, so that slow requests can be diagnosed
+even when their cost is spread across many DataInput and AutoAssign calls.
+
+While a request is profiled, a background thread periodically records the call stack of the thread
+serving it. The samples are saved in the collapsed-stack format understood by flamegraph tools
+(one "outermost;...;innermost count" line per distinct stack), and the profiles of the slowest
+requests are kept in a bounded ring buffer so they can be retrieved later. Only the kept profiles
+have a file, which is removed when a slower request evicts them.
+
+Profiling is opt-in: set HAUS_PROFILING=1 to enable it. Requests are then profiled when they carry
+the PROFILE_HEADER header, or at random with probability HAUS_PROFILE_SAMPLE_RATE (0 by default).
+"""
+
+# python libraries
+import heapq
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+# enhanced typing
+from typing import Union
+
+# Request header asking for the request to be profiled
+PROFILE_HEADER = 'X-Haus-Profile'
+
+# Seconds between two stack samples
+SAMPLE_INTERVAL = 0.001
+
+# Number of slowest request profiles kept in memory
+SLOWEST_CAPACITY = 20
+
+# Directory collapsed-stack files are written to
+PROFILE_DIRECTORY = os.environ.get('HAUS_PROFILE_DIRECTORY', 'profiles')
+
+# whether requests may be profiled at all
+enabled: bool = os.environ.get('HAUS_PROFILING', '').lower() in ('1', 'true', 'yes', 'on')
+
+# probability of profiling a request which did not ask for it
+sample_rate: float = float(os.environ.get('HAUS_PROFILE_SAMPLE_RATE', '0') or 0)
+
+
+class StackSampler:
+    """
+    Samples the call stack of one thread from a background thread until stopped.
+    Stacks are counted in collapsed form, outermost frame first.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='haus-stack-sampler', daemon=True)
+
+    def start(self) -> 'StackSampler':
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        """Stop sampling and return the number of samples of each collapsed stack."""
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            self.stacks[collapse_stack(frame)] += 1
+
+
+def collapse_stack(frame) -> str:
+    """Return the stack ending in frame as "outermost;...;innermost" of module:function names."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.splitext(os.path.basename(code.co_filename))[0]}:{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class RequestProfile:
+    """The stack samples captured while serving one request."""
+
+    def __init__(self, profile_id: str, method: str, path: str, started: float, duration: float, stacks: Counter):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.started = started
+        self.duration = duration
+        self.stacks = stacks
+        # collapsed-stack file the profile was written to, if any
+        self.filepath: Union[str, None] = None
+
+    def collapsed(self) -> str:
+        """Return the samples in the collapsed-stack format, most frequent stack first."""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> dict:
+        return {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'started': self.started,
+            'duration_ms': round(self.duration * 1000, 3),
+            'samples': sum(self.stacks.values()),
+        }
+
+
+class SlowestProfiles:
+    """Bounded buffer holding the profiles of the slowest requests seen so far."""
+
+    def __init__(self, capacity: int = SLOWEST_CAPACITY):
+        self.capacity = capacity
+        self._heap: list[tuple[float, int, RequestProfile]] = []  # min-heap on duration
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> tuple[bool, Union[RequestProfile, None]]:
+        """Keep the profile if it is among the slowest; return whether it was kept, and the profile it evicted."""
+        entry = (profile.duration, next(self._counter), profile)
+        with self._lock:
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, entry)
+                return True, None
+            if profile.duration > self._heap[0][0]:
+                return True, heapq.heapreplace(self._heap, entry)[2]
+            return False, None
+
+    def profiles(self) -> list[RequestProfile]:
+        """Return the kept profiles, slowest first."""
+        with self._lock:
+            return [profile for _, _, profile in sorted(self._heap, reverse=True)]
+
+    def get(self, profile_id: str) -> Union[RequestProfile, None]:
+        with self._lock:
+            for _, _, profile in self._heap:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+
+
+# profiles of the slowest requests served by this process
+slowest = SlowestProfiles()
+
+# used to give each profile a unique id
+_profile_ids = itertools.count(1)
+
+# serializes keeping profiles and writing or removing their files, so an evicted profile never leaves a file
+_files_lock = threading.Lock()
+
+
+class RequestProfiler:
+    """Profiles the request being served by the current thread, from start until finish() is called."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self._sampler = StackSampler(threading.get_ident()).start()
+
+    def finish(self, directory: Union[str, None] = None) -> RequestProfile:
+        """
+        Stop profiling, and keep the profile if it is among the slowest. A kept profile is written to
+        a collapsed-stack file in the directory (PROFILE_DIRECTORY by default), and the file of the
+        profile it evicted is removed.
+        """
+        duration = time.perf_counter() - self._start
+        stacks = self._sampler.stop()
+        profile_id = f"{int(self.started)}-{os.getpid()}-{next(_profile_ids)}"
+        profile = RequestProfile(profile_id, self.method, self.path, self.started, duration, stacks)
+        directory = directory or PROFILE_DIRECTORY
+        with _files_lock:
+            kept, evicted = slowest.add(profile)
+            if evicted is not None and evicted.filepath is not None:
+                try:
+                    os.remove(evicted.filepath)
+                except OSError:
+                    pass  # already removed
+            if kept:
+                filepath = os.path.join(directory, f"{profile_id}.collapsed")
+                try:
+                    os.makedirs(directory, exist_ok=True)
+                    with open(filepath, 'w') as file:
+                        file.write(profile.collapsed())
+                    profile.filepath = filepath
+                except OSError:
+                    pass  # the profile is still available in memory
+        return profile
+
+
+def should_profile(headers) -> bool:
+    """Return True if the request with the given headers should be profiled."""
+    if not enabled:
+        return False
+    if headers.get(PROFILE_HEADER, '').lower() in ('1', 'true', 'yes', 'on'):
+        return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
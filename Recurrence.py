@@ -0,0 +1,247 @@
+"""
+Recurring Chores
+Author: Haus Team
+Date: 10/19/2026
+
+This module describes when repeating chores recur, and plans their upcoming instances ahead of time.
+
+A chore's recurrence rule is stored as text in its Recurrence column:
+    days:N              every N days
+    weekly:mon,thu      every week, on the given weekdays
+    monthly:D           every month, on day D (-1 for the last day of the month)
+Chores without a rule but with a Frequency of N days recur as if their rule were days:N.
+
+Every instance of a repeating chore belongs to the same series: the first instance's ID is the series ID,
+and the n-th renewal has the ID "series(n)". Upcoming instances of every series can be materialized
+for a horizon window in a single write of the chores CSV, and the workload they represent can be
+projected from the rules without writing any rows.
+"""
+
+# other modules in the software
+import DataInput
+from DataInput import CHORE_STATUS, Chore
+
+# python libraries
+import calendar
+import copy
+import re
+from datetime import date, timedelta
+
+# enhanced typing
+from typing import Union, Iterator
+
+# Kinds of recurrence rules
+RULE_KINDS = ('days', 'weekly', 'monthly')
+
+# Weekday names used in weekly rules, in the order of date.weekday()
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+# Chore IDs: a series ID, optionally followed by the number of renewals in parentheses
+_ID_PATTERN = re.compile(r'^([\w-]+)(?:\((\d+)\))?$')
+
+
+class RecurrenceRule:
+    """
+    When a repeating chore recurs: every interval days, every week on the given weekdays,
+    or every month on month_day (-1 meaning the last day of the month).
+    """
+    kind: str
+    interval: int
+    weekdays: tuple[int, ...]
+    month_day: int
+
+    def __init__(self, kind: str, interval: int = 0, weekdays: tuple[int, ...] = (), month_day: int = 0):
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Unknown recurrence kind: {kind}")
+        if kind == 'days' and interval < 1:
+            raise ValueError("A chore must recur at least one day apart")
+        if kind == 'weekly' and not weekdays:
+            raise ValueError("A weekly recurrence needs at least one weekday")
+        if kind == 'monthly' and not (1 <= month_day <= 31 or month_day == -1):
+            raise ValueError(f"Invalid day of the month: {month_day}")
+        self.kind = kind
+        self.interval = interval
+        self.weekdays = tuple(sorted(set(weekdays)))
+        self.month_day = month_day
+
+    @classmethod
+    def parse(cls, text: str) -> 'RecurrenceRule':
+        """Parse a rule from its text form (see the module docstring). Raises ValueError if it is invalid."""
+        kind, _, argument = text.strip().lower().partition(':')
+        try:
+            if kind == 'days':
+                return cls('days', interval=int(argument))
+            if kind == 'weekly':
+                return cls('weekly', weekdays=tuple(WEEKDAYS.index(name.strip()[:3])
+                                                    for name in argument.split(',') if name.strip()))
+            if kind == 'monthly':
+                return cls('monthly', month_day=int(argument))
+        except ValueError:
+            raise ValueError(f"Invalid recurrence rule: {text}") from None
+        raise ValueError(f"Invalid recurrence rule: {text}")
+
+    def __str__(self) -> str:
+        if self.kind == 'days':
+            return f"days:{self.interval}"
+        if self.kind == 'weekly':
+            return "weekly:" + ','.join(WEEKDAYS[weekday] for weekday in self.weekdays)
+        return f"monthly:{self.month_day}"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RecurrenceRule) and str(self) == str(other)
+
+    def next_after(self, day: date) -> date:
+        """Return the first occurrence strictly after the given day."""
+        if self.kind == 'days':
+            return day + timedelta(days=self.interval)
+        if self.kind == 'weekly':
+            for days_ahead in range(1, 8):
+                candidate = day + timedelta(days=days_ahead)
+                if candidate.weekday() in self.weekdays:
+                    return candidate
+        # monthly: later this month if possible, otherwise next month
+        candidate = self._day_in_month(day.year, day.month)
+        if candidate > day:
+            return candidate
+        year, month = (day.year + 1, 1) if day.month == 12 else (day.year, day.month + 1)
+        return self._day_in_month(year, month)
+
+    def occurrences(self, after: date, until: date) -> Iterator[date]:
+        """Yield every occurrence strictly after the day after, up to and including the day until."""
+        day = self.next_after(after)
+        while day <= until:
+            yield day
+            day = self.next_after(day)
+
+    def next_deadline(self, chore: Chore) -> date:
+        """
+        Return the deadline of the instance following the given (completed) chore.
+        Day intervals count from the completion date, as they always have;
+        calendar rules give the next calendar occurrence after both the deadline and the completion.
+        """
+        if self.kind == 'days':
+            return (chore.completion_date or chore.deadline_date) + timedelta(days=self.interval)
+        return self.next_after(max(day for day in (chore.deadline_date, chore.completion_date) if day))
+
+    def _day_in_month(self, year: int, month: int) -> date:
+        last_day = calendar.monthrange(year, month)[1]
+        return date(year, month, last_day if self.month_day == -1 else min(self.month_day, last_day))
+
+
+def rule_for(chore: Chore) -> Union[RecurrenceRule, None]:
+    """Return the recurrence rule of the chore, or None if the chore does not repeat."""
+    if chore.recurrence:
+        return RecurrenceRule.parse(chore.recurrence)
+    if chore.frequency > 0:
+        return RecurrenceRule('days', interval=chore.frequency)
+    return None
+
+
+"""
+Chore Series
+"""
+
+
+def parse_id(chore_id: str) -> tuple[str, int]:
+    """Split a chore ID into its series ID and its number of renewals."""
+    match = _ID_PATTERN.match(chore_id)
+    # make sure the id is in a valid format (prevent undefined behavior)
+    if not match:
+        raise ValueError(f"Invalid id format: {chore_id}")
+    return match.group(1), int(match.group(2) or 0)
+
+
+def instance_id(series_id: str, repetition: int) -> str:
+    """Return the ID of the given repetition of a series."""
+    return f"{series_id}({repetition})" if repetition else series_id
+
+
+def increment_id(old_id: str) -> str:
+    """
+    Given a Chore ID in one of the two following formats, increment the number indicating repetitions.
+    uuid
+    uuid(repetitions)
+    """
+    series_id, repetition = parse_id(old_id)
+    return instance_id(series_id, repetition + 1)
+
+
+def latest_instances() -> dict[str, Chore]:
+    """Return the most recent instance of every repeating chore, keyed by series ID, in one scan of the chores."""
+    latest: dict[str, tuple[int, Chore]] = {}
+    for chore in DataInput.iter_chores(repeating_only=True):
+        try:
+            series_id, repetition = parse_id(chore.id)
+        except ValueError:
+            continue  # not part of a series that can be renewed
+        if series_id not in latest or repetition > latest[series_id][0]:
+            latest[series_id] = (repetition, chore)
+    return {series_id: chore for series_id, (_, chore) in latest.items()}
+
+
+def upcoming_instances(until: date, today: Union[date, None] = None) -> Iterator[Chore]:
+    """
+    Yield the (not yet stored) instances of every repeating chore due after its latest stored instance,
+    from today up to and including the day until. Occurrences missed before today are skipped.
+    """
+    for _, instance in _upcoming(until, today):
+        yield instance
+
+
+def materialize_upcoming(horizon_days: int, today: Union[date, None] = None) -> list[Chore]:
+    """
+    Store the upcoming instances of every repeating chore due within horizon_days of today,
+    in a single write of the chores CSV. Returns the new (unassigned) chores.
+    Instances already stored are left alone, so calling this repeatedly only adds what is missing.
+    """
+    if today is None:
+        today = DataInput.today()
+    instances = list(upcoming_instances(today + timedelta(days=horizon_days), today))
+    DataInput.save_chores(new_chores=instances)
+    return instances
+
+
+def projected_workload(start: date, end: date, today: Union[date, None] = None) -> dict[Union[str, None], int]:
+    """
+    Return the minutes of work the repeating chores will add between start and end (inclusive),
+    beyond their stored instances, keyed by the assignee of each series' latest instance
+    (None for series whose latest instance is unassigned). Nothing is written.
+    """
+    workload: dict[Union[str, None], int] = {}
+    for latest, instance in _upcoming(end, today):
+        if instance.deadline_date >= start:
+            workload[latest.assignee_id] = workload.get(latest.assignee_id, 0) + instance.expected_duration
+    return workload
+
+
+def series_occurrences(latest: Chore, until: date, today: Union[date, None] = None) -> Iterator[date]:
+    """
+    Yield the deadlines of the instances following the latest stored instance of a series,
+    from today up to and including the day until. Occurrences missed before today are skipped.
+    """
+    if today is None:
+        today = DataInput.today()
+    rule = rule_for(latest)
+    if rule is None or latest.deadline_date is None:
+        return
+    # start on or after today, even if the series was left behind
+    yield from rule.occurrences(max(latest.deadline_date, today - timedelta(days=1)), until)
+
+
+def _upcoming(until: date, today: Union[date, None]) -> Iterator[tuple[Chore, Chore]]:
+    """Yield (latest stored instance, upcoming instance) pairs, see upcoming_instances."""
+    for series_id, latest in latest_instances().items():
+        _, repetition = parse_id(latest.id)
+        for deadline in series_occurrences(latest, until, today):
+            repetition += 1
+            instance = copy.copy(latest)
+            instance.id = instance_id(series_id, repetition)
+            instance.status = CHORE_STATUS.UNASSIGNED
+            instance.assignee_id = None
+            instance.deadline_date = deadline
+            instance.completion_date = None
+            yield latest, instance
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
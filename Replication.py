@@ -0,0 +1,229 @@
+"""
+Read Replicas
+Author: Haus Team
+Date: 10/19/2026
+
+This module keeps read replicas of the household in memory, from the change log DataInput appends every write
+to when DataInput.CHANGE_LOG is on. A follower tails the log (a local file, or a copy synced from the primary's
+machine) and applies its entries in the order of their sequence numbers, so that extra, read-only API processes
+can serve chores without reading the CSVs. Writes still go to the primary.
+
+Every write made with the change log on gets a sequence number (see DataInput.take_change_sequence), which the
+primary's API returns to clients. A client that wants to read its own writes passes it to the follower,
+which waits for its replica to reach it (see ChoreReplica.wait_for).
+"""
+
+# other modules in the software
+import DataInput
+from DataInput import Chore, CHORE_STATUS
+
+# python libraries
+import json
+import os
+import threading
+import time
+
+# enhanced typing
+from typing import Union, Iterator
+
+# instrumentation
+import Metrics
+
+# Path of the primary's change log: when set, the API serves reads from a replica following it (see start_follower)
+FOLLOW = os.environ.get('HAUS_FOLLOW', '')
+
+# Seconds between two reads of the change log by a follower
+POLL_INTERVAL = float(os.environ.get('HAUS_FOLLOW_INTERVAL_MS', '50') or 50) / 1000
+
+# Seconds a read waits for the replica to reach the sequence number it asked for, before giving up
+WAIT_TIMEOUT = float(os.environ.get('HAUS_FOLLOW_WAIT_MS', '2000') or 2000) / 1000
+
+
+class ChoreReplica:
+    """
+    The chores and occupants of the household, as of the last change log entry applied (sequence).
+    poll() applies the entries appended since the last poll, and start() does so in a background thread.
+    """
+
+    def __init__(self, log_filepath: Union[str, None] = None):
+        self.log_filepath = log_filepath or DataInput.change_log_filepath()
+        # sequence number of the last entry applied (0: none yet)
+        self.sequence = 0
+        # chore ID -> chores CSV row, in the order of the chores CSV
+        self._chores: dict[str, dict[str, str]] = {}
+        # occupant UID -> occupants CSV row, and the header of the occupants CSV
+        self._occupants: dict[str, list[str]] = {}
+        self._occupants_header: list[str] = []
+        # guards the tables and sequence, and wakes up wait_for when entries are applied
+        self._condition = threading.Condition()
+        # serializes polls, and guards the position in the change log
+        self._poll_lock = threading.Lock()
+        self._file = None
+        self._inode = None
+        self._offset = 0
+        self._thread: Union[threading.Thread, None] = None
+        self._stopping = threading.Event()
+
+    def poll(self) -> int:
+        """Apply the entries appended to the change log since the last poll, and return how many were applied."""
+        with self._poll_lock:
+            restarted, lines = self._read_new_lines()
+            applied = 0
+            newest = None
+            for line in lines:
+                change = json.loads(line)
+                # the primary's log was removed and started over (with a snapshot): so does the replica
+                if restarted and 'snapshot' in change and change['seq'] < self.sequence:
+                    self.sequence = 0
+                restarted = False
+                # already applied, e.g. before the log was compacted
+                if change['seq'] <= self.sequence:
+                    continue
+                with self._condition:
+                    self._apply(change)
+                    self._condition.notify_all()
+                applied += 1
+                newest = change
+        Metrics.REPLICA_SEQUENCE.set(self.sequence)
+        Metrics.REPLICATION_LAG.set(time.time() - newest['time'] if newest is not None else 0)
+        return applied
+
+    def start(self, interval: Union[float, None] = None) -> 'ChoreReplica':
+        """Keep polling the change log in a background thread, every interval seconds (POLL_INTERVAL by default)."""
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._follow, args=(interval or POLL_INTERVAL,),
+                                            name='haus-replica', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread started by start(), and close the change log."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        with self._poll_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def wait_for(self, sequence: int, timeout: Union[float, None] = None) -> bool:
+        """
+        Wait until the replica has applied the change log entry with the given sequence number
+        (polling the log itself if it is not following it in the background), for at most timeout seconds
+        (WAIT_TIMEOUT by default). Returns False if the replica is still behind.
+        """
+        deadline = time.monotonic() + (WAIT_TIMEOUT if timeout is None else timeout)
+        while True:
+            if self._thread is None:
+                self.poll()
+            with self._condition:
+                if self.sequence >= sequence:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(min(remaining, POLL_INTERVAL))
+
+    def _follow(self, interval: float) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.poll()
+            except Exception as error:
+                # e.g. the synced log is being replaced: try again on the next poll
+                print(f"Replica could not apply the change log: {error!r}")
+            self._stopping.wait(interval)
+
+    def _read_new_lines(self) -> tuple[bool, list[bytes]]:
+        """
+        Return the complete lines appended to the change log since the last call, and whether they were read
+        from the start of a new log (the first poll, or the log was compacted or replaced).
+        """
+        try:
+            stat = os.stat(self.log_filepath)
+        except FileNotFoundError:
+            return False, []
+        restarted = False
+        if self._file is None or stat.st_ino != self._inode or stat.st_size < self._offset:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.log_filepath, 'rb')
+            self._inode = os.fstat(self._file.fileno()).st_ino
+            self._offset = 0
+            restarted = True
+        self._file.seek(self._offset)
+        data = self._file.read()
+        # a line without its newline is still being appended: read it on the next poll
+        end = data.rfind(b'\n') + 1
+        self._offset += end
+        return restarted, data[:end].splitlines()
+
+    def _apply(self, change: dict) -> None:
+        snapshot = change.get('snapshot')
+        if snapshot is not None:
+            self._chores = {row['Chore ID']: row for row in snapshot['chores']}
+            occupants = snapshot['occupants']
+            self._occupants_header = occupants[0] if occupants else []
+            self._occupants = {row[0]: row for row in occupants[1:]}
+        else:
+            table = self._chores if change['table'] == 'chores' else self._occupants
+            for key, row in change['rows'].items():
+                if row is None:
+                    table.pop(key, None)
+                else:
+                    table[key] = row
+        self.sequence = change['seq']
+
+    def get_chore_by_id(self, chore_id: str) -> Union[Chore, None]:
+        """Return the chore with the given ID, or None if there is no such chore."""
+        row = self._chores.get(chore_id)
+        return Chore(row) if row is not None else None
+
+    def iter_chores(self,
+                    assignee_id: str = None,
+                    status: CHORE_STATUS = None,
+                    category: str = None,
+                    limit: int = None
+                    ) -> Iterator[Chore]:
+        """Yield the chores matching the given filters, like DataInput.iter_chores, in the order of the chores CSV."""
+        if limit is not None and limit <= 0:
+            return
+        with self._condition:
+            rows = list(self._chores.values())
+        matched = 0
+        for row in rows:
+            if assignee_id and row["Assignee ID"] != assignee_id:
+                continue
+            if status and row["Status"] != status.value:
+                continue
+            if category is not None and row.get("Category") != category:
+                continue
+            yield Chore(row)
+            matched += 1
+            if limit is not None and matched >= limit:
+                return
+
+    def occupants_names_and_uids(self) -> dict[str, str]:
+        """Return the name of every occupant, by UID, like DataInput.retrieve_occupants_names_and_uids."""
+        with self._condition:
+            return {uid: row[1] for uid, row in self._occupants.items()}
+
+    def retrieve_occupant_uid_from_username(self, username: str) -> Union[str, None]:
+        """Return the UID of the occupant with the given username, or None if there is no such occupant."""
+        with self._condition:
+            for uid, row in self._occupants.items():
+                if row[1] == username:
+                    return uid
+        return None
+
+
+def start_follower() -> Union[ChoreReplica, None]:
+    """Return a replica following the change log at FOLLOW in the background, or None if FOLLOW is not set."""
+    if not FOLLOW:
+        return None
+    return ChoreReplica(FOLLOW).start()
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
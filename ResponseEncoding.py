@@ -0,0 +1,198 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file encodes the JSON replies of the Flask endpoints compactly, and compresses them.
+
+JSON is serialized with orjson when it is installed (several times faster than the json module),
+and with the json module otherwise. Lists of chores can be sent in a columnar format: the column names once,
+then every chore as an array of values, instead of an object repeating every column name.
+Replies are compressed with brotli (when installed) or gzip, if the client accepts it and the reply
+is large enough. Streamed replies are compressed as they are streamed.
+
+Both orjson and brotli are optional: pip install orjson brotli
+"""
+
+# modules
+import json
+import os
+import zlib
+from itertools import islice
+from operator import itemgetter
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import parse_accept_header
+
+# optional, faster JSON serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# optional, smaller compression than gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# enhanced typing
+from typing import Union, Iterator, Iterable
+
+
+"""
+Settings
+"""
+
+# replies smaller than this many bytes are sent uncompressed (streamed replies, whose size is unknown, never are)
+COMPRESS_MIN_BYTES = int(os.environ.get('HAUS_COMPRESS_MIN_BYTES', 1024))
+
+# compression levels: gzip 6 is zlib's default, brotli 4 is about as fast (its own default, 11, is far slower)
+GZIP_LEVEL = int(os.environ.get('HAUS_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('HAUS_BROTLI_QUALITY', 4))
+
+# content codings, in order of preference
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# formats of a list of chores: a list of objects, or the column names once and a list of arrays
+FORMATS = ('objects', 'columnar')
+
+# number of rows serialized together in a streamed reply
+STREAM_CHUNK_ROWS = 256
+
+
+"""
+JSON
+"""
+
+
+# compact JSON encoder of the json module (json.dumps would build a new one on every call)
+_json_encoder = json.JSONEncoder(separators=(',', ':'))
+
+
+def dumps(value) -> bytes:
+    """Return the value as compact JSON, encoded in UTF-8."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return _json_encoder.encode(value).encode()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask's JSON provider (used by jsonify), serializing with orjson when it is installed.
+    The output matches Flask's: sorted keys, and dates formatted by Flask's default function.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        # fall back for the options orjson does not support (e.g. the indentation of debug mode)
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default,
+                            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS |
+                            orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS).decode()
+
+
+def columnar(columns: list[str], rows: Iterable[dict]) -> dict:
+    """Return the rows in the columnar format: {"columns": [names], "rows": [[values], ...]}."""
+    return {"columns": columns, "rows": [[row[column] for column in columns] for row in rows]}
+
+
+def stream_objects(rows: Iterable[dict]) -> Iterator[bytes]:
+    """Stream the rows as a JSON list of objects, a few rows at a time."""
+    return _stream_list(b'[', rows, b']')
+
+
+def stream_columnar(columns: list[str], rows: Iterable[dict]) -> Iterator[bytes]:
+    """Stream the rows in the columnar format (see columnar), a few rows at a time."""
+    # tuples are serialized as arrays
+    arrays = map(itemgetter(*columns), rows) if len(columns) > 1 else ([row[columns[0]]] for row in rows)
+    return _stream_list(b'{"columns":' + dumps(columns) + b',"rows":[', arrays, b']}')
+
+
+def _stream_list(start: bytes, values: Iterable, end: bytes) -> Iterator[bytes]:
+    """Stream start, the values as the items of a JSON list, and end, serializing STREAM_CHUNK_ROWS values at once."""
+    values = iter(values)
+    separator = b''
+    chunk = list(islice(values, STREAM_CHUNK_ROWS))
+    yield start
+    while chunk:
+        # serialize the chunk as a list, without its brackets
+        yield separator + dumps(chunk)[1:-1]
+        separator = b','
+        chunk = list(islice(values, STREAM_CHUNK_ROWS))
+    yield end
+
+
+"""
+Compression
+"""
+
+
+def negotiate_encoding(accept_encoding: str) -> Union[str, None]:
+    """Return the preferred content coding accepted by the client's Accept-Encoding header, or None."""
+    accepted = parse_accept_header(accept_encoding)
+    best = max(ENCODINGS, key=accepted.quality)
+    return best if accepted.quality(best) > 0 else None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Return the data compressed with the content coding."""
+    compressor = _Compressor(encoding)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[Union[bytes, str]], encoding: str) -> Iterator[bytes]:
+    """Compress the chunks with the content coding as they are produced."""
+    compressor = _Compressor(encoding)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class _Compressor:
+    """A streaming compressor for a content coding."""
+
+    def __init__(self, encoding: str):
+        if encoding == 'br' and brotli is not None:
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._zlib = None
+        elif encoding == 'gzip':
+            self._brotli = None
+            # wbits 31: deflate with a gzip header and trailer
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        else:
+            raise ValueError(f"Unsupported content coding {encoding!r}")
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data) if self._brotli is not None else self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.finish() if self._brotli is not None else self._zlib.flush()
+
+
+def compress_response(response, accept_encoding: str):
+    """
+    Compress the JSON reply of a Flask endpoint in place, if the client accepts a content coding
+    and the reply is streamed or at least COMPRESS_MIN_BYTES long.
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
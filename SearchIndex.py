@@ -0,0 +1,194 @@
+"""
+Chore Search
+Author: Haus Team
+Date: 10/19/2026
+
+This module finds chores by the words in their name, description and category, using an inverted index:
+for every word, the chores containing it. Each word of a query matches the words it is a prefix of
+("tra" matches "trash" and "tray"), every word of the query must match, and the chores are ranked by
+how rare the matched words are (inverse document frequency), where they were found (the name counts
+the most, then the category, then the description), and whether they were matched exactly or by prefix.
+
+The index is built from the chores CSV on the first search, and kept up to date from the changes reported
+by DataInput after each write. It is only rebuilt when another process has written to the chores CSV.
+"""
+
+# other modules in the software
+import DataInput
+
+# python libraries
+import bisect
+import heapq
+import math
+import re
+import threading
+
+# enhanced typing
+from typing import Union
+
+# How much a word counts in each field of a chore
+FIELD_WEIGHTS = {
+    "Chore Name": 3.0,
+    "Category": 2.0,
+    "Description": 1.0,
+}
+
+# How much a word matched by prefix counts, compared to the same word matched exactly
+PREFIX_MATCH_WEIGHT = 0.5
+
+# Words are runs of letters and digits, compared in lower case
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def words(text: str) -> list[str]:
+    """Return the words of the text, in lower case."""
+    return _WORD_PATTERN.findall(text.lower()) if text else []
+
+
+class ChoreSearchIndex:
+    """
+    An inverted index of the chores: the weight of every word in every chore it appears in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # chores CSV signature the index reflects (None: not built, or out of date)
+        self._signature: Union[list[int], None] = None
+        # word -> {chore ID: weight of the word in the chore}
+        self._postings: dict[str, dict[str, float]] = {}
+        # every indexed word, sorted, to find the words starting with a prefix
+        self._words: list[str] = []
+        # chore ID -> its words, to remove them when the chore changes
+        self._chore_words: dict[str, tuple[str, ...]] = {}
+        self.rebuilds = 0
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> tuple[int, list[tuple[str, float]]]:
+        """
+        Return the number of chores matching every word of the query, and the (chore ID, score) of
+        the best matches, from the offset-th to the (offset + limit)-th, best first.
+        """
+        query_words = list(dict.fromkeys(words(query)))
+        with self._lock:
+            if self._signature != DataInput._chore_signature():
+                self._rebuild()
+            if not query_words:
+                return 0, []
+            # score the rarest query word first, so the others are only scored on its matches
+            expansions = sorted((self._expand(word) for word in query_words),
+                                key=lambda expansion: sum(len(self._postings[word]) for word in expansion[1]))
+            scores = self._scores(*expansions[0])
+            for query_word, expansion in expansions[1:]:
+                if not scores:
+                    break
+                scores = self._add_scores(scores, query_word, expansion)
+        # ties keep the order of the chores CSV
+        best = heapq.nlargest(offset + limit, scores, key=scores.get)
+        return len(scores), [(chore_id, round(scores[chore_id], 4)) for chore_id in best[offset:]]
+
+    def invalidate(self) -> None:
+        """Forget the index, so that the next search rebuilds it from the chores CSV."""
+        with self._lock:
+            self._signature = None
+
+    def chores_changed(self, changes: list, signature_before: list[int], signature_after: list[int]) -> None:
+        """
+        Update the index after a write of the chores CSV (see DataInput.register_chore_listener).
+        Only the changed chores are indexed again.
+        """
+        with self._lock:
+            if self._signature is None or self._signature != signature_before:
+                # never built, or another process wrote in between: rebuild on the next search
+                self._signature = None
+                return
+            for old_row, new_row in changes:
+                if old_row is not None:
+                    self._remove(old_row["Chore ID"])
+                if new_row is not None:
+                    self._add(new_row)
+            self._signature = signature_after
+
+    def _expand(self, query_word: str) -> tuple[str, list[str]]:
+        """Return the query word, and the indexed words starting with it."""
+        start = bisect.bisect_left(self._words, query_word)
+        end = bisect.bisect_left(self._words, query_word + "\U0010ffff", start)
+        return query_word, self._words[start:end]
+
+    def _factor(self, query_word: str, word: str) -> float:
+        """Return how much the indexed word counts when it matches the query word."""
+        factor = math.log(1 + len(self._chore_words) / len(self._postings[word]))
+        return factor if word == query_word else factor * PREFIX_MATCH_WEIGHT
+
+    def _scores(self, query_word: str, expansion: list[str]) -> dict[str, float]:
+        """Return the score of every chore matching the query word (its best match, if several words do)."""
+        scores: dict[str, float] = {}
+        for word in expansion:
+            factor = self._factor(query_word, word)
+            for chore_id, weight in self._postings[word].items():
+                score = weight * factor
+                if score > scores.get(chore_id, 0):
+                    scores[chore_id] = score
+        return scores
+
+    def _add_scores(self, scores: dict[str, float], query_word: str, expansion: list[str]) -> dict[str, float]:
+        """Return the scores of the chores which also match the query word, with its score added."""
+        if len(scores) * len(expansion) > sum(len(self._postings[word]) for word in expansion):
+            # fewer lookups to score every chore matching the query word
+            word_scores = self._scores(query_word, expansion)
+            return {chore_id: score + word_scores[chore_id]
+                    for chore_id, score in scores.items() if chore_id in word_scores}
+        # fewer lookups to check each chore that still matches
+        factors = [(self._postings[word], self._factor(query_word, word)) for word in expansion]
+        if len(factors) == 1:
+            (postings, factor), = factors
+            return {chore_id: score + postings[chore_id] * factor
+                    for chore_id, score in scores.items() if chore_id in postings}
+        combined = {}
+        for chore_id, score in scores.items():
+            best = max((postings[chore_id] * factor for postings, factor in factors if chore_id in postings), default=0)
+            if best:
+                combined[chore_id] = score + best
+        return combined
+
+    def _rebuild(self) -> None:
+        """Index every chore, in one scan of the chores CSV."""
+        self._postings = {}
+        self._chore_words = {}
+        # the rows and the signature recorded come from the same version
+        with DataInput.snapshot_reads() as version:
+            self._signature = version.signature
+            for row in DataInput._iter_chore_rows():
+                self._add(row, keep_sorted=False)
+        self._words = sorted(self._postings)
+        self.rebuilds += 1
+
+    def _add(self, row: dict, keep_sorted: bool = True) -> None:
+        weights: dict[str, float] = {}
+        for field, field_weight in FIELD_WEIGHTS.items():
+            for word in words(row.get(field)):
+                weights[word] = weights.get(word, 0) + field_weight
+        chore_id = row["Chore ID"]
+        self._chore_words[chore_id] = tuple(weights)
+        for word, weight in weights.items():
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                if keep_sorted:
+                    bisect.insort(self._words, word)
+            postings[chore_id] = weight
+
+    def _remove(self, chore_id: str) -> None:
+        for word in self._chore_words.pop(chore_id, ()):
+            postings = self._postings[word]
+            del postings[chore_id]
+            if not postings:
+                del self._postings[word]
+                del self._words[bisect.bisect_left(self._words, word)]
+
+
+# index kept up to date with the writes of this process
+index = ChoreSearchIndex()
+DataInput.register_chore_listener(index.chores_changed)
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
@@ -0,0 +1,250 @@
+"""
+Static JSON Snapshots
+Author: Haus Team
+Date: 10/19/2026
+
+This module materializes the most frequent replies of the API as static JSON files, so that a static file
+server can answer most reads without going through Python. Under STATIC_JSON_DIRECTORY, it writes:
+    users.json          the occupants, as served by /user/serve
+    chores.json         every assigned chore, as served by /chore/serve without a user
+    chores/<UID>.json   the chores assigned to each occupant, as served by /chore/serve for that occupant
+    version.json        the signatures of the chores and occupants CSVs the files were generated from
+Every file is replaced atomically, and version.json is written last.
+
+The files are kept up to date in a background thread. After a write of the chores CSV by this process,
+only the files of the occupants whose assigned chores changed (and chores.json and version.json) are rewritten.
+Writes by other processes, and changes to the occupants, are noticed every REFRESH_INTERVAL seconds.
+"""
+
+# other modules in the software
+import ChoreViews
+import DataInput
+from DataInput import Chore, CHORE_STATUS
+
+# python libraries
+import json
+import os
+import re
+import threading
+
+# enhanced typing
+from typing import Union
+
+# Set HAUS_STATIC_JSON to 1 to keep the static JSON files up to date while the API runs
+STATIC_JSON = os.environ.get('HAUS_STATIC_JSON', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Directory the static JSON files are written to
+STATIC_JSON_DIRECTORY = os.environ.get('HAUS_STATIC_JSON_DIRECTORY', 'jsons/static')
+
+# Seconds between two checks for changes made by other processes (or to the occupants)
+REFRESH_INTERVAL = float(os.environ.get('HAUS_STATIC_JSON_INTERVAL_MS', '1000') or 1000) / 1000
+
+# Occupant UIDs are used as file names only if they are made of these characters
+_SAFE_UID = re.compile(r"[\w-]+")
+
+
+class StaticJSONSnapshots:
+    """
+    The static JSON files in a directory, with the assigned chores they hold, and what has to be rewritten
+    to bring them up to date. materialize() rewrites what is out of date, and start() does so in a background thread.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        # guards the state below, and wakes up the background thread
+        self._condition = threading.Condition()
+        # serializes materializations
+        self._materialize_lock = threading.Lock()
+        # signature of the chores CSV the assigned chores reflect (None: unknown),
+        # and the one version.json was last written with
+        self._chore_signature: Union[list[int], None] = None
+        self._written_signature: Union[list[int], None] = None
+        # chore ID -> row of every assigned chore, in the order of the chores CSV
+        # (except chores assigned since they were last read from it, which come last)
+        self._rows: dict[str, dict[str, str]] = {}
+        # signature of the occupants CSV, and the occupants (UID -> name), the files were generated from
+        self._occupants_signature: Union[list[int], None] = None
+        self._occupants: dict[str, str] = {}
+        # what has to be rewritten: everything, or the files of some occupants (and chores.json)
+        self._full = True
+        self._dirty: set[str] = set()
+        self._busy = False
+        self._thread: Union[threading.Thread, None] = None
+        self._stopping = False
+        self.files_written = 0
+
+    def start(self) -> 'StaticJSONSnapshots':
+        """Keep the files up to date in a background thread, following the writes of this process."""
+        with self._condition:
+            if self._thread is not None:
+                return self
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='haus-static-json', daemon=True)
+        DataInput.register_chore_listener(self.chores_changed)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread started by start()."""
+        DataInput.unregister_chore_listener(self.chores_changed)
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def flush(self, timeout: Union[float, None] = None) -> bool:
+        """Wait until the background thread has rewritten the files affected by the writes made so far."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not (self._pending() or self._busy), timeout)
+
+    def chores_changed(self, changes: list, signature_before: list[int], signature_after: list[int]) -> None:
+        """
+        Update the assigned chores after a write of the chores CSV (see DataInput.register_chore_listener),
+        and record that the files of the occupants a changed chore was or is assigned to must be rewritten.
+        """
+        assigned = CHORE_STATUS.ASSIGNED.value
+        with self._condition:
+            if self._chore_signature is None:
+                pass  # being read (see _read_chores), or never read
+            elif self._full or self._chore_signature != signature_before:
+                # another process wrote in between
+                self._full = True
+            else:
+                for old_row, new_row in changes:
+                    for row in (old_row, new_row):
+                        if row is not None and row["Status"] == assigned:
+                            self._dirty.add(row["Assignee ID"])
+                    if new_row is not None and new_row["Status"] == assigned:
+                        self._rows[new_row["Chore ID"]] = Chore(new_row).to_csv_row()
+                    else:
+                        self._rows.pop((new_row or old_row)["Chore ID"], None)
+            self._chore_signature = signature_after
+            if self._pending():
+                self._condition.notify_all()
+
+    def materialize(self) -> int:
+        """Rewrite the files which are out of date, and return how many files were written."""
+        with self._materialize_lock:
+            with self._condition:
+                # written by another process (or by this one, but not reported yet: it is then read again)
+                if self._chore_signature != DataInput._chore_signature():
+                    self._full = True
+                full, dirty = self._full, self._dirty
+                self._full, self._dirty = False, set()
+                self._busy = True
+            try:
+                return self._materialize(full, dirty)
+            except BaseException:
+                with self._condition:
+                    self._full = True
+                raise
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._stopping or self._pending(), REFRESH_INTERVAL)
+                if self._stopping:
+                    return
+            try:
+                self.materialize()
+            except Exception as error:
+                # e.g. the data files are being replaced: everything is rewritten after the interval
+                print(f"Could not write the static JSON files: {error!r}")
+                with self._condition:
+                    self._condition.wait_for(lambda: self._stopping, REFRESH_INTERVAL)
+
+    def _pending(self) -> bool:
+        """Return whether some files are out of date (to be called with the condition held)."""
+        return self._full or bool(self._dirty) or self._chore_signature != self._written_signature
+
+    def _materialize(self, full: bool, dirty: set[str]) -> int:
+        written = 0
+        if full:
+            self._read_chores()
+        occupants_signature = DataInput._file_signature(DataInput.OCCUPANTS_FILEPATH)
+        if full or occupants_signature != self._occupants_signature:
+            occupants = DataInput.retrieve_occupants_names_and_uids(DataInput.OCCUPANTS_FILEPATH)
+            # new occupants get their file, those who left lose it
+            dirty |= occupants.keys() - self._occupants.keys()
+            for uid in self._occupants.keys() - occupants.keys():
+                self._remove_file(uid)
+            self._write_json('users.json', [{"name": name, "UserID": uid} for uid, name in occupants.items()])
+            self._occupants, self._occupants_signature = occupants, occupants_signature
+            written += 1
+        if full:
+            dirty = set(self._occupants)
+            self._remove_stale_files()
+        # the chores written and the signature recorded for them go together: chores.json is rewritten
+        # with version.json after any write of the chores CSV, even one which changed no occupant's chores
+        with self._condition:
+            chore_signature = self._chore_signature
+            changed = bool(dirty) or chore_signature != self._written_signature
+            rows = list(self._rows.values()) if changed else []
+        if changed:
+            self._write_json('chores.json', rows)
+            written += 1
+            by_assignee: dict[str, list[dict]] = {}
+            for row in sorted(rows, key=ChoreViews.deadline_order) if dirty else ():
+                by_assignee.setdefault(row["Assignee ID"], []).append(row)
+            for uid in dirty:
+                if uid in self._occupants and _SAFE_UID.fullmatch(uid):
+                    self._write_json(os.path.join('chores', uid + '.json'), by_assignee.get(uid, []))
+                    written += 1
+        if written:
+            self._write_json('version.json', {"chores": chore_signature, "occupants": occupants_signature})
+            written += 1
+            with self._condition:
+                self._written_signature = chore_signature
+        self.files_written += written
+        return written
+
+    def _read_chores(self) -> None:
+        """Read the assigned chores from the chores CSV."""
+        with self._condition:
+            self._chore_signature = None
+        with DataInput.snapshot_reads() as version:
+            rows = {chore.id: chore.to_csv_row() for chore in DataInput.iter_chores(status=CHORE_STATUS.ASSIGNED)}
+        with self._condition:
+            self._rows = rows
+            if self._chore_signature is not None and self._chore_signature != version.signature:
+                # written while it was read, after the version read
+                self._full = True
+            self._chore_signature = version.signature
+
+    def _write_json(self, filename: str, value) -> None:
+        filepath = os.path.join(self.directory, filename)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        text = json.dumps(value, separators=(',', ':'))
+        DataInput._replace_file(filepath, lambda file: file.write(text))
+
+    def _remove_file(self, uid: str) -> None:
+        if _SAFE_UID.fullmatch(uid):
+            try:
+                os.remove(os.path.join(self.directory, 'chores', uid + '.json'))
+            except FileNotFoundError:
+                pass
+
+    def _remove_stale_files(self) -> None:
+        """Remove the files of occupants who left, e.g. while no process was keeping the files up to date."""
+        try:
+            filenames = os.listdir(os.path.join(self.directory, 'chores'))
+        except FileNotFoundError:
+            return
+        for filename in filenames:
+            uid, extension = os.path.splitext(filename)
+            if extension == '.json' and uid not in self._occupants:
+                self._remove_file(uid)
+
+
+# static JSON files of the household, kept up to date once started (see STATIC_JSON)
+snapshots = StaticJSONSnapshots(STATIC_JSON_DIRECTORY)
+
+
+if __name__ == "__main__":
+    raise Exception("This module is not meant to be run on its own. Please import it into another module.")
@@ -0,0 +1,77 @@
+"""
+Chore Views Benchmark
+Author: Haus Team
+Date: 10/19/2026
+
+This file measures reading the open chores and the workload of one occupant of a large synthetic household
+from the views (see ChoreViews.py) and by filtering the chores CSV, as well as building the views
+and keeping them up to date after a write.
+
+Usage: python benchmarks/BenchChoreViews.py [number of chores]
+"""
+
+# fix import path
+import Context
+
+# modules
+import sys
+import tempfile
+import time
+
+import AutoAssign
+import ChoreViews
+import DataInput
+import SyntheticData
+from DataInput import CHORE_STATUS
+
+
+def best_of(repeats: int, function) -> float:
+    """Return the fastest of several timed calls to function, in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(chores: int = 100_000) -> None:
+    saved_filepaths = (DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH)
+    saved_durability = DataInput.DURABILITY_MODE
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            SyntheticData.write_household(directory, occupants=50, chores=chores)
+            SyntheticData.use_household(directory)
+            DataInput.set_durability_mode('relaxed')
+            views = ChoreViews.views
+            user_id = DataInput.get_user_ids()[0]
+            week_ago, next_week = AutoAssign.workload_window()
+            start = time.perf_counter()
+            open_chores = views.open_chores(user_id)
+            print(f"{chores} chores: views built in {(time.perf_counter() - start) * 1000:.0f} ms, "
+                  f"{len(open_chores)} open chores for one occupant")
+
+            scan_ms = best_of(3, lambda: list(DataInput.iter_chores(assignee_id=user_id,
+                                                                    status=CHORE_STATUS.ASSIGNED)))
+            view_ms = best_of(3, lambda: views.open_chores(user_id))
+            print(f"  open chores:  {scan_ms:8.1f} ms filtering the CSV, {view_ms:8.2f} ms from the view")
+            scan_ms = best_of(3, lambda: sum(chore.expected_duration for chore in DataInput.get_chores_by_filters(
+                assignee_id=user_id, min_deadline_date=week_ago, max_deadline_date=next_week)))
+            view_ms = best_of(3, lambda: AutoAssign.user_workload(user_id))
+            print(f"  workload:     {scan_ms:8.1f} ms filtering the CSV, {view_ms:8.2f} ms from the view")
+
+            chore = open_chores[0]
+            start = time.perf_counter()
+            DataInput.set_chore_complete(chore.id)
+            write_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            views.open_chores(user_id)
+            print(f"  completion written in {write_ms:.0f} ms, "
+                  f"views read again in {(time.perf_counter() - start) * 1000:.2f} ms ({views.rebuilds} builds)")
+    finally:
+        DataInput.set_durability_mode(saved_durability)
+        DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH = saved_filepaths
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,41 @@
+"""
+Durability Mode Benchmark
+Author: Haus Team
+Date: 10/19/2026
+
+This file measures chore write throughput under each durability mode of DataInput
+(strict, batched and relaxed), for a single writer and for concurrent writers
+whose mutations are group-committed.
+
+Usage: python benchmarks/BenchDurability.py [number of chores]
+"""
+
+# fix import path
+import Context
+
+# modules
+import sys
+import tempfile
+
+import DataInput
+import SyntheticData
+from BenchGroupCommit import burst
+
+
+def main(chore_count: int = 500, mutations: int = 100) -> None:
+    with tempfile.TemporaryDirectory(dir='.') as directory:
+        SyntheticData.write_household(directory, occupants=10, chores=chore_count)
+        SyntheticData.use_household(directory)
+        chores = list(DataInput.iter_chores(limit=mutations))
+        print(f"{mutations} updates to a {chore_count}-chore file, in updates/s")
+        print(f"{'mode':>8} {'1 thread':>10} {'16 threads':>11}")
+        for mode in DataInput.DURABILITY_MODES:
+            DataInput.set_durability_mode(mode)
+            single = mutations / burst(chores, 1)
+            concurrent = mutations / burst(chores, 16)
+            print(f"{mode:>8} {single:>10.0f} {concurrent:>11.0f}")
+        DataInput.set_durability_mode('strict')
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,94 @@
+"""
+Response Encoding Benchmark
+Author: Haus Team
+Date: 10/19/2026
+
+This file measures the size of a /chore/serve reply holding many chores, and how long it takes to
+serialize and compress, for each reply format (see ResponseEncoding.py):
+    objects (before): the reply as it was built before, json.dumps one chore at a time
+    objects: a list of objects, serialized a few chores at a time
+    columnar: the column names once, then every chore as a list of values
+Each format is serialized with the json module and with orjson (if installed), then compressed with
+gzip and brotli (if installed).
+
+Usage: python benchmarks/BenchEncoding.py [number of chores]
+"""
+
+# fix import path
+import Context
+
+# modules
+import contextlib
+import json
+import sys
+import tempfile
+import time
+
+import DataInput
+import ResponseEncoding
+import SyntheticData
+
+
+def best_of(repeats: int, function) -> float:
+    """Return the fastest of several timed calls to function, in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+@contextlib.contextmanager
+def encoder(name: str):
+    """Serialize with the given JSON encoder ('json' or 'orjson') within the block."""
+    saved = ResponseEncoding.orjson
+    if name == 'json':
+        ResponseEncoding.orjson = None
+    try:
+        yield
+    finally:
+        ResponseEncoding.orjson = saved
+
+
+def serialize_before(rows: list[dict]) -> bytes:
+    # the streamed reply of /chore/serve before the compact formats
+    chunks = ['['] + [(',' if i else '') + json.dumps(row) for i, row in enumerate(rows)] + [']']
+    return ''.join(chunks).encode()
+
+
+FORMATS = {
+    'objects (before)': serialize_before,
+    'objects': lambda rows: b''.join(ResponseEncoding.stream_objects(rows)),
+    'columnar': lambda rows: b''.join(ResponseEncoding.stream_columnar(DataInput.CHORE_ATTRIBUTES, rows)),
+}
+
+
+def main(chores: int = 10_000) -> None:
+    saved_filepaths = (DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            SyntheticData.write_household(directory, occupants=20, chores=chores)
+            SyntheticData.use_household(directory)
+            rows = [chore.to_csv_row() for chore in DataInput.iter_chores()]
+    finally:
+        DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH = saved_filepaths
+
+    encoders = ['json'] + (['orjson'] if ResponseEncoding.orjson is not None else [])
+    print(f"{len(rows)} chores")
+    print(f"{'format':>17} {'encoder':>7} {'serialize ms':>13} {'bytes':>10} " +
+          ' '.join(f"{encoding + ' bytes':>11} {encoding + ' ms':>8}" for encoding in ResponseEncoding.ENCODINGS))
+    for name, serialize in FORMATS.items():
+        for encoder_name in encoders if name != 'objects (before)' else ['json']:
+            with encoder(encoder_name):
+                serialize_ms = best_of(5, lambda: serialize(rows))
+                data = serialize(rows)
+            compressed = []
+            for encoding in ResponseEncoding.ENCODINGS:
+                compress_ms = best_of(3, lambda: ResponseEncoding.compress(data, encoding))
+                compressed.append(f"{len(ResponseEncoding.compress(data, encoding)):>11} {compress_ms:8.1f}")
+            print(f"{name:>17} {encoder_name:>7} {serialize_ms:13.1f} {len(data):>10} " + ' '.join(compressed))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,62 @@
+"""
+Group Commit Benchmark
+Author: Haus Team
+Date: 10/19/2026
+
+This file measures chore mutation throughput under bursty concurrent load:
+many threads each update their own chores at the same time, and the group committer
+in DataInput combines their mutations into shared rewrites of the chores CSV.
+
+Usage: python benchmarks/BenchGroupCommit.py [number of chores]
+"""
+
+# fix import path
+import Context
+
+# modules
+import sys
+import tempfile
+import threading
+import time
+
+import DataInput
+import Metrics
+import SyntheticData
+
+
+def burst(chores: list[DataInput.Chore], threads: int) -> float:
+    """Update every chore, spread over the given number of threads; return the elapsed seconds."""
+    def worker(own_chores: list[DataInput.Chore]) -> None:
+        for chore in own_chores:
+            chore.name = chore.name + "!"
+            DataInput.update_chore_by_object(chore)
+
+    workers = [threading.Thread(target=worker, args=(chores[i::threads],)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main(chore_count: int = 2000, mutations: int = 200) -> None:
+    Metrics.enable()
+    with tempfile.TemporaryDirectory() as directory:
+        SyntheticData.write_household(directory, occupants=20, chores=chore_count)
+        SyntheticData.use_household(directory)
+        chores = list(DataInput.iter_chores(limit=mutations))
+        print(f"{mutations} updates to a {chore_count}-chore file")
+        print(f"{'threads':>8} {'window':>8} {'updates/s':>10} {'batches':>8} {'avg batch':>10}")
+        for window_ms in (0, 2):
+            DataInput.GROUP_COMMIT_WINDOW = window_ms / 1000
+            for threads in (1, 4, 16, 64):
+                Metrics.reset()
+                elapsed = burst(chores, threads)
+                batches = Metrics.GROUP_COMMIT_BATCHES.get()
+                print(f"{threads:>8} {window_ms:>6}ms {mutations / elapsed:>10.0f} {batches:>8.0f} "
+                      f"{mutations / batches:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,96 @@
+"""
+Chore Query Benchmark
+Author: Haus Team
+Date: 10/19/2026
+
+This file measures chore queries (see ChoreQuery.py) over a large synthetic household: each query runs
+with the plan it compiles to, then forced to scan the chores CSV, and the equivalent get_chores_by_filters
+calls are timed for the queries they can express (several calls for an OR).
+
+Usage: python benchmarks/BenchQuery.py [number of chores]
+"""
+
+# fix import path
+import Context
+
+# modules
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import ChoreQuery
+import DataInput
+import SyntheticData
+from ChoreQuery import Field, Query
+from DataInput import CHORE_STATUS
+
+TODAY = SyntheticData.TODAY
+
+
+def best_of(repeats: int, function) -> float:
+    """Return the fastest of several timed calls to function, in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def queries(assignee_id: str) -> dict:
+    """Return the benchmarked queries, with the get_chores_by_filters calls doing the same (or None)."""
+    open_statuses = [CHORE_STATUS.ASSIGNED, CHORE_STATUS.UNASSIGNED]
+    return {
+        "due today": (
+            Query().where(Field('Deadline Date') == TODAY),
+            lambda: DataInput.get_chores_by_filters(min_deadline_date=TODAY, max_deadline_date=TODAY)),
+        "overdue or due today, open": (
+            Query().where(Field('Status').in_(open_statuses) & (
+                (Field('Deadline Date') < TODAY - timedelta(days=3)) | (Field('Deadline Date') == TODAY))),
+            lambda: [chore for status in open_statuses for chore in
+                     DataInput.get_chores_by_filters(status=status, max_deadline_date=TODAY - timedelta(days=3))
+                     + DataInput.get_chores_by_filters(status=status, min_deadline_date=TODAY,
+                                                       max_deadline_date=TODAY)]),
+        "one occupant's assigned": (
+            Query().where((Field('Assignee ID') == assignee_id) & (Field('Status') == CHORE_STATUS.ASSIGNED)),
+            lambda: DataInput.get_chores_by_filters(assignee_id=assignee_id, status=CHORE_STATUS.ASSIGNED)),
+        "kitchen, next 20 due": (
+            Query().where(Field('Category') == 'Kitchen').order_by('Deadline Date').limit(20),
+            None),
+        "completed this week": (
+            Query().where(Field('Completion Date').between(TODAY - timedelta(days=7), TODAY)),
+            None),
+        "long chores (no index)": (
+            Query().where(Field('Expected Duration') >= 30),
+            None),
+    }
+
+
+def main(chores: int = 100_000) -> None:
+    saved_filepaths = (DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH)
+    saved_fraction = ChoreQuery.INDEX_MAX_FRACTION
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            SyntheticData.write_household(directory, occupants=50, chores=chores)
+            SyntheticData.use_household(directory)
+            start = time.perf_counter()
+            DataInput._get_chore_offset_index().column_indexes()
+            print(f"{chores} chores: column indexes built in {(time.perf_counter() - start) * 1000:.0f} ms")
+            print(f"{'query':>28} {'matches':>8} {'plan':>6} {'plan ms':>8} {'scan ms':>8} {'filters ms':>10}")
+            for name, (query, filters) in queries(DataInput.get_user_ids()[0]).items():
+                matches = len(query.run())
+                plan = 'index' if query.plan().uses_index else 'scan'
+                plan_ms = best_of(3, query.run)
+                ChoreQuery.INDEX_MAX_FRACTION = 0
+                scan_ms = best_of(3, query.run)
+                ChoreQuery.INDEX_MAX_FRACTION = saved_fraction
+                filters_ms = f"{best_of(3, filters):10.1f}" if filters is not None else f"{'-':>10}"
+                print(f"{name:>28} {matches:>8} {plan:>6} {plan_ms:8.1f} {scan_ms:8.1f} {filters_ms}")
+    finally:
+        ChoreQuery.INDEX_MAX_FRACTION = saved_fraction
+        DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH = saved_filepaths
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,90 @@
+"""
+Replication Benchmark
+Author: Haus Team
+Date: 10/19/2026
+
+This file measures what the change log costs the writers of a large synthetic household, and how quickly a
+replica following it (see Replication.py) starts from its snapshot, applies writes, and serves reads
+compared to the chores CSV.
+
+Usage: python benchmarks/BenchReplication.py [number of chores] [number of writes]
+"""
+
+# fix import path
+import Context
+
+# modules
+import sys
+import tempfile
+import time
+
+import DataInput
+import Replication
+import SyntheticData
+from DataInput import CHORE_STATUS
+
+
+def best_of(repeats: int, function) -> float:
+    """Return the fastest of several timed calls to function, in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def write_chores(writes: int) -> float:
+    """Return the mean time of a chore write, in milliseconds."""
+    start = time.perf_counter()
+    for i in range(writes):
+        DataInput.new_chore_by_args(f"Benchmark chore {i}", "Written by the replication benchmark")
+    return (time.perf_counter() - start) * 1000 / writes
+
+
+def main(chores: int = 100_000, writes: int = 20) -> None:
+    saved_filepaths = (DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH)
+    saved_change_log, saved_durability = DataInput.CHANGE_LOG, DataInput.DURABILITY_MODE
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            SyntheticData.write_household(directory, occupants=50, chores=chores)
+            SyntheticData.use_household(directory)
+            DataInput.set_durability_mode('relaxed')
+            print(f"{chores} chores, {writes} writes")
+            DataInput.CHANGE_LOG = False
+            print(f"  write without change log: {write_chores(writes):8.1f} ms")
+            DataInput.CHANGE_LOG = True
+            start = time.perf_counter()
+            DataInput.new_chore_by_args("First logged chore", "Starts the change log with a snapshot")
+            print(f"  first logged write (snapshot): {(time.perf_counter() - start) * 1000:8.1f} ms")
+            print(f"  write with change log:    {write_chores(writes):8.1f} ms")
+
+            replica = Replication.ChoreReplica()
+            start = time.perf_counter()
+            replica.poll()
+            print(f"  replica started from the log in {(time.perf_counter() - start) * 1000:8.1f} ms")
+            write_chores(writes)
+            start = time.perf_counter()
+            applied = replica.poll()
+            print(f"  {applied} entries applied in {(time.perf_counter() - start) * 1000:8.1f} ms")
+            DataInput.new_chore_by_args("Read back", "Read back from the replica")
+            sequence = DataInput.take_change_sequence()
+            start = time.perf_counter()
+            replica.wait_for(sequence)
+            print(f"  write read back from the replica after {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+            assignee_id = DataInput.get_user_ids()[0]
+            csv_ms = best_of(3, lambda: list(DataInput.iter_chores(assignee_id=assignee_id,
+                                                                   status=CHORE_STATUS.ASSIGNED)))
+            replica_ms = best_of(3, lambda: list(replica.iter_chores(assignee_id=assignee_id,
+                                                                     status=CHORE_STATUS.ASSIGNED)))
+            print(f"  one occupant's assigned chores: {csv_ms:8.1f} ms from the CSV, {replica_ms:8.1f} ms from the replica")
+            replica.stop()
+    finally:
+        DataInput.CHANGE_LOG = saved_change_log
+        DataInput.set_durability_mode(saved_durability)
+        DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH = saved_filepaths
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
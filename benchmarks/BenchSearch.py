@@ -0,0 +1,67 @@
+"""
+Chore Search Benchmark
+Author: Haus Team
+Date: 10/19/2026
+
+This file measures how long the search index (see SearchIndex.py) takes to build over a large
+synthetic household, to search it for a few typical queries, and to stay up to date after a write.
+
+Usage: python benchmarks/BenchSearch.py [number of chores]
+"""
+
+# fix import path
+import Context
+
+# modules
+import sys
+import tempfile
+import time
+
+import DataInput
+import SearchIndex
+import SyntheticData
+
+# typical queries: a rare and a common word, a prefix, two words, and a word no chore has
+QUERIES = ['trash', 'clean', 'va', 'clean fridge', 'kitchen floor', 'zzz']
+
+
+def best_of(repeats: int, function) -> float:
+    """Return the fastest of several timed calls to function, in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(chores: int = 100_000) -> None:
+    saved_filepaths = (DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            SyntheticData.write_household(directory, occupants=50, chores=chores)
+            SyntheticData.use_household(directory)
+            index = SearchIndex.ChoreSearchIndex()
+            DataInput.register_chore_listener(index.chores_changed)
+            try:
+                start = time.perf_counter()
+                index.search('')
+                build_ms = (time.perf_counter() - start) * 1000
+                print(f"{chores} chores: index built in {build_ms:.0f} ms")
+                for query in QUERIES:
+                    total, _ = index.search(query)
+                    search_ms = best_of(5, lambda: index.search(query))
+                    print(f"  search {query!r:>16}: {total:>7} matches, first page in {search_ms:8.2f} ms")
+                chore = next(DataInput.iter_chores())
+                chore.name = "Take out the recycling"
+                DataInput.update_chore_by_object(chore)
+                search_ms = best_of(1, lambda: index.search('recycling'))
+                print(f"  search after a write:               {search_ms:8.2f} ms ({index.rebuilds} build)")
+            finally:
+                DataInput.unregister_chore_listener(index.chores_changed)
+    finally:
+        DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH = saved_filepaths
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,56 @@
+"""
+Static JSON Benchmark
+Author: Haus Team
+Date: 10/19/2026
+
+This file measures how long generating the static JSON files (see StaticJSON.py) of a large synthetic household
+takes, from scratch and after a write changing a single chore, and how many files each rewrites.
+
+Usage: python benchmarks/BenchStaticJSON.py [number of chores]
+"""
+
+# fix import path
+import Context
+
+# modules
+import sys
+import tempfile
+import time
+
+import DataInput
+import StaticJSON
+import SyntheticData
+from DataInput import CHORE_STATUS
+
+
+def main(chores: int = 100_000) -> None:
+    saved_filepaths = (DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH)
+    saved_durability = DataInput.DURABILITY_MODE
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            SyntheticData.write_household(directory, occupants=50, chores=chores)
+            SyntheticData.use_household(directory)
+            DataInput.set_durability_mode('relaxed')
+            snapshots = StaticJSON.StaticJSONSnapshots(directory + '/static')
+            DataInput.register_chore_listener(snapshots.chores_changed)
+            print(f"{chores} chores, 50 occupants")
+            start = time.perf_counter()
+            written = snapshots.materialize()
+            print(f"  from scratch:       {written:3} files in {(time.perf_counter() - start) * 1000:8.1f} ms")
+            chore = next(DataInput.iter_chores(status=CHORE_STATUS.ASSIGNED, limit=1))
+            chore.description += " (edited)"
+            DataInput.update_chore_by_object(chore)
+            start = time.perf_counter()
+            written = snapshots.materialize()
+            print(f"  after one write:    {written:3} files in {(time.perf_counter() - start) * 1000:8.1f} ms")
+            start = time.perf_counter()
+            written = snapshots.materialize()
+            print(f"  nothing changed:    {written:3} files in {(time.perf_counter() - start) * 1000:8.1f} ms")
+            DataInput.unregister_chore_listener(snapshots.chores_changed)
+    finally:
+        DataInput.set_durability_mode(saved_durability)
+        DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH = saved_filepaths
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,286 @@
+"""
+Benchmark Suite
+Author: Haus Team
+Date: 10/19/2026
+
+This file times the data layer, the automatic assignment and every Flask endpoint against
+synthetic households of several sizes, writes the results as JSON, and compares them against
+a stored baseline. Any benchmark that got slower than the baseline by more than the threshold
+is flagged as a regression, and the exit status is then non-zero.
+
+Usage:
+    python benchmarks/BenchmarkSuite.py                    # run and compare against baseline.json
+    python benchmarks/BenchmarkSuite.py --update-baseline  # run and store the results as the new baseline
+    python benchmarks/BenchmarkSuite.py --sizes small,medium,large --repeats 9 --output results.json
+"""
+
+# fix import path
+import Context
+
+# modules
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+# importing the app does some work on its data files (e.g. cleaning up interrupted writes):
+# point it at an empty directory, so that it never touches csvs/ (every household then sets its own paths)
+_import_directory = tempfile.TemporaryDirectory()
+os.environ['HAUS_DATA_DIRECTORY'] = _import_directory.name
+
+import DataInput
+import AutoAssign
+import flask_integration
+import login
+from DataInput import CHORE_STATUS
+import SyntheticData
+
+# enhanced typing
+from typing import Callable
+
+# Households to benchmark against, see SyntheticData.write_household
+HOUSEHOLD_SIZES = {
+    'small': {'occupants': 5, 'chores': 100, 'history_depth': 2},
+    'medium': {'occupants': 10, 'chores': 300, 'history_depth': 3},
+    'large': {'occupants': 50, 'chores': 2000, 'history_depth': 5},
+}
+DEFAULT_SIZES = ['small', 'medium']
+
+# Stored results to compare against
+BASELINE_FILEPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# A benchmark regresses if its median is this fraction slower than the baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and also slower by at least this many milliseconds (avoids flagging noise on very fast benchmarks)
+MIN_REGRESSION_MS = 0.5
+
+
+class Household:
+    """
+    A synthetic household in a temporary directory.
+    reset() restores the pristine CSVs, so that every timed run starts from the same data.
+    """
+
+    def __init__(self, directory: str, occupants: int, chores: int, history_depth: int):
+        self.template = os.path.join(directory, 'template')
+        self.data = os.path.join(directory, 'data')
+        os.makedirs(self.template)
+        os.makedirs(self.data)
+        SyntheticData.write_household(self.template, occupants=occupants, chores=chores,
+                                      history_depth=history_depth)
+
+    def reset(self) -> None:
+        for filename in os.listdir(self.data):
+            os.remove(os.path.join(self.data, filename))
+        for filename in ('chores.csv', 'occupants.csv'):
+            shutil.copyfile(os.path.join(self.template, filename), os.path.join(self.data, filename))
+        SyntheticData.use_household(self.data)
+
+
+"""
+Benchmarks
+Each benchmark prepares its inputs (untimed) and returns the operation to time.
+"""
+
+
+def first_chore(status: CHORE_STATUS) -> DataInput.Chore:
+    """Return the first chore with the given status."""
+    return next(DataInput.iter_chores(status=status))
+
+
+def bench_get_chores_by_filters(household: Household) -> Callable[[], object]:
+    assignee_id = DataInput.get_user_ids()[0]
+    return lambda: DataInput.get_chores_by_filters(assignee_id=assignee_id, status=CHORE_STATUS.ASSIGNED)
+
+
+def bench_get_chores_by_filters_all(household: Household) -> Callable[[], object]:
+    return lambda: DataInput.get_chores_by_filters()
+
+
+def bench_get_chore_by_id(household: Household) -> Callable[[], object]:
+    *_, last_chore = DataInput.iter_chores()
+    # build the offset index first: this times a warm point lookup
+    DataInput.get_chore_by_id(last_chore.id)
+    return lambda: DataInput.get_chore_by_id(last_chore.id)
+
+
+def bench_update_chore_by_object(household: Household) -> Callable[[], object]:
+    *_, chore = DataInput.iter_chores()
+    chore.name = "Updated"
+    return lambda: DataInput.update_chore_by_object(chore)
+
+
+def bench_set_chore_complete(household: Household) -> Callable[[], object]:
+    chore = first_chore(CHORE_STATUS.ASSIGNED)
+    return lambda: DataInput.set_chore_complete(chore.id)
+
+
+def bench_assign_unassigned_chores(household: Household) -> Callable[[], object]:
+    return AutoAssign.assign_unassigned_chores
+
+
+def bench_renew_repeating_chores(household: Household) -> Callable[[], object]:
+    return AutoAssign.renew_repeating_chores
+
+
+def endpoint(method: str, path: str, data: Callable[[], dict] = dict) -> Callable[[Household], Callable[[], object]]:
+    """Return a benchmark requesting the endpoint through Flask's test client."""
+    def bench(household: Household) -> Callable[[], object]:
+        client = flask_integration.app.test_client()
+        form = data()
+
+        def request() -> None:
+            response = client.open(path, method=method, data=form)
+            response.get_data()
+            response.close()
+            if response.status_code != 200:
+                raise RuntimeError(f"{method} {path} returned {response.status_code}")
+        return request
+    return bench
+
+
+BENCHMARKS: dict[str, Callable[[Household], Callable[[], object]]] = {
+    'get_chores_by_filters': bench_get_chores_by_filters,
+    'get_chores_by_filters_all': bench_get_chores_by_filters_all,
+    'get_chore_by_id': bench_get_chore_by_id,
+    'update_chore_by_object': bench_update_chore_by_object,
+    'set_chore_complete': bench_set_chore_complete,
+    'assign_unassigned_chores': bench_assign_unassigned_chores,
+    'renew_repeating_chores': bench_renew_repeating_chores,
+    'POST /user/login': endpoint('POST', '/user/login', lambda: {'user': 'occupant0', 'pass': 'password0'}),
+    'POST /user/create': endpoint('POST', '/user/create', lambda: {'user': 'newcomer', 'pass': 'secret'}),
+    'GET /user/serve': endpoint('GET', '/user/serve'),
+    'POST /user/delete': endpoint('POST', '/user/delete', lambda: {'user': 'occupant0', 'pass': 'password0'}),
+    'POST /chore/serve': endpoint('POST', '/chore/serve', lambda: {'user': 'occupant0'}),
+    'POST /chore/create': endpoint('POST', '/chore/create', lambda: {
+        'Chore Name': 'Mop', 'Description': 'Mop the floors', 'Frequency': '7', 'Expected Duration': '20'}),
+    'POST /chore/complete': endpoint('POST', '/chore/complete', lambda: {
+        'chore_id': first_chore(CHORE_STATUS.ASSIGNED).id}),
+    'GET /chore/assign': endpoint('GET', '/chore/assign'),
+}
+
+
+"""
+Running and Comparing
+"""
+
+
+def run_benchmark(household: Household, prepare: Callable[[Household], Callable[[], object]],
+                  repeats: int) -> dict:
+    """Time the benchmark repeats times, each time on fresh data, and summarize the timings."""
+    timings = []
+    for _ in range(repeats):
+        household.reset()
+        DataInput.set_id_generator(DataInput.SequenceIdGenerator('bench'))
+        # the endpoints are requested many times from the same client: start each run with no attempts counted
+        login.username_throttle.clear()
+        login.client_throttle.clear()
+        operation = prepare(household)
+        # keep the console output of the modules out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            operation()
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': round(statistics.median(timings), 4),
+        'min_ms': round(min(timings), 4),
+        'max_ms': round(max(timings), 4),
+        'runs': repeats,
+    }
+
+
+def run_suite(sizes: list[str], repeats: int, only: list[str] = None) -> dict:
+    """Run every benchmark (or those named in only) for each household size."""
+    results = {}
+    saved_filepaths = (DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH)
+    # make every run see the same date as the households were generated for, and the same new IDs
+    DataInput.set_clock(lambda: SyntheticData.TODAY)
+    try:
+        for size in sizes:
+            results[size] = {}
+            with tempfile.TemporaryDirectory() as directory:
+                household = Household(directory, **HOUSEHOLD_SIZES[size])
+                for name, prepare in BENCHMARKS.items():
+                    if only and name not in only:
+                        continue
+                    results[size][name] = run_benchmark(household, prepare, repeats)
+                    print(f"{size:>8} {name:<28} {results[size][name]['median_ms']:10.3f} ms", file=sys.stderr)
+    finally:
+        DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH = saved_filepaths
+        DataInput.set_clock(None)
+        DataInput.set_id_generator(None)
+    return {
+        'date': date.today().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'household_sizes': {size: HOUSEHOLD_SIZES[size] for size in sizes},
+        'results': results,
+    }
+
+
+def find_regressions(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every benchmark whose median got slower than in the baseline."""
+    regressions = []
+    for size, benchmarks in report['results'].items():
+        for name, result in benchmarks.items():
+            base = baseline.get('results', {}).get(size, {}).get(name)
+            if base is None:
+                continue
+            slower_ms = result['median_ms'] - base['median_ms']
+            if result['median_ms'] > base['median_ms'] * (1 + threshold) and slower_ms > MIN_REGRESSION_MS:
+                regressions.append(f"{size} {name}: {base['median_ms']:.3f} ms -> {result['median_ms']:.3f} ms "
+                                   f"({result['median_ms'] / base['median_ms']:.2f}x)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Haus backend against synthetic households.")
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES),
+                        help=f"comma-separated household sizes out of {', '.join(HOUSEHOLD_SIZES)}")
+    parser.add_argument('--repeats', type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument('--only', default='', help="comma-separated benchmark names to run")
+    parser.add_argument('--output', default='', help="write the JSON results to this file (default: stdout)")
+    parser.add_argument('--baseline', default=BASELINE_FILEPATH, help="baseline JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="fraction by which a benchmark may get slower before it is flagged")
+    parser.add_argument('--update-baseline', action='store_true', help="store the results as the new baseline")
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes.split(','), args.repeats, [name for name in args.only.split(',') if name])
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as file:
+            file.write(output + '\n')
+        print(f"Stored baseline in {args.baseline}", file=sys.stderr)
+        return 0
+
+    try:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}, nothing to compare against", file=sys.stderr)
+        return 0
+    regressions = find_regressions(report, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if not regressions:
+        print("No regressions against the baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+Context for Benchmarks
+Author: Haus Team
+Date: 10/19/2026
+
+This file starts the Python module search from the project root.
+Benchmarks generate their own data files in temporary directories, so they never touch csvs/.
+"""
+
+# modules
+import sys
+import os
+
+# define the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# start Python module search from the project root
+sys.path.insert(0, project_root)
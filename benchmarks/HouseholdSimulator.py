@@ -0,0 +1,265 @@
+"""
+Discrete-Event Household Simulator
+Author: Haus Team
+Date: 10/19/2026
+
+This file replays realistic usage of several synthetic households over simulated months, to see how
+the backend behaves as their chore histories grow. Each household independently creates chores,
+completes them, and logs in, at random times drawn from exponential inter-arrival times; repeating
+chores are renewed every midnight. Events are processed in order of their simulated time, and the
+modules read the date from a virtual clock (see DataInput.set_clock), so months pass in minutes.
+
+Every operation goes through DataInput, AutoAssign and login the same way the Flask endpoints do.
+For each simulated week, the report gives the throughput (operations per second of real time),
+the average size of the chores CSV, and the median and 95th percentile latency of each operation.
+
+Usage:
+    python benchmarks/HouseholdSimulator.py
+    python benchmarks/HouseholdSimulator.py --households 5 --days 180 --output simulation.json
+"""
+
+# fix import path
+import Context
+
+# modules
+import argparse
+import contextlib
+import heapq
+import io
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import AutoAssign
+import DataInput
+import login
+import SyntheticData
+from DataInput import CHORE_STATUS
+
+# enhanced typing
+from typing import Callable
+
+# first simulated day
+START = datetime(2024, 3, 15)
+
+# average number of each event, per household and simulated day
+EVENT_RATES = {
+    'create': 1.0,
+    'complete': 3.0,
+    'login': 6.0,
+}
+
+
+class VirtualClock:
+    """The simulated time, which only moves forward when the simulation processes its next event."""
+
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def today(self) -> date:
+        return self.now.date()
+
+
+class Household:
+    """A synthetic household, in its own directory, with its own random number generator."""
+
+    def __init__(self, directory: str, number: int, occupants: int, chores: int, seed: int):
+        self.directory = directory
+        self.number = number
+        self.occupants = occupants
+        self.rng = random.Random(seed)
+        os.makedirs(directory)
+        SyntheticData.write_household(directory, occupants=occupants, chores=chores, seed=seed,
+                                      today=START.date())
+
+    def activate(self) -> None:
+        """Point the data layer at this household's files."""
+        SyntheticData.use_household(self.directory)
+
+    def chores_size(self) -> int:
+        return os.path.getsize(os.path.join(self.directory, 'chores.csv'))
+
+
+"""
+Operations
+Each operation performs one event for the active household, like the matching Flask endpoint would.
+"""
+
+
+def create_chore(household: Household) -> None:
+    name, category = household.rng.choice(SyntheticData.CHORE_NAMES)
+    DataInput.new_chore_by_args(name, f"{name} (simulated)", category=category,
+                                expected_duration=household.rng.choice([5, 10, 15, 20, 30, 45]),
+                                frequency=household.rng.choice(SyntheticData.FREQUENCIES))
+    AutoAssign.assign_unassigned_chores()
+
+
+def complete_chore(household: Household) -> None:
+    # occupants complete the assigned chore with the nearest deadline
+    chore = min(DataInput.iter_chores(status=CHORE_STATUS.ASSIGNED),
+                key=lambda chore: chore.deadline_date or date.max, default=None)
+    if chore is None:
+        return
+    DataInput.set_chore_complete(chore.id)
+    AutoAssign.renew_repeating_chores()
+    AutoAssign.assign_unassigned_chores()
+
+
+def log_in(household: Household) -> None:
+    occupant = household.rng.randrange(household.occupants)
+    login.log_in_user(f"occupant{occupant}", f"password{occupant}", DataInput.OCCUPANTS_FILEPATH)
+
+
+def renew_chores(household: Household) -> None:
+    AutoAssign.renew_repeating_chores()
+
+
+OPERATIONS: dict[str, Callable[[Household], None]] = {
+    'create': create_chore,
+    'complete': complete_chore,
+    'login': log_in,
+    'renew': renew_chores,
+}
+
+
+"""
+Simulation
+"""
+
+
+class Simulation:
+    """Processes the events of every household in order of simulated time, and records what they cost."""
+
+    def __init__(self, directory: str, households: int, days: int, occupants: int, chores: int, seed: int = 0):
+        self.days = days
+        self.clock = VirtualClock(START)
+        self.households = [Household(os.path.join(directory, f"household{i}"), i, occupants, chores, seed + i)
+                           for i in range(households)]
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._events: list[tuple[datetime, int, str, Household]] = []
+        self._sequence = itertools.count()
+
+    def schedule(self, when: datetime, kind: str, household: Household) -> None:
+        heapq.heappush(self._events, (when, next(self._sequence), kind, household))
+
+    def schedule_next(self, kind: str, household: Household) -> None:
+        """Schedule the next random event of the given kind, after an exponential inter-arrival time."""
+        days = self.rng.expovariate(EVENT_RATES[kind])
+        self.schedule(self.clock.now + timedelta(days=days), kind, household)
+
+    def run(self) -> dict:
+        end = START + timedelta(days=self.days)
+        for household in self.households:
+            for kind in EVENT_RATES:
+                self.schedule_next(kind, household)
+            self.schedule(START + timedelta(days=1), 'renew', household)
+
+        weeks = []
+        week = self._new_week(0)
+        DataInput.set_clock(self.clock.today)
+        # reproducible IDs, which are also cheaper to make than random UUIDs
+        DataInput.set_id_generator(DataInput.SequenceIdGenerator(f"sim{self.seed}"))
+        try:
+            while self._events and self._events[0][0] < end:
+                when, _, kind, household = heapq.heappop(self._events)
+                week_number = (when - START).days // 7
+                if week_number != week['week']:
+                    weeks.append(self._finish_week(week))
+                    week = self._new_week(week_number)
+                self.clock.now = when
+                household.activate()
+                start = time.perf_counter()
+                # keep the console output of the modules out of the report
+                with contextlib.redirect_stdout(io.StringIO()):
+                    OPERATIONS[kind](household)
+                elapsed = time.perf_counter() - start
+                week['latencies'].setdefault(kind, []).append(elapsed)
+                week['seconds'] += elapsed
+                # schedule the same kind of event again
+                if kind == 'renew':
+                    self.schedule(when + timedelta(days=1), kind, household)
+                else:
+                    self.schedule_next(kind, household)
+            weeks.append(self._finish_week(week))
+        finally:
+            DataInput.set_clock(None)
+            DataInput.set_id_generator(None)
+        return {
+            'households': len(self.households),
+            'days': self.days,
+            'event_rates': EVENT_RATES,
+            'weeks': weeks,
+        }
+
+    @staticmethod
+    def _new_week(number: int) -> dict:
+        return {'week': number, 'latencies': {}, 'seconds': 0.0}
+
+    def _finish_week(self, week: dict) -> dict:
+        """Summarize the operations of a week, and measure the data files at its end."""
+        operations = sum(len(latencies) for latencies in week['latencies'].values())
+        return {
+            'week': week['week'],
+            'operations': operations,
+            'operations_per_second': round(operations / week['seconds'], 1) if week['seconds'] else 0.0,
+            'average_chores_kb': round(statistics.mean(household.chores_size() for household in self.households)
+                                       / 1024, 1),
+            'latency_ms': {kind: {'p50': round(statistics.median(latencies) * 1000, 3),
+                                  'p95': round(_percentile(latencies, 0.95) * 1000, 3),
+                                  'count': len(latencies)}
+                           for kind, latencies in sorted(week['latencies'].items())},
+        }
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def print_report(report: dict) -> None:
+    kinds = list(OPERATIONS)
+    print(f"{report['households']} households over {report['days']} days")
+    print(f"{'week':>4} {'ops':>6} {'ops/s':>8} {'chores KB':>10} " +
+          ' '.join(f"{kind + ' p50/p95 ms':>24}" for kind in kinds))
+    for week in report['weeks']:
+        latencies = []
+        for kind in kinds:
+            latency = week['latency_ms'].get(kind)
+            latencies.append(f"{latency['p50']:>11.2f}/{latency['p95']:<12.2f}" if latency else f"{'-':>24}")
+        print(f"{week['week']:>4} {week['operations']:>6} {week['operations_per_second']:>8} "
+              f"{week['average_chores_kb']:>10} " + ' '.join(latencies))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate households using the Haus backend over months.")
+    parser.add_argument('--households', type=int, default=3)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--occupants', type=int, default=5)
+    parser.add_argument('--chores', type=int, default=40, help="chores in each household at the start")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='', help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    saved_filepaths = (DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            simulation = Simulation(directory, args.households, args.days, args.occupants, args.chores, args.seed)
+            report = simulation.run()
+    finally:
+        DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH = saved_filepaths
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+            file.write('\n')
+
+
+if __name__ == "__main__":
+    sys.exit(main())
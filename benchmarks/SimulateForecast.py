@@ -0,0 +1,106 @@
+"""
+Workload Forecast Simulation
+Author: Haus Team
+Date: 10/19/2026
+
+This file simulates months of activity in a synthetic household, day by day: occupants complete the chores
+due each day, new one-off chores are occasionally added, and repeating chores are renewed and assigned.
+It runs the same simulation with and without the workload forecast (see Forecast.py), and reports how
+evenly the work was spread across occupants and how long the simulation took.
+
+Balance is measured per week, on the minutes of the chores due that week:
+the spread is (most loaded - least loaded occupant) / average, and the simulation reports its mean.
+
+Usage: python benchmarks/SimulateForecast.py [days] [occupants] [chores]
+"""
+
+# fix import path
+import Context
+
+# modules
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import AutoAssign
+import DataInput
+import Forecast
+import SyntheticData
+from DataInput import CHORE_STATUS
+
+# first simulated day
+START = SyntheticData.TODAY
+
+# probability that a new one-off chore is added on a given day
+NEW_CHORE_PROBABILITY = 0.5
+
+
+def simulate(directory: str, days: int, occupants: int, chores: int, use_forecast: bool, seed: int = 0) -> dict:
+    """Simulate the household for the given number of days, and return its balance and runtime."""
+    SyntheticData.write_household(directory, occupants=occupants, chores=chores, seed=seed, today=START)
+    SyntheticData.use_household(directory)
+    Forecast.forecast.invalidate()
+    saved_use_forecast = AutoAssign.USE_FORECAST
+    AutoAssign.USE_FORECAST = use_forecast
+    DataInput.set_id_generator(DataInput.SequenceIdGenerator(f"sim{seed}"))
+    rng = random.Random(seed)
+    try:
+        start = time.perf_counter()
+        AutoAssign.assign_unassigned_chores(START)
+        for day in range(days):
+            today = START + timedelta(days=day)
+            # occupants complete what is due today (and anything left over from before the simulation)
+            due = list(DataInput.iter_chores(status=CHORE_STATUS.ASSIGNED, max_deadline_date=today))
+            for chore in due:
+                chore.status = CHORE_STATUS.COMPLETED
+                chore.completion_date = today
+            DataInput.save_chores(updated_chores=due)
+            if rng.random() < NEW_CHORE_PROBABILITY:
+                name, category = rng.choice(SyntheticData.CHORE_NAMES)
+                DataInput.new_chore_by_args(name, f"{name}, added on day {day}", category=category,
+                                            expected_duration=rng.choice([5, 10, 15, 20, 30, 45]),
+                                            deadline_date=today + timedelta(days=rng.randint(1, 7)))
+            # renews what was completed, then assigns everything unassigned
+            AutoAssign.renew_repeating_chores(today)
+        elapsed = time.perf_counter() - start
+    finally:
+        AutoAssign.USE_FORECAST = saved_use_forecast
+        DataInput.set_id_generator(None)
+    return {'seconds': elapsed, 'weekly_spread': weekly_spread(days, DataInput.get_user_ids())}
+
+
+def weekly_spread(days: int, user_ids: list[str]) -> float:
+    """Return the mean, over the simulated weeks, of (max - min) / mean minutes of the chores due per occupant."""
+    weeks = days // 7
+    minutes = [{user_id: 0 for user_id in user_ids} for _ in range(weeks)]
+    for chore in DataInput.iter_chores(min_deadline_date=START, max_deadline_date=START + timedelta(days=weeks * 7 - 1)):
+        if chore.assignee_id in minutes[0]:
+            minutes[(chore.deadline_date - START).days // 7][chore.assignee_id] += chore.expected_duration
+    spreads = []
+    for week in minutes:
+        mean = statistics.mean(week.values())
+        if mean:
+            spreads.append((max(week.values()) - min(week.values())) / mean)
+    return statistics.mean(spreads) if spreads else 0.0
+
+
+def main(days: int = 120, occupants: int = 8, chores: int = 80) -> None:
+    print(f"{days} days, {occupants} occupants, {chores} chores (forecast horizon: "
+          f"{Forecast.forecast.horizon_days} days)")
+    print(f"{'assignment':>16} {'seconds':>8} {'weekly spread':>14}")
+    saved_filepaths = (DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH)
+    try:
+        for use_forecast in (False, True):
+            with tempfile.TemporaryDirectory() as directory:
+                result = simulate(directory, days, occupants, chores, use_forecast)
+            label = 'with forecast' if use_forecast else 'current workload'
+            print(f"{label:>16} {result['seconds']:8.2f} {result['weekly_spread']:14.3f}")
+    finally:
+        DataInput.CHORES_FILEPATH, DataInput.OCCUPANTS_FILEPATH = saved_filepaths
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
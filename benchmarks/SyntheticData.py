@@ -0,0 +1,120 @@
+"""
+Synthetic Household Data
+Author: Haus Team
+Date: 10/19/2026
+
+This file generates chores and occupants CSV files of configurable size for benchmarks.
+The data is generated from a seeded random number generator, so runs are reproducible.
+"""
+
+# fix import path
+import Context
+
+# modules
+import csv
+import os
+import random
+from datetime import date, timedelta
+
+import DataInput
+from DataInput import CHORE_ATTRIBUTES, CHORE_STATUS, DATE_FORMAT
+
+# day the households are generated around
+TODAY = date(2024, 3, 15)
+
+# names to pick chores from, with their category
+CHORE_NAMES = [
+    ("Wash Dishes", "Kitchen"),
+    ("Clean the Fridge", "Kitchen"),
+    ("Take out the Trash", "General"),
+    ("Vacuum Living Room", "General"),
+    ("Dust the Furniture", "General"),
+    ("Clean the Bathroom", "Bathroom"),
+    ("Feed the Cats", "Pets"),
+    ("Water the Plants", "Garden"),
+    ("Rake the Leaves", "Garden"),
+    ("Dry Clothes", "Laundry"),
+]
+
+# frequencies to pick from, 0 (not repeating) being the most common
+FREQUENCIES = [0, 0, 1, 3, 7, 14]
+
+
+def write_household(directory: str,
+                    occupants: int = 5,
+                    chores: int = 100,
+                    history_depth: int = 0,
+                    seed: int = 0,
+                    today: date = TODAY) -> None:
+    """
+    Write a chores.csv and an occupants.csv to the directory.
+    occupants: number of occupants, with usernames occupant0, occupant1, ... and passwords password0, ...
+    chores: number of distinct chores. Each has one current instance, due within two weeks of today:
+        completed if its deadline has passed, otherwise assigned or unassigned.
+    history_depth: number of past, renewed instances of each repeating chore
+    """
+    rng = random.Random(seed)
+    occupant_ids = [_random_uid(rng) for _ in range(occupants)]
+    with open(os.path.join(directory, 'occupants.csv'), 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Occupant UID', 'Username', 'Password'])
+        for i, occupant_id in enumerate(occupant_ids):
+            writer.writerow([occupant_id, f"occupant{i}", f"password{i}"])
+
+    with open(os.path.join(directory, 'chores.csv'), 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=CHORE_ATTRIBUTES)
+        writer.writeheader()
+        for i in range(chores):
+            name, category = rng.choice(CHORE_NAMES)
+            frequency = rng.choice(FREQUENCIES)
+            duration = rng.choice([5, 10, 15, 20, 30, 45])
+            chore_id = _random_uid(rng)
+            deadline = today + timedelta(days=rng.randint(-14, 14))
+            assignee = rng.choice(occupant_ids) if occupant_ids else ""
+
+            # past instances of repeating chores, oldest first, as renew_repeating_chores leaves them
+            depth = history_depth if frequency else 0
+            for repetition in range(depth):
+                past_deadline = deadline - timedelta(days=frequency * (depth - repetition))
+                writer.writerow(_chore_row(chore_id if repetition == 0 else f"{chore_id}({repetition})",
+                                           name, i, category, duration, CHORE_STATUS.RENEWED, assignee,
+                                           past_deadline, frequency, past_deadline))
+
+            # current instance
+            if deadline < today:
+                status = CHORE_STATUS.COMPLETED
+            else:
+                status = rng.choice([CHORE_STATUS.ASSIGNED, CHORE_STATUS.ASSIGNED, CHORE_STATUS.UNASSIGNED])
+            writer.writerow(_chore_row(chore_id if depth == 0 else f"{chore_id}({depth})",
+                                       name, i, category, duration, status,
+                                       assignee if status != CHORE_STATUS.UNASSIGNED else "",
+                                       deadline, frequency, deadline if status == CHORE_STATUS.COMPLETED else None))
+
+
+def use_household(directory: str) -> None:
+    """Point the DataInput module at the CSV files in the given directory."""
+    DataInput.CHORES_FILEPATH = os.path.join(directory, 'chores.csv')
+    DataInput.OCCUPANTS_FILEPATH = os.path.join(directory, 'occupants.csv')
+
+
+def _random_uid(rng: random.Random) -> str:
+    """Return a UUID-formatted id drawn from the seeded random number generator."""
+    digits = f"{rng.getrandbits(128):032x}"
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def _chore_row(chore_id: str, name: str, number: int, category: str, duration: int, status: CHORE_STATUS,
+               assignee: str, deadline: date, frequency: int, completion: date = None) -> dict:
+    """Return a chores CSV row with the given attributes."""
+    return {
+        "Chore ID": chore_id,
+        "Chore Name": name,
+        "Description": f"{name}, number {number}",
+        "Category": category,
+        "Expected Duration": duration,
+        "Status": status.value,
+        "Assignee ID": assignee,
+        "Deadline Date": deadline.strftime(DATE_FORMAT),
+        "Frequency": frequency,
+        "Completion Date": completion.strftime(DATE_FORMAT) if completion else "",
+    }
@@ -6,24 +6,211 @@ This file contains the flask integration between the frontend and backend
 
 """
 
-from flask import Flask, send_from_directory, jsonify, session, request
+from flask import Flask, send_from_directory, jsonify, session, request, Response, stream_with_context, g
 import DataInput
 import AutoAssign
+import ChoreViews
 import login
+import Metrics
+import Profiler
+import Recurrence
+import Replication
+import ResponseEncoding
+import SearchIndex
+import StaticJSON
+import hmac
+import math
 import os
+import time
 
 # Create an instance
 app = Flask(__name__, static_folder="Frontend/")
 
-# Create a secret key so that we can have session info
-app.secret_key = os.urandom(24)
+# Serialize the JSON replies with orjson when it is installed
+app.json = ResponseEncoding.FastJSONProvider(app)
+
+# Create a secret key so that we can have session info (the same key signs the session tokens, see login.py)
+app.secret_key = login.SECRET_KEY
+
+# Token the /admin and /metrics endpoints require, as the X-Haus-Admin-Token header (HAUS_ADMIN_TOKEN).
+# While profiling or metrics are enabled, they refuse every request without one; otherwise,
+# without a token, they only answer requests from this machine.
+ADMIN_TOKEN = os.environ.get('HAUS_ADMIN_TOKEN', '')
+
+# Clean up after writers which were killed while writing the data files
+try:
+    DataInput.recover_interrupted_writes(os.path.dirname(DataInput.CHORES_FILEPATH) or '.')
+except FileNotFoundError:
+    pass  # no household data yet
+
+# In follower mode (HAUS_FOLLOW), chores and users are served from a replica following the primary's change log
+replica = Replication.start_follower()
+
+# Keep static JSON copies of the frequent replies up to date, for a static file server (HAUS_STATIC_JSON)
+if StaticJSON.STATIC_JSON:
+    StaticJSON.snapshots.start()
+
+@app.before_request
+def before_request():
+    # remember when the request started, to record its latency
+    if Metrics.is_enabled():
+        g.request_start = time.perf_counter()
+    # capture stack samples of the request if profiling is on and it was picked
+    if Profiler.should_profile(request.headers):
+        g.profiler = Profiler.RequestProfiler(request.method, request.path)
 
 @app.after_request
 def after_request(response):
     response.headers["Access-Control-Allow-Origin"] = "*" # <- You can change "*" for a domain for example "http://localhost"
     response.headers["Access-Control-Allow-Credentials"] = "true"
     response.headers["Access-Control-Allow-Methods"] = "POST, GET, OPTIONS, PUT, DELETE"
-    response.headers["Access-Control-Allow-Headers"] = "Accept, Content-Type, Content-Length, Accept-Encoding, X-CSRF-Token, Authorization"
+    response.headers["Access-Control-Allow-Headers"] = "Accept, Content-Type, Content-Length, Accept-Encoding, X-CSRF-Token, Authorization, X-Haus-Min-Sequence"
+    response.headers["Access-Control-Expose-Headers"] = "X-Haus-Sequence"
+    # tell the client where its writes are in the change log, so it can read them back from a replica
+    sequence = DataInput.take_change_sequence()
+    if sequence is not None:
+        response.headers["X-Haus-Sequence"] = str(sequence)
+    # compress large (and streamed) JSON replies, if the client accepts it
+    ResponseEncoding.compress_response(response, request.headers.get("Accept-Encoding", ""))
+    if 'request_start' in g:
+        record_request_latency(response, g.request_start)
+    if 'profiler' in g:
+        finish_request_profile(response, g.profiler)
+    return response
+
+def record_request_latency(response, start):
+    """
+    Record the latency of the current request in the per-endpoint histogram.
+    Streamed responses are only complete once they have been sent, so they are recorded on close.
+    """
+    labels = {'endpoint': request.endpoint or 'unknown', 'method': request.method, 'status': response.status_code}
+    if response.is_streamed:
+        response.call_on_close(lambda: Metrics.REQUEST_SECONDS.observe(time.perf_counter() - start, **labels))
+    else:
+        Metrics.REQUEST_SECONDS.observe(time.perf_counter() - start, **labels)
+
+def replica_behind():
+    """
+    In follower mode, wait for the replica to reach the sequence number the client asked for
+    (the X-Haus-Min-Sequence header or 'min_sequence' form attribute, from the X-Haus-Sequence of its write).
+    Returns an error reply if it does not in time, or None.
+    """
+    min_sequence = request.headers.get("X-Haus-Min-Sequence") or request.form.get('min_sequence')
+    if not min_sequence:
+        return None
+    if replica.wait_for(int(min_sequence)):
+        return None
+    reply = jsonify({'error': 'the replica has not caught up with the write yet'})
+    reply.headers["Retry-After"] = "1"
+    return reply, 503
+
+def admin_forbidden():
+    """
+    Return an error reply if the current request may not use the /admin endpoints, or None.
+    With ADMIN_TOKEN set, the request must carry it. While profiling or metrics are enabled, ADMIN_TOKEN is required,
+    as behind a reverse proxy on this machine every request would seem to come from this machine.
+    Otherwise, without ADMIN_TOKEN, the request must come from this machine.
+    """
+    if ADMIN_TOKEN:
+        allowed = hmac.compare_digest(request.headers.get("X-Haus-Admin-Token", "").encode(), ADMIN_TOKEN.encode())
+    elif Profiler.enabled or Metrics.is_enabled():
+        allowed = False
+    else:
+        allowed = request.remote_addr in ('127.0.0.1', '::1')
+    if allowed:
+        return None
+    return jsonify({'error': 'forbidden'}), 403
+
+def finish_request_profile(response, profiler):
+    """
+    Stop profiling the current request and tell the client which profile it was.
+    Streamed responses are only complete once they have been sent, so they are profiled until closed.
+    """
+    if response.is_streamed:
+        response.call_on_close(profiler.finish)
+    else:
+        response.headers["X-Haus-Profile-Id"] = profiler.finish().id
+
+# Endpoint for Prometheus to scrape the instrumentation metrics
+@app.route('/metrics', methods=['GET'])
+def flask_metrics():
+    """
+    Flask endpoint exposing the instrumentation metrics. Takes a GET request.
+    Metrics are only recorded when enabled (HAUS_METRICS=1), otherwise they stay empty.
+    Only available to the admin (see admin_forbidden): the scraper sends ADMIN_TOKEN as the X-Haus-Admin-Token header.
+
+    Input:
+        GET request
+    Output:
+        Metrics in the Prometheus text exposition format
+    """
+    error = admin_forbidden()
+    if error is not None:
+        return error
+    return Response(Metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+# Endpoint for listing the slowest profiled requests
+@app.route('/admin/profiles', methods=['GET'])
+def flask_list_profiles():
+    """
+    Flask endpoint listing the profiles of the slowest profiled requests. Takes a GET request.
+    Only available when profiling is enabled (HAUS_PROFILING=1), to the admin (see admin_forbidden).
+
+    Input:
+        GET request
+    Output:
+        JSON reply with a list of profile summaries, slowest first. Looks like:
+        [
+            {'id': *value*, 'method': *value*, 'path': *value*, 'started': *value*,
+             'duration_ms': *value*, 'samples': *value*},
+            ...
+        ]
+    """
+    error = admin_forbidden()
+    if error is not None:
+        return error
+    if not Profiler.enabled:
+        return jsonify({'error': 'profiling is disabled'}), 404
+    return jsonify([profile.summary() for profile in Profiler.slowest.profiles()])
+
+# Endpoint for retrieving one profile
+@app.route('/admin/profiles/<profile_id>', methods=['GET'])
+def flask_get_profile(profile_id):
+    """
+    Flask endpoint returning one of the slowest request profiles. Takes a GET request.
+    Only available to the admin (see admin_forbidden).
+
+    Input:
+        GET request, with the profile id in the URL
+    Output:
+        The stack samples in the collapsed-stack format, ready to be rendered as a flamegraph
+    """
+    error = admin_forbidden()
+    if error is not None:
+        return error
+    profile = Profiler.slowest.get(profile_id) if Profiler.enabled else None
+    if profile is None:
+        return jsonify({'error': 'profile not found'}), 404
+    return Response(profile.collapsed(), mimetype='text/plain')
+
+def request_token():
+    """
+    Return the session token sent with the current request, as 'Authorization: Bearer *token*'
+    or a 'token' form attribute, or None if there is none.
+    """
+    authorization = request.headers.get('Authorization', '')
+    if authorization.startswith('Bearer '):
+        return authorization[len('Bearer '):].strip()
+    return request.form.get('token') or None
+
+def too_many_attempts(reply, retry_after):
+    """
+    Return the reply with status 429 (Too Many Requests), telling the client how many seconds to wait.
+    """
+    reply['error'] = 'too many attempts, try again later'
+    response = jsonify(reply)
+    response.status_code = 429
+    response.headers['Retry-After'] = str(math.ceil(retry_after))
     return response
 
 # Endpoint for logging in as a user
@@ -40,6 +227,10 @@ def flask_login_user():
         JSON reply with 'user_exists', 'pass_valid', and 'userid' parameters
         user_exists: False if the user doesn't exist, True if the user does exist.
         pass_valid: True if the password matches the user's, False otherwise.
+        token: a signed session token, if the password is valid. Send it with later requests
+            (as 'Authorization: Bearer *token*' or a 'token' form attribute) instead of the username.
+        Too many attempts for the username, or from the client, are refused with status 429
+        and a Retry-After header, without checking the password (see login.throttle_password_attempt).
     """
     reply = {
         'user_exists': False,
@@ -51,6 +242,11 @@ def flask_login_user():
     username = request.form['user']
     password = request.form['pass']
 
+    # refuse excess attempts before any (costly) verification
+    retry_after = login.throttle_password_attempt(username, request.remote_addr)
+    if retry_after:
+        return too_many_attempts(reply, retry_after)
+
     # Check if user exists
     if not login.verify_user_exists(username, DataInput.OCCUPANTS_FILEPATH):
         return jsonify(reply)
@@ -63,6 +259,8 @@ def flask_login_user():
         session['user'] = username
         reply['user'] = username
         reply['pass_valid'] = True
+        user_id = DataInput.retrieve_occupant_uid_from_username(username, DataInput.OCCUPANTS_FILEPATH)
+        reply['token'] = login.issue_token(user_id)
         return jsonify(reply)
     else:
         return jsonify(reply)
@@ -103,6 +301,12 @@ def flask_serve_users():
         JSON reply with list of users and IDs
     """
     reply = []
+    if replica is not None:
+        error = replica_behind()
+        if error is not None:
+            return error
+        reply = [{"name": name, "UserID": uid} for uid, name in replica.occupants_names_and_uids().items()]
+        return jsonify(reply)
     occupants_dict = DataInput.retrieve_occupants_names_and_uids(DataInput.OCCUPANTS_FILEPATH)
     reply = [{"name": username, "UserID": uid} for uid, username in occupants_dict.items()]
     return jsonify(reply)
@@ -116,13 +320,27 @@ def flask_logout_user():
 @app.route('/user/delete', methods=['POST'])
 def flask_delete_user():
     """
-    
+    Flask endpoint for removing an occupant from the household. Takes a POST request with a form
+    attribute with a json/dict of keys 'user', 'pass'.
+    The occupant's open chores are handed to the remaining occupants.
+
+    Output:
+        JSON reply with 'success' parameter
+        success: True if the credentials were valid and the occupant was removed
+        Too many attempts are refused with status 429, like in /user/login.
     """
     if request.method == 'POST':
         username = request.form['user']
         password = request.form['pass']
-        delete_success = login.delete_user(username, password, DataInput.OCCUPANTS_FILEPATH)
+        retry_after = login.throttle_password_attempt(username, request.remote_addr)
+        if retry_after:
+            return too_many_attempts({'success': False}, retry_after)
+        user_id = DataInput.retrieve_occupant_uid_from_username(username, DataInput.OCCUPANTS_FILEPATH)
+        # verify the credentials, then remove the occupant and reassign their chores
+        delete_success = login.log_in_user(username, password, DataInput.OCCUPANTS_FILEPATH) \
+            and AutoAssign.offboard_occupant(username)
         if delete_success:
+            # their tokens are rejected by every process, now that they are no longer in the occupants CSV
             session["user_id"] = None
         return jsonify({'success': delete_success})
 
@@ -146,9 +364,11 @@ def flask_complete_chore():
         return jsonify(reply)
     
     chore_id = request.form['chore_id']
-    DataInput.set_chore_complete(chore_id)
-    AutoAssign.renew_repeating_chores()
-    AutoAssign.assign_unassigned_chores()
+    # completion, renewal and assignment all work with the same date
+    with DataInput.pinned_today():
+        DataInput.set_chore_complete(chore_id)
+        AutoAssign.renew_repeating_chores()
+        AutoAssign.assign_unassigned_chores()
     
     reply['success'] = True
     return jsonify(reply)
@@ -163,6 +383,7 @@ def flask_create_chore():
     Input:
         POST form request with 'Chore ID'
         Chore ID: The ID of the chore to be marked as complete
+        Recurrence (optional): a recurrence rule such as 'weekly:mon,thu' (see Recurrence.py)
     Output:
         JSON reply with 'success' parameter
         success: True if the chore completion succeeded, False if it failed
@@ -170,13 +391,22 @@ def flask_create_chore():
     reply = {'success': False}
     if request.method != 'POST':
         return jsonify(reply)
-    DataInput.new_chore_by_args(
-        name = request.form['Chore Name'],
-        desc = request.form['Description'],
-        frequency = int(request.form['Frequency']),
-        expected_duration = int(request.form['Expected Duration'])
-    )
-    AutoAssign.assign_unassigned_chores()
+    recurrence = request.form.get('Recurrence', '')
+    if recurrence:
+        try:
+            recurrence = str(Recurrence.RecurrenceRule.parse(recurrence))
+        except ValueError as error:
+            reply['error'] = str(error)
+            return jsonify(reply), 400
+    with DataInput.pinned_today():
+        DataInput.new_chore_by_args(
+            name = request.form['Chore Name'],
+            desc = request.form['Description'],
+            frequency = int(request.form['Frequency']),
+            expected_duration = int(request.form['Expected Duration']),
+            recurrence = recurrence
+        )
+        AutoAssign.assign_unassigned_chores()
 
     reply['success'] = True
     return jsonify(reply)
@@ -189,8 +419,14 @@ def flask_serve_chores():
     attribute with a json/dict of keys 'user'
 
     Input:
-        POST form request with 'user'
-        user: The username of the provided user. Leave empty if fetching all chores
+        POST form request with 'user' or a session token, and optionally 'format'
+        token: The session token from /user/login, as 'Authorization: Bearer *token*' or a form attribute.
+            Serves the chores of its occupant, without looking up the username.
+        user: The username of the provided user, if there is no token. Leave empty if fetching all chores
+        category (optional): only serve the chores of this category
+        format: 'objects' (the default) or 'columnar'
+        min_sequence (optional, or the X-Haus-Min-Sequence header): on a follower, the X-Haus-Sequence
+            of a write the chores must reflect (503 if the replica does not catch up in time)
     Output:
         JSON reply with a list of the chores assigned to the user. Looks like:
         [
@@ -208,21 +444,90 @@ def flask_serve_chores():
             },
             ...
         ]
+        In the columnar format, the column names are only sent once, and each chore is a list of values:
+        {
+            'columns': ['Chore ID', 'Chore Name', ...],
+            'rows': [[*value*, *value*, ...], ...]
+        }
+        The chores of a user are sorted by deadline (those without one last), all chores are in stored order.
+        Large replies are compressed with gzip (or brotli) if the request's Accept-Encoding allows it.
     """
     reply = []
     if request.method != 'POST':
         return jsonify(reply)
     
-    username = request.form['user']
-    
-    if username:
-        userid = DataInput.retrieve_occupant_uid_from_username(username, DataInput.OCCUPANTS_FILEPATH)
+    reply_format = request.form.get('format', 'objects')
+    if reply_format not in ResponseEncoding.FORMATS:
+        return jsonify({'error': f"Unknown format {reply_format!r}"}), 400
+
+    # followers read from their replica, once it holds the writes the client asked to see
+    source = DataInput
+    if replica is not None:
+        error = replica_behind()
+        if error is not None:
+            return error
+        source = replica
+
+    token = request_token()
+    if token is not None:
+        userid = login.verify_token(token)
+        if userid is None:
+            return jsonify({'error': 'invalid or expired token'}), 401
+    elif request.form['user'] and replica is not None:
+        userid = replica.retrieve_occupant_uid_from_username(request.form['user'])
+    elif request.form['user']:
+        userid = DataInput.retrieve_occupant_uid_from_username(request.form['user'], DataInput.OCCUPANTS_FILEPATH)
     else:
         userid = None
     
-    chores = DataInput.get_chores_by_filters(assignee_id=userid, status=DataInput.CHORE_STATUS.ASSIGNED)
-    reply = [{key: chore.to_csv_row()[key] for key in DataInput.CHORE_ATTRIBUTES} for chore in chores]
-    return jsonify(reply)
+    category = request.form.get('category') or None
+    if userid is not None and replica is None:
+        # the occupant's open chores are kept sorted by deadline, see ChoreViews.py
+        chores = ChoreViews.views.open_chores(userid, category)
+    else:
+        chores = source.iter_chores(assignee_id=userid, status=DataInput.CHORE_STATUS.ASSIGNED, category=category)
+    rows = (chore.to_csv_row() for chore in chores)
+    if userid is not None and replica is not None:
+        rows = sorted(rows, key=ChoreViews.deadline_order)
+
+    # stream the JSON a few chores at a time, so the full list is never held in memory
+    if reply_format == 'columnar':
+        reply_stream = ResponseEncoding.stream_columnar(DataInput.CHORE_ATTRIBUTES, rows)
+    else:
+        reply_stream = ResponseEncoding.stream_objects(rows)
+    return Response(stream_with_context(reply_stream), mimetype='application/json')
+
+# Endpoint for searching chores
+@app.route('/chore/search', methods=['POST'])
+def flask_search_chores():
+    """
+    Flask endpoint for finding chores by the words in their name, description and category.
+    Takes a POST request with a form attribute with a json/dict of keys 'q', 'page' and 'per_page'.
+
+    Input:
+        POST form request with 'q', and optionally 'page' and 'per_page'
+        q: the words to search for. Every word must match the start of a word of the chore
+        page: which page of results to return, from 1 (the default)
+        per_page: how many chores per page, at most 100 (20 if not given)
+    Output:
+        JSON reply with 'total' (the number of matching chores), 'page', 'per_page' and 'results',
+        the chores of the page, best match first, each with its 'Score' besides the chore attributes
+    """
+    try:
+        page = int(request.form.get('page', 1))
+        per_page = int(request.form.get('per_page', 20))
+    except ValueError:
+        return jsonify({'error': "'page' and 'per_page' must be numbers"}), 400
+    if page < 1 or not 1 <= per_page <= 100:
+        return jsonify({'error': "'page' must be at least 1, and 'per_page' between 1 and 100"}), 400
+
+    total, matches = SearchIndex.index.search(request.form.get('q', ''), limit=per_page, offset=(page - 1) * per_page)
+    results = []
+    for chore_id, score in matches:
+        chore = DataInput.get_chore_by_id(chore_id)
+        if chore is not None:  # removed by another process since it was indexed
+            results.append(dict(chore.to_csv_row(), Score=score))
+    return jsonify({'total': total, 'page': page, 'per_page': per_page, 'results': results})
 
 # Endpoint for autoassigning chores
 @app.route('/chore/assign', methods=['POST', 'GET'])
@@ -240,6 +545,180 @@ def flask_assign_chores():
         AutoAssign.assign_unassigned_chores()
         return jsonify(reply)
 
+# Endpoint for planning repeating chores ahead of time
+@app.route('/chore/plan', methods=['POST'])
+def flask_plan_chores():
+    """
+    Flask endpoint storing (and assigning) the upcoming instances of every repeating chore.
+    Takes a POST request with a form attribute 'days'.
+
+    Input:
+        POST form request with 'days'
+        days: how many days ahead to plan (7 if not given)
+    Output:
+        JSON reply with 'success' and 'planned' parameters
+        planned: the number of chore instances added
+    """
+    with DataInput.pinned_today():
+        planned = Recurrence.materialize_upcoming(int(request.form.get('days', 7)))
+        if planned:
+            AutoAssign.assign_unassigned_chores()
+    return jsonify({'success': True, 'planned': len(planned)})
+
+class BatchReads:
+    """
+    The data read by the operations of a /batch request. Chore reads see the version of the chores CSV pinned
+    for the batch (see DataInput.snapshot_reads), the occupants are read once from the occupants CSV,
+    and the chores served to each user are read once and shared by the operations.
+    The writes of the batch are only committed after its last operation, so the reads never see them:
+    a chore/serve after a chore/complete of the same batch still lists the chore as assigned.
+    """
+
+    def __init__(self):
+        self._occupants = None
+        self._user_ids = None
+        self._assigned_chores = {}
+
+    def occupants(self) -> dict[str, str]:
+        if self._occupants is None:
+            self._occupants = DataInput.retrieve_occupants_names_and_uids(DataInput.OCCUPANTS_FILEPATH)
+        return self._occupants
+
+    def users(self) -> list[dict]:
+        return [{"name": username, "UserID": uid} for uid, username in self.occupants().items()]
+
+    def user_id(self, username: str) -> str:
+        if self._user_ids is None:
+            self._user_ids = {name: uid for uid, name in self.occupants().items()}
+        if username not in self._user_ids:
+            raise ValueError(f"Unknown user {username!r}")
+        return self._user_ids[username]
+
+    def assigned_chores(self, user_id) -> list[dict]:
+        """Return the CSV rows of the chores assigned to the user (to anyone if user_id is None)."""
+        if user_id not in self._assigned_chores:
+            if user_id is None:
+                chores = DataInput.iter_chores(status=DataInput.CHORE_STATUS.ASSIGNED)
+            else:
+                # the occupant's open chores are kept sorted by deadline, as /chore/serve serves them
+                chores = ChoreViews.views.open_chores(user_id)
+            self._assigned_chores[user_id] = [chore.to_csv_row() for chore in chores]
+        return self._assigned_chores[user_id]
+
+
+def batch_serve_users(reads: BatchReads, operation: dict):
+    return reads.users()
+
+def batch_serve_chores(reads: BatchReads, operation: dict):
+    token = operation.get('token') or request_token()
+    username = operation.get('user', '')
+    if token is not None:
+        user_id = login.verify_token(token)
+        if user_id is None:
+            raise ValueError("invalid or expired token")
+    else:
+        user_id = reads.user_id(username) if username else None
+    rows = reads.assigned_chores(user_id)
+    reply_format = operation.get('format', 'objects')
+    if reply_format not in ResponseEncoding.FORMATS:
+        raise ValueError(f"Unknown format {reply_format!r}")
+    return ResponseEncoding.columnar(DataInput.CHORE_ATTRIBUTES, rows) if reply_format == 'columnar' else rows
+
+def batch_complete_chore(reads: BatchReads, operation: dict):
+    DataInput.set_chore_complete(operation['chore_id'])
+
+def batch_create_chore(reads: BatchReads, operation: dict):
+    recurrence = operation.get('Recurrence', '')
+    if recurrence:
+        recurrence = str(Recurrence.RecurrenceRule.parse(recurrence))
+    DataInput.new_chore_by_args(
+        name = operation['Chore Name'],
+        desc = operation['Description'],
+        frequency = int(operation['Frequency']),
+        expected_duration = int(operation['Expected Duration']),
+        recurrence = recurrence
+    )
+
+# operations accepted by /batch, with the fields they take (like the form of the matching endpoint)
+BATCH_OPERATIONS = {
+    'user/serve': batch_serve_users,
+    'chore/serve': batch_serve_chores,
+    'chore/complete': batch_complete_chore,
+    'chore/create': batch_create_chore,
+}
+
+# Endpoint for running several operations in one request
+@app.route('/batch', methods=['POST'])
+def flask_batch():
+    """
+    Flask endpoint running a list of operations in one round trip. Takes a POST request with a JSON body:
+    {'operations': [{'op': *operation*, *field*: *value*, ...}, ...]}
+    The operations, and the fields they take, are those of the matching endpoints:
+        user/serve
+        chore/serve: 'user' (leave empty for the chores of everyone) or 'token', 'format' (optional)
+    A session token sent as 'Authorization: Bearer *token*' applies to every chore/serve operation.
+        chore/complete: 'chore_id'
+        chore/create: 'Chore Name', 'Description', 'Frequency', 'Expected Duration', 'Recurrence' (optional)
+
+    Every operation reads the data as it was when the batch started, so reads do not see the writes of
+    earlier operations: a chore/serve after a chore/complete of the same batch still lists the completed
+    chore, and a chore/create is not served until the next request. To read the result of a write,
+    send the read in a later request. The writes are all committed in a single write of the chores CSV after
+    the last operation; then repeating chores are renewed and unassigned chores assigned, once for the whole batch.
+
+    Output:
+        JSON reply with 'success' and 'results' parameters
+        results: one dict per operation, in order, with 'success' and either 'result' (what the matching
+        endpoint replies, for reads) or 'error'
+    """
+    body = request.get_json(silent=True) or {}
+    operations = body.get('operations')
+    if not isinstance(operations, list):
+        return jsonify({'success': False, 'error': "expected a JSON body with a list of 'operations'"}), 400
+
+    results = []
+    # (operation, result, first and last+1 position of the operation's writes in the batch)
+    pending = []
+    with DataInput.pinned_today():
+        reads = BatchReads()
+        with DataInput.snapshot_reads(), DataInput.batched_chore_writes() as writes:
+            for operation in operations:
+                result = {'success': False}
+                handler = BATCH_OPERATIONS.get(operation.get('op')) if isinstance(operation, dict) else None
+                start = writes.mark()
+                if handler is None:
+                    result['error'] = f"Unknown operation {operation!r}"
+                else:
+                    try:
+                        value = handler(reads, operation)
+                        result['success'] = True
+                        if value is not None:
+                            result['result'] = value
+                    except KeyError as error:
+                        result['error'] = f"Missing field {error}"
+                    except ValueError as error:
+                        result['error'] = str(error)
+                results.append(result)
+                pending.append((operation, result, start, writes.mark()))
+        # the writes' own errors are only known once they are committed
+        wrote = completed = False
+        for operation, result, start, end in pending:
+            if start == end:
+                continue
+            error = writes.error_since(start, end)
+            if error is not None:
+                result['success'] = False
+                result['error'] = str(error)
+            elif result['success']:
+                wrote = True
+                completed = completed or operation['op'] == 'chore/complete'
+        # renewing repeating chores also assigns the unassigned ones
+        if completed:
+            AutoAssign.renew_repeating_chores()
+        elif wrote:
+            AutoAssign.assign_unassigned_chores()
+    return jsonify({'success': True, 'results': results})
+
 # Occasionally used in prod environments when you want Flask to serve your React
 # @app.route('/')
 # def serve():
@@ -11,6 +11,36 @@ Outputs:
 - Status of log-in attempt (either successful or unsuccessful)
 """
 import DataInput
+import Metrics
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Key signing the session tokens. Set HAUS_SECRET_KEY so that every server process (and restart) accepts the
+# same tokens; otherwise a random key is made, and tokens are only valid in the process which issued them.
+SECRET_KEY = os.environ.get('HAUS_SECRET_KEY', '').encode() or os.urandom(32)
+
+# How long a session token is valid for, in seconds
+TOKEN_LIFETIME_SECONDS = int(os.environ.get('HAUS_TOKEN_LIFETIME_SECONDS', 7 * 24 * 3600))
+
+# Password attempts (logging in, deleting an account) allowed in a burst, and regained per minute afterwards:
+# per username, against guessing one occupant's password...
+USERNAME_ATTEMPTS_BURST = int(os.environ.get('HAUS_USERNAME_ATTEMPTS_BURST', 10))
+USERNAME_ATTEMPTS_PER_MINUTE = float(os.environ.get('HAUS_USERNAME_ATTEMPTS_PER_MINUTE', 5))
+# ...and per client address, against trying many usernames (higher, as a household may share an address)
+CLIENT_ATTEMPTS_BURST = int(os.environ.get('HAUS_CLIENT_ATTEMPTS_BURST', 30))
+CLIENT_ATTEMPTS_PER_MINUTE = float(os.environ.get('HAUS_CLIENT_ATTEMPTS_PER_MINUTE', 20))
+# Most usernames or clients tracked by each throttle: the least recently seen are forgotten first
+THROTTLE_MAX_KEYS = int(os.environ.get('HAUS_THROTTLE_MAX_KEYS', 10000))
+
+# Signature of the occupants CSV, and the UIDs of the occupants it lists: only their tokens are accepted,
+# so an occupant removed by any process loses their tokens in every process
+_occupant_ids = (None, frozenset())
+_occupant_ids_lock = threading.Lock()
 
 def create_user(username, password, occupant_filepath):
     """Verifies that the user doesn't already exist, then adds to the haus. 
@@ -71,4 +101,121 @@ def log_in_user(username, password, occupant_filepath):
 def verify_user_exists(username, occupant_filepath):
     """Returns True if a username belongs to a user in the haus, False otherwise"""
     current_usernames = DataInput.get_username_list(occupant_filepath)
-    return username in current_usernames
\ No newline at end of file
+    return username in current_usernames
+
+
+def issue_token(user_id, now=None):
+    """Returns a session token for the occupant with the given UID, valid for TOKEN_LIFETIME_SECONDS.
+    so it can be verified without a lookup: the occupants CSV is only read again once it changes (see verify_token).
+    so it can be verified without reading the occupants CSV.
+    """
+    expires = int((time.time() if now is None else now) + TOKEN_LIFETIME_SECONDS)
+    payload = f"{user_id}|{expires}".encode()
+    return _b64encode(payload) + "." + _b64encode(_sign(payload))
+
+
+def verify_token(token, now=None):
+    """Returns the occupant UID held by a session token,
+    or None if the token is malformed, was not signed with SECRET_KEY, has expired, or its occupant was removed
+    (is no longer in the occupants CSV).
+    """
+    try:
+        encoded_payload, encoded_signature = token.split(".")
+        payload = _b64decode(encoded_payload)
+        if not hmac.compare_digest(_b64decode(encoded_signature), _sign(payload)):
+            return None
+        user_id, expires = payload.decode().rsplit("|", 1)
+        expires = int(expires)
+    except (AttributeError, ValueError):
+        return None
+    if expires <= (time.time() if now is None else now):
+        return None
+    if user_id not in _current_occupant_ids():
+        return None
+    return user_id
+
+
+def _current_occupant_ids():
+    """Returns the UIDs of the occupants, only reading the occupants CSV again when it has changed."""
+    global _occupant_ids
+    try:
+        signature = DataInput._file_signature(DataInput.OCCUPANTS_FILEPATH)
+    except OSError:
+        return frozenset()
+    with _occupant_ids_lock:
+        cached_signature, user_ids = _occupant_ids
+        if signature != cached_signature:
+            user_ids = frozenset(DataInput.get_user_ids())
+            _occupant_ids = (signature, user_ids)
+    return user_ids
+
+
+def _sign(payload):
+    return hmac.new(SECRET_KEY, payload, hashlib.sha256).digest()
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class AttemptThrottle:
+    """Token buckets limiting the attempts made for each key (a username or a client address).
+    Each bucket holds up to burst attempts, is refilled at per_minute attempts per minute, and every attempt takes one.
+    Memory is bounded: beyond max_keys buckets, the least recently used is dropped. A dropped bucket
+    has usually been idle long enough to be full again, which is how a new bucket starts anyway.
+    """
+
+    def __init__(self, name, burst, per_minute, max_keys=THROTTLE_MAX_KEYS):
+        self.name = name
+        self.burst = burst
+        self.rate = per_minute / 60
+        self.max_keys = max_keys
+        # key -> (attempts left, time they were counted), least recently used first
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def attempt(self, key, now=None):
+        """Takes an attempt from the key's bucket.
+        Returns 0 if the attempt is allowed, otherwise the seconds until the next one will be.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            left, counted = self._buckets.pop(key, (self.burst, now))
+            left = min(self.burst, left + (now - counted) * self.rate)
+            if left >= 1:
+                left -= 1
+                wait = 0
+            else:
+                wait = (1 - left) / self.rate
+            self._buckets[key] = (left, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        if wait:
+            Metrics.LOGIN_THROTTLED.inc(throttle=self.name)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+username_throttle = AttemptThrottle('username', USERNAME_ATTEMPTS_BURST, USERNAME_ATTEMPTS_PER_MINUTE)
+client_throttle = AttemptThrottle('client', CLIENT_ATTEMPTS_BURST, CLIENT_ATTEMPTS_PER_MINUTE)
+
+
+def throttle_password_attempt(username, client, now=None):
+    """Counts a password attempt for the username from the client address, before the password is checked.
+    Returns 0 if the attempt may go ahead, otherwise the seconds the client should wait before trying again.
+    An attempt refused for the client does not count against the username.
+    """
+    wait = client_throttle.attempt(client, now)
+    if wait:
+        return wait
+    return username_throttle.attempt(username, now)
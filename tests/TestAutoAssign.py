@@ -0,0 +1,175 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the AutoAssign.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import os
+import shutil
+from datetime import date
+
+# module to test
+import AutoAssign
+import DataInput
+import Metrics
+from DataInput import CHORE_STATUS
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+# occupants of the mock database
+FRED = "95454c41-dc2f-451e-97b5-1d53b31cfa16"
+JOHN = "c55b4c05-2f74-4bfb-8077-03192dd74aab"
+MARIA = "0c9ef357-f312-4f85-93c0-16672244a2b5"
+
+
+class TestAutoAssign(unittest.TestCase):
+    """
+    This class provides unit tests for assigning chores and offboarding occupants.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        DataInput.set_clock(lambda: date(2024, 3, 15))
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        DataInput.set_clock(None)
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def test_user_workloads(self):
+        """
+        This method tests that the single-pass workloads match the workload of each user.
+        """
+        workloads = AutoAssign.user_workloads([FRED, JOHN, MARIA])
+        self.assertEqual(workloads, {FRED: 15, JOHN: 15, MARIA: 40})
+        for user_id, workload in workloads.items():
+            self.assertEqual(AutoAssign.user_workload(user_id), workload)
+        logging.debug("Passed test_user_workloads")
+
+    def test_user_category_workloads(self):
+        """
+        This method tests that the workloads per category are counted in the same pass as the workloads.
+        """
+        workloads, category_workloads = AutoAssign.user_category_workloads([FRED, JOHN, MARIA])
+        self.assertEqual(workloads, AutoAssign.user_workloads([FRED, JOHN, MARIA]))
+        self.assertEqual(category_workloads, {
+            "Kitchen": {FRED: 15}, "Pets": {JOHN: 15}, "Laundry": {MARIA: 20}, "General": {MARIA: 20}})
+        logging.debug("Passed test_user_category_workloads")
+
+    def test_balance_by_category(self):
+        """
+        This method tests that balancing by category spreads each category between users.
+        """
+        def kitchen_chores():
+            return [DataInput.Chore({"Chore ID": str(i), "Chore Name": "Dishes", "Description": "",
+                                     "Category": "Kitchen", "Expected Duration": "10", "Status": "unassigned",
+                                     "Assignee ID": "", "Deadline Date": "2024-03-15", "Frequency": "0",
+                                     "Completion Date": ""}) for i in range(3)]
+        # Fred has the least work overall, but all of the kitchen work so far
+        workloads = {FRED: 0, JOHN: 20, MARIA: 25}
+        chores = kitchen_chores()
+        AutoAssign.balance_chores(chores, workloads)
+        self.assertEqual([chore.assignee_id for chore in chores], [FRED, FRED, FRED])
+        chores = kitchen_chores()
+        AutoAssign.balance_chores(chores, workloads, {"Kitchen": {FRED: 15}})
+        # ties in the kitchen go to whoever has less work overall
+        self.assertEqual([chore.assignee_id for chore in chores], [JOHN, MARIA, JOHN])
+        # the caller's workloads are left alone
+        self.assertEqual(workloads, {FRED: 0, JOHN: 20, MARIA: 25})
+        logging.debug("Passed test_balance_by_category")
+
+    def test_offboard_occupant(self):
+        """
+        This method tests that a departing occupant's open chores are reassigned in a single write.
+        """
+        Metrics.enable()
+        Metrics.reset()
+        try:
+            self.assertTrue(AutoAssign.offboard_occupant("Maria Mariason"))
+            batches = Metrics.GROUP_COMMIT_BATCHES.get()
+        finally:
+            Metrics.enable(False)
+            Metrics.reset()
+        self.assertEqual(batches, 1)
+        self.assertNotIn(MARIA, DataInput.get_user_ids())
+        assignees = {chore.name: chore.assignee_id for chore in DataInput.iter_chores()}
+        # the longest chore goes first, to the least loaded occupant
+        self.assertEqual(assignees, {
+            "Start dishwasher": FRED,
+            "Feed the cats": JOHN,
+            "Dry clothes": JOHN,
+            "Vacuum": FRED,
+            "Dusting": JOHN,
+        })
+        self.assertFalse(AutoAssign.offboard_occupant("Maria Mariason"))
+        logging.debug("Passed test_offboard_occupant")
+
+    def test_offboard_last_occupants(self):
+        """
+        This method tests that open chores become unassigned when nobody is left to take them.
+        """
+        for name in ("Fred Fredson", "John Johnson", "Maria Mariason"):
+            AutoAssign.offboard_occupant(name)
+        chores = DataInput.get_chores_by_filters()
+        self.assertEqual([chore.status for chore in chores], [
+            CHORE_STATUS.UNASSIGNED, CHORE_STATUS.COMPLETED, CHORE_STATUS.UNASSIGNED,
+            CHORE_STATUS.UNASSIGNED, CHORE_STATUS.UNASSIGNED,
+        ])
+        # completed chores keep who did them
+        self.assertEqual(chores[1].assignee_id, JOHN)
+        logging.debug("Passed test_offboard_last_occupants")
+
+    def test_interrupted_offboarding(self):
+        """
+        This method tests that the chores of an occupant removed without the rebalance
+        are handed over by the next assignment.
+        """
+        DataInput.remove_user("Maria Mariason", DataInput.OCCUPANTS_FILEPATH)
+        self.assertTrue(DataInput.get_chores_by_filters(assignee_id=MARIA, status=CHORE_STATUS.ASSIGNED))
+        AutoAssign.assign_unassigned_chores()
+        self.assertEqual(DataInput.get_chores_by_filters(assignee_id=MARIA, status=CHORE_STATUS.ASSIGNED), [])
+        self.assertEqual(DataInput.get_chores_by_filters(status=CHORE_STATUS.UNASSIGNED), [])
+        logging.debug("Passed test_interrupted_offboarding")
+
+    def test_update_chores_if_unchanged(self):
+        """
+        This method tests that a chore changed since it was read is not overwritten.
+        """
+        read_chore = DataInput.get_chore_by_id("f79759a1-47ef-42c4-9879-c353c3329f50")
+        DataInput.set_chore_complete(read_chore.id)
+        released_chore = DataInput.get_chore_by_id("f79759a1-47ef-42c4-9879-c353c3329f50")
+        released_chore.status = CHORE_STATUS.UNASSIGNED
+        released_chore.assignee_id = None
+        skipped = DataInput.update_chores_if_unchanged([(read_chore, released_chore)])
+        self.assertEqual(skipped, [read_chore.id])
+        self.assertEqual(DataInput.get_chore_by_id(read_chore.id).status, CHORE_STATUS.COMPLETED)
+        logging.debug("Passed test_update_chores_if_unchanged")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the ChoreQuery.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import os
+import shutil
+from datetime import date
+
+# module to test
+import ChoreQuery
+import DataInput
+from ChoreQuery import Field, Query
+from DataInput import CHORE_STATUS
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+# occupants of the mock database
+MARIA = "0c9ef357-f312-4f85-93c0-16672244a2b5"
+
+TODAY = date(2024, 3, 15)
+
+
+class TestChoreQuery(unittest.TestCase):
+    """
+    This class provides unit tests for querying chores, through the indexes or by scanning.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        # the mock database is tiny: let the indexes be used whatever they select
+        self.saved_fraction = ChoreQuery.INDEX_MAX_FRACTION
+        ChoreQuery.INDEX_MAX_FRACTION = 1.0
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        ChoreQuery.INDEX_MAX_FRACTION = self.saved_fraction
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def names(self, query: Query) -> list[str]:
+        """Run the query through its plan, and check a scan of the chores CSV finds the same chores."""
+        chores = [chore.name for chore in query.run()]
+        ChoreQuery.INDEX_MAX_FRACTION = 0
+        try:
+            self.assertEqual([chore.name for chore in query.run()], chores)
+        finally:
+            ChoreQuery.INDEX_MAX_FRACTION = 1.0
+        return chores
+
+    def test_or_in_range(self):
+        """
+        This method tests alternatives, sets of values and ranges, read through the indexes.
+        """
+        overdue_or_today = Query().where(
+            Field('Status').in_([CHORE_STATUS.ASSIGNED, CHORE_STATUS.UNASSIGNED])
+            & ((Field('Deadline Date') < date(2024, 3, 12)) | (Field('Deadline Date') == TODAY)))
+        self.assertTrue(overdue_or_today.plan().uses_index)
+        self.assertEqual(self.names(overdue_or_today), ["Dry clothes", "Vacuum", "Dusting"])
+        self.assertEqual(overdue_or_today.explain(), "\n".join([
+            "Filter Status IN ('assigned', 'unassigned') AND "
+            "(Deadline Date < '2024-03-12' OR Deadline Date = '2024-03-15')",
+            "  Index intersection (3 chores)",
+            "    Hash index on Status IN ('assigned', 'unassigned') (4 chores)",
+            "    Index union (4 chores)",
+            "      Range index on Deadline Date < '2024-03-12' (2 chores)",
+            "      Range index on Deadline Date = '2024-03-15' (2 chores)",
+        ]))
+        completed = Query().where(Field('Completion Date').between(date(2024, 3, 1), TODAY))
+        self.assertEqual(self.names(completed), ["Feed the cats"])
+        # chores without a completion date never match a range on it
+        self.assertEqual(self.names(Query().where(Field('Completion Date') <= TODAY)), ["Feed the cats"])
+        by_id = Query().where(Field('Chore ID').in_(["575e2770-e278-4dc5-95a3-e918ecebdc31", "missing"]))
+        self.assertEqual(self.names(by_id), ["Dusting"])
+        logging.debug("Passed test_or_in_range")
+
+    def test_scan_fallback(self):
+        """
+        This method tests that filters the indexes cannot answer scan the chores CSV once.
+        """
+        # one alternative has no index, so the whole OR cannot use one
+        query = Query().where((Field('Category') == "Kitchen") | (Field('Expected Duration') >= 30))
+        plan = query.plan()
+        self.assertFalse(plan.uses_index)
+        self.assertIn("Scan chores CSV (the filter cannot use an index)", plan.explain())
+        self.assertEqual(self.names(query), ["Start dishwasher", "Vacuum"])
+        self.assertEqual(self.names(Query().where(Field('Assignee ID') != MARIA).limit(2)),
+                         ["Start dishwasher", "Feed the cats"])
+        # the indexes are not worth it when they select most chores
+        ChoreQuery.INDEX_MAX_FRACTION = 0.3
+        query = Query().where(Field('Status') == CHORE_STATUS.ASSIGNED)
+        self.assertIn("the indexes select 3 of 5 chores", query.explain())
+        with self.assertRaises(ValueError):
+            Field('Colour')
+        logging.debug("Passed test_scan_fallback")
+
+    def test_sort_limit(self):
+        """
+        This method tests sorting by several columns, in either direction, and limiting the results.
+        """
+        query = Query().order_by('Deadline Date').order_by('Expected Duration', descending=True)
+        self.assertEqual(self.names(query), ["Vacuum", "Dusting", "Start dishwasher", "Dry clothes", "Feed the cats"])
+        query = Query().where(Field('Category').in_(["General", "Laundry"])).order_by('Expected Duration').limit(2)
+        self.assertEqual(query.explain().splitlines()[:2], ["Limit 2", "  Sort by Expected Duration"])
+        self.assertEqual(self.names(query), ["Dry clothes", "Dusting"])
+        # chores without the date come last, whichever the direction
+        self.assertEqual(self.names(Query().order_by('Completion Date', descending=True).limit(2)),
+                         ["Feed the cats", "Start dishwasher"])
+        self.assertEqual(self.names(Query().limit(0)), [])
+        logging.debug("Passed test_sort_limit")
+
+    def test_indexes_follow_writes(self):
+        """
+        This method tests that plans use the indexes of the current chores CSV.
+        """
+        query = Query().where(Field('Category') == "Garden")
+        self.assertEqual(self.names(query), [])
+        chore = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+        chore.category = "Garden"
+        DataInput.update_chore_by_object(chore)
+        self.assertEqual(self.names(query), ["Vacuum"])
+        # a plan made before a write scans instead of reading rows that moved
+        plan = query.plan()
+        DataInput.new_chore_by_args("Weed", "Weed the beds", category="Garden")
+        self.assertEqual([row["Chore Name"] for row in plan.rows()], ["Vacuum", "Weed"])
+        logging.debug("Passed test_indexes_follow_writes")
+
+
+if __name__ == "__main__":
+    unittest.main()
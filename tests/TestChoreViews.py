@@ -0,0 +1,157 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the ChoreViews.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import os
+import shutil
+import threading
+from datetime import date
+
+# module to test
+import AutoAssign
+import ChoreViews
+import DataInput
+import flask_integration
+from DataInput import CHORE_STATUS
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+# occupants and chores of the mock database
+FRED = "95454c41-dc2f-451e-97b5-1d53b31cfa16"
+JOHN = "c55b4c05-2f74-4bfb-8077-03192dd74aab"
+MARIA = "0c9ef357-f312-4f85-93c0-16672244a2b5"
+DISHWASHER = "f79759a1-47ef-42c4-9879-c353c3329f50"
+DRY_CLOTHES = "9e4fe3a0-aa47-40e0-9efd-eb4f62c5f922"
+VACUUM = "7cb263c2-52f5-4077-971e-491d3d19ed29"
+DUSTING = "575e2770-e278-4dc5-95a3-e918ecebdc31"
+
+TODAY = date(2024, 3, 12)
+
+
+class TestChoreViews(unittest.TestCase):
+    """
+    This class provides unit tests for the views of the chores of every occupant.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        self.views = ChoreViews.OccupantChoreViews()
+        DataInput.register_chore_listener(self.views.chores_changed)
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        DataInput.unregister_chore_listener(self.views.chores_changed)
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def assert_views_match_csv(self):
+        """Check that the views hold what filtering the chores CSV finds, for every occupant."""
+        week_ago, next_week = AutoAssign.workload_window(TODAY)
+        for user_id in (FRED, JOHN, MARIA):
+            expected = sorted((chore.to_csv_row() for chore in
+                               DataInput.iter_chores(assignee_id=user_id, status=CHORE_STATUS.ASSIGNED)),
+                              key=ChoreViews.deadline_order)
+            self.assertEqual([chore.to_csv_row() for chore in self.views.open_chores(user_id)], expected)
+            chores = DataInput.get_chores_by_filters(assignee_id=user_id, min_deadline_date=week_ago,
+                                                     max_deadline_date=next_week)
+            self.assertEqual(self.views.workload(user_id, week_ago, next_week),
+                             sum(chore.expected_duration for chore in chores))
+
+    def test_open_chores(self):
+        """
+        This method tests that the open chores of an occupant are listed by deadline.
+        """
+        self.assertEqual([chore.id for chore in self.views.open_chores(MARIA)], [DUSTING, DRY_CLOTHES])
+        self.assertEqual([chore.id for chore in self.views.open_chores(MARIA, category="Laundry")], [DRY_CLOTHES])
+        self.assertEqual(self.views.open_chores(JOHN), [])
+        self.assert_views_match_csv()
+        # the endpoint serves the view
+        client = flask_integration.app.test_client()
+        served = client.post('/chore/serve', data={'user': 'Maria Mariason'}).get_json()
+        self.assertEqual([row['Chore ID'] for row in served], [DUSTING, DRY_CLOTHES])
+        logging.debug("Passed test_open_chores")
+
+    def test_follow_writes(self):
+        """
+        This method tests that assignments, completions and renewals move chores between the views,
+        without rebuilding them.
+        """
+        self.assert_views_match_csv()
+        self.assertEqual(self.views.rebuilds, 1)
+        # assignment
+        vacuum = DataInput.get_chore_by_id(VACUUM)
+        vacuum.status, vacuum.assignee_id = CHORE_STATUS.ASSIGNED, JOHN
+        DataInput.update_chore_by_object(vacuum)
+        self.assertEqual([chore.id for chore in self.views.open_chores(JOHN)], [VACUUM])
+        # completion
+        DataInput.set_chore_complete(DUSTING)
+        self.assertEqual([chore.id for chore in self.views.open_chores(MARIA)], [DRY_CLOTHES])
+        # renewal of the completed repeating chores, and assignment of the new instances
+        with DataInput.pinned_today():
+            AutoAssign.renew_repeating_chores(TODAY)
+            AutoAssign.assign_unassigned_chores(TODAY)
+        self.assert_views_match_csv()
+        self.assertEqual(self.views.rebuilds, 1)
+        # the workloads come from the views
+        self.assertEqual(AutoAssign.user_workloads([FRED, JOHN, MARIA], TODAY),
+                         self.views.workloads([FRED, JOHN, MARIA], *AutoAssign.workload_window(TODAY)))
+        # a write by another process is noticed
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        self.assertEqual([chore.id for chore in self.views.open_chores(MARIA)], [DUSTING, DRY_CLOTHES])
+        self.assertEqual(self.views.rebuilds, 2)
+        logging.debug("Passed test_follow_writes")
+
+    def test_pinned_reads(self):
+        """
+        This method tests that reads of an older version pinned by snapshot_reads are answered from it,
+        while the views stay at the newest version, without rebuilding them back and forth.
+        """
+        self.assertEqual([chore.id for chore in self.views.open_chores(MARIA)], [DUSTING, DRY_CLOTHES])
+        week_ago, next_week = AutoAssign.workload_window(TODAY)
+        workload = self.views.workload(MARIA, week_ago, next_week)
+        unpinned = []
+        with DataInput.snapshot_reads():
+            DataInput.set_chore_complete(DUSTING)
+            for _ in range(5):
+                # this thread reads the version pinned before the completion
+                self.assertEqual([chore.id for chore in self.views.open_chores(MARIA)], [DUSTING, DRY_CLOTHES])
+                self.assertEqual(self.views.workload(MARIA, week_ago, next_week), workload)
+                # other threads read the newest one
+                reader = threading.Thread(target=lambda: unpinned.append(
+                    [chore.id for chore in self.views.open_chores(MARIA)]))
+                reader.start()
+                reader.join()
+        self.assertEqual(unpinned, [[DRY_CLOTHES]] * 5)
+        self.assertEqual([chore.id for chore in self.views.open_chores(MARIA)], [DRY_CLOTHES])
+        self.assertEqual(self.views.rebuilds, 1)
+        logging.debug("Passed test_pinned_reads")
+
+
+if __name__ == "__main__":
+    unittest.main()
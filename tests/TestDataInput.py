@@ -16,9 +16,13 @@ import unittest
 from datetime import date
 import os
 import shutil
+import subprocess
+import sys
+import threading
 
 # module to test
 import DataInput
+import Metrics
 
 # logging configuration
 import logging
@@ -269,6 +273,51 @@ class TestGetFunctions(unittest.TestCase):
         self.assertEqual(ids_found, set(expected_ids))
         logging.debug("Passed test_get_chores_by_filters_max_deadline_date")
 
+    def test_get_chore_by_id_offset_index(self):
+        """
+        This method tests that get_chore_by_id keeps its sidecar offset index up to date,
+        including rows whose quoted fields contain commas and newlines.
+        """
+        chore: DataInput.Chore = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+        self.assertTrue(os.path.exists("./csvs/chores.csv" + DataInput.CHORE_INDEX_SUFFIX))
+        # rewrite the chores file, moving rows around
+        chore.description = "Vacuum all carpets,\nand \"rugs\""
+        DataInput.update_chore_by_object(chore)
+        new_chore: DataInput.Chore = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+        self.assertEqual(new_chore.description, "Vacuum all carpets,\nand \"rugs\"")
+        # the row following the multi-line row is still found
+        next_chore: DataInput.Chore = DataInput.get_chore_by_id("575e2770-e278-4dc5-95a3-e918ecebdc31")
+        self.assertEqual(next_chore.name, "Dusting")
+        # a stale sidecar file is ignored and rebuilt
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        old_chore: DataInput.Chore = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+        self.assertEqual(old_chore.description, "Vacuum all carpets and rugs")
+        logging.debug("Passed test_get_chore_by_id_offset_index")
+
+    def test_get_chore_by_id_missing(self):
+        """
+        This method tests that get_chore_by_id returns None for an unknown id
+        """
+        self.assertIsNone(DataInput.get_chore_by_id("not-a-real-chore-id"))
+        logging.debug("Passed test_get_chore_by_id_missing")
+
+    def test_iter_chores_limit(self):
+        """
+        This method tests that iter_chores filters lazily and stops after limit chores.
+        """
+        # there are three assigned chores in the mock chores file, only ask for two
+        chores = DataInput.iter_chores(status=DataInput.CHORE_STATUS.ASSIGNED, limit=2)
+        ids: list[str] = [chore.id for chore in chores]
+        self.assertEqual(ids, [
+            "f79759a1-47ef-42c4-9879-c353c3329f50",
+            "9e4fe3a0-aa47-40e0-9efd-eb4f62c5f922"
+        ])
+        # filters are combined with AND, as in get_chores_by_filters
+        ids = [chore.id for chore in DataInput.iter_chores(
+            assignee_id="0c9ef357-f312-4f85-93c0-16672244a2b5", max_deadline_date=date(2024, 3, 12))]
+        self.assertEqual(ids, ["575e2770-e278-4dc5-95a3-e918ecebdc31"])
+        logging.debug("Passed test_iter_chores_limit")
+
     def test_get_user_ids(self):
         """
         This method tests the get_user_ids function.
@@ -357,5 +406,337 @@ class TestSetFunctions(unittest.TestCase):
         self.assertEqual(updated_chore.assignee_id, "95454c41-dc2f-451e-97b5-1d53b31cfa16")
         logging.debug("Passed test_update_chore")
 
+    def test_new_chore_by_object_duplicate(self):
+        """
+        This method tests that adding a chore with an existing id fails without changing the chores file.
+        """
+        with open("./csvs/chores.csv", 'r') as file:
+            contents_before = file.read()
+        chore: DataInput.Chore = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+        with self.assertRaises(ValueError):
+            DataInput.new_chore_by_object(chore)
+        with open("./csvs/chores.csv", 'r') as file:
+            self.assertEqual(file.read(), contents_before)
+        # no temporary files are left behind
+        self.assertEqual([name for name in os.listdir("./csvs") if name.endswith(".tmp")], [])
+        logging.debug("Passed test_new_chore_by_object_duplicate")
+
+    def test_new_chore_by_object(self):
+        """
+        This method tests that a new chore is appended to the chores file.
+        """
+        chore: DataInput.Chore = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+        chore.id = ""
+        chore.name = "Mop"
+        DataInput.new_chore_by_object(chore)
+        self.assertTrue(chore.id)
+        all_chores: list[DataInput.Chore] = DataInput.get_chores_by_filters()
+        self.assertEqual(len(all_chores), 6)
+        self.assertEqual(all_chores[-1].id, chore.id)
+        self.assertEqual(all_chores[-1].name, "Mop")
+        logging.debug("Passed test_new_chore_by_object")
+
+    def test_set_clock(self):
+        """
+        This method tests that completion dates and default deadlines follow the clock set with set_clock.
+        """
+        DataInput.set_clock(lambda: date(2024, 3, 20))
+        try:
+            DataInput.set_chore_complete("f79759a1-47ef-42c4-9879-c353c3329f50")
+            DataInput.new_chore_by_args("Mop", "Mop the floors", id="mop", frequency=3)
+        finally:
+            DataInput.set_clock(None)
+        self.assertEqual(DataInput.get_chore_by_id("f79759a1-47ef-42c4-9879-c353c3329f50").completion_date,
+                         date(2024, 3, 20))
+        self.assertEqual(DataInput.get_chore_by_id("mop").deadline_date, date(2024, 3, 23))
+        self.assertEqual(DataInput.today(), date.today())
+        logging.debug("Passed test_set_clock")
+
+    def test_pinned_today(self):
+        """
+        This method tests that the clock is read once within a pinned_today block.
+        """
+        days = iter([date(2024, 3, 20), date(2024, 3, 21), date(2024, 3, 22)])
+        DataInput.set_clock(lambda: next(days))
+        try:
+            with DataInput.pinned_today() as today:
+                self.assertEqual(today, date(2024, 3, 20))
+                with DataInput.pinned_today():
+                    self.assertEqual(DataInput.today(), date(2024, 3, 20))
+                DataInput.set_chore_complete("f79759a1-47ef-42c4-9879-c353c3329f50")
+            self.assertEqual(DataInput.today(), date(2024, 3, 21))
+        finally:
+            DataInput.set_clock(None)
+        self.assertEqual(DataInput.get_chore_by_id("f79759a1-47ef-42c4-9879-c353c3329f50").completion_date,
+                         date(2024, 3, 20))
+        logging.debug("Passed test_pinned_today")
+
+    def test_category_filter(self):
+        """
+        This method tests filtering chores by category, through the category index.
+        """
+        chores = DataInput.get_chores_by_filters(category="General")
+        self.assertEqual([chore.name for chore in chores], ["Vacuum", "Dusting"])
+        self.assertIsNotNone(DataInput._get_chore_offset_index().categories)
+        chores = DataInput.get_chores_by_filters(category="General", status=DataInput.CHORE_STATUS.ASSIGNED)
+        self.assertEqual([chore.name for chore in chores], ["Dusting"])
+        self.assertEqual(DataInput.get_chores_by_filters(category="Garden"), [])
+        # the index follows the changes of the CSV
+        chore = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+        chore.category = "Garden"
+        DataInput.update_chore_by_object(chore)
+        self.assertEqual([chore.name for chore in DataInput.iter_chores(category="Garden")], ["Vacuum"])
+        self.assertEqual([chore.name for chore in DataInput.iter_chores(category="General")], ["Dusting"])
+        logging.debug("Passed test_category_filter")
+
+    def test_sequence_ids(self):
+        """
+        This method tests that new chores get reproducible IDs from a sequence ID generator.
+        """
+        DataInput.set_id_generator(DataInput.SequenceIdGenerator("test", start=9))
+        try:
+            DataInput.new_chore_by_args("Mop", "Mop the floors")
+            DataInput.new_chore_by_args("Sweep", "Sweep the floors")
+        finally:
+            DataInput.set_id_generator(None)
+        self.assertEqual([chore.id for chore in DataInput.get_chores_by_filters()[-2:]], ["test-9", "test-a"])
+        # random UUIDs again
+        self.assertEqual(len(DataInput.generate_uid()), 36)
+        logging.debug("Passed test_sequence_ids")
+
+    def test_group_commit(self):
+        """
+        This method tests that concurrent chore mutations are written together,
+        and that a failing mutation does not affect the others in its batch.
+        """
+        chore_ids: list[str] = [
+            "f79759a1-47ef-42c4-9879-c353c3329f50",
+            "b2c10fdc-f023-4360-9bf6-d62122333039",
+            "9e4fe3a0-aa47-40e0-9efd-eb4f62c5f922",
+            "575e2770-e278-4dc5-95a3-e918ecebdc31",
+        ]
+        chores: list[DataInput.Chore] = [DataInput.get_chore_by_id(chore_id) for chore_id in chore_ids]
+        errors: dict[str, Exception] = {}
+
+        def rename(chore: DataInput.Chore) -> None:
+            chore.name = "Renamed " + chore.id
+            DataInput.update_chore_by_object(chore)
+
+        def complete_unassigned() -> None:
+            try:
+                DataInput.set_chore_complete("7cb263c2-52f5-4077-971e-491d3d19ed29")
+            except ValueError as error:
+                errors["complete"] = error
+
+        window, metrics_enabled = DataInput.GROUP_COMMIT_WINDOW, Metrics.is_enabled()
+        DataInput.GROUP_COMMIT_WINDOW = 0.05
+        Metrics.enable()
+        Metrics.reset()
+        try:
+            threads = [threading.Thread(target=rename, args=(chore,)) for chore in chores]
+            threads.append(threading.Thread(target=complete_unassigned))
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            batches = Metrics.GROUP_COMMIT_BATCHES.get()
+        finally:
+            DataInput.GROUP_COMMIT_WINDOW = window
+            Metrics.reset()
+            Metrics.enable(metrics_enabled)
+
+        # five mutations, but fewer writes
+        self.assertLess(batches, 5)
+        self.assertIsInstance(errors.get("complete"), ValueError)
+        for chore_id in chore_ids:
+            self.assertEqual(DataInput.get_chore_by_id(chore_id).name, "Renamed " + chore_id)
+        self.assertEqual(DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29").status,
+                         DataInput.CHORE_STATUS.UNASSIGNED)
+        logging.debug("Passed test_group_commit")
+
+    def test_snapshot_reads(self):
+        """
+        This method tests that reads within snapshot_reads see the version they pinned while writes go on,
+        and that the version is reclaimed once unpinned.
+        """
+        vacuum_id = "7cb263c2-52f5-4077-971e-491d3d19ed29"
+        dusting_id = "575e2770-e278-4dc5-95a3-e918ecebdc31"
+        with DataInput.snapshot_reads() as version:
+            self.assertEqual(DataInput.get_chore_by_id(vacuum_id).name, "Vacuum")
+            # a writer in another thread is not blocked
+            chore = DataInput.get_chore_by_id(vacuum_id)
+            chore.name = "Hoover"
+            writer = threading.Thread(target=DataInput.update_chore_by_object, args=(chore,))
+            writer.start()
+            writer.join()
+            # this thread's own writes go to the latest version, without losing the other thread's
+            chore = DataInput.get_chore_by_id(dusting_id)
+            chore.name = "Dust"
+            DataInput.update_chore_by_object(chore)
+            with DataInput.snapshot_reads() as nested_version:
+                self.assertIs(nested_version, version)
+                names = [chore.name for chore in DataInput.iter_chores()]
+            self.assertEqual(names, ["Start dishwasher", "Feed the cats", "Dry clothes", "Vacuum", "Dusting"])
+            self.assertEqual(DataInput.get_chore_by_id(vacuum_id).name, "Vacuum")
+            self.assertEqual([chore.name for chore in DataInput.get_chores_by_filters(category="General")],
+                             ["Vacuum", "Dusting"])
+            self.assertNotEqual(DataInput._chore_signature(), DataInput._file_signature(DataInput.CHORES_FILEPATH))
+        self.assertTrue(version.file.closed)
+        self.assertEqual(DataInput._chore_versions, {})
+        self.assertEqual([chore.name for chore in DataInput.get_chores_by_filters(category="General")],
+                         ["Hoover", "Dust"])
+        logging.debug("Passed test_snapshot_reads")
+
+
+class TestDurability(unittest.TestCase):
+    """
+    This class provides crash-recovery tests for writes to the database files,
+    and tests of the durability modes.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        self.replacements = [
+            ("./csvs/chores.csv", "./csvs/tmp_chores.csv"),
+            ("./csvs/occupants.csv", "./csvs/tmp_occupants.csv"),
+        ]
+        for old_name, new_name in self.replacements:
+            try:
+                os.rename(old_name, new_name)
+            except FileNotFoundError:
+                logging.debug(f"No file to preserve: {old_name}")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        with open("./csvs/chores.csv", 'r') as file:
+            self.chores_before = file.read()
+        self.durability_mode = DataInput.DURABILITY_MODE
+        logging.debug("Replaced files with mockups in setUp")
+
+    def tearDown(self):
+        """
+        Remove the csvs/chores.csv generated during these unit tests,
+        Replace it with the version available prior to testing
+        """
+        DataInput.set_durability_mode(self.durability_mode)
+        for old_name, new_name in self.replacements:
+            try:
+                os.replace(new_name, old_name)
+            except FileNotFoundError:
+                logging.debug(f"No file to restore: {old_name}")
+        logging.debug("Restored files in tearDown")
+
+    def temporary_files(self) -> list[str]:
+        """Return the temporary files of interrupted writes in the csvs directory."""
+        return [name for name in os.listdir("./csvs") if name.endswith(DataInput.TEMP_FILE_SUFFIX)]
+
+    def test_failed_write(self):
+        """
+        This method tests that an exception in the middle of a write leaves the chores file untouched.
+        """
+        def fail(row):
+            raise RuntimeError("disk on fire")
+
+        with self.assertRaises(RuntimeError):
+            DataInput._commit_chore_mutations([
+                DataInput._ChoreMutation("7cb263c2-52f5-4077-971e-491d3d19ed29", fail)])
+        with open("./csvs/chores.csv", 'r') as file:
+            self.assertEqual(file.read(), self.chores_before)
+        self.assertEqual(self.temporary_files(), [])
+        logging.debug("Passed test_failed_write")
+
+    def test_killed_writer(self):
+        """
+        This method tests that a writer process killed in the middle of a write leaves the chores file intact,
+        and that the temporary file it left behind is cleaned up by recover_interrupted_writes.
+        """
+        # the chore to update is the last one, so the other rows have been written when the writer dies
+        script = (
+            "import os, DataInput\n"
+            "def die(row):\n"
+            "    os._exit(1)\n"
+            "DataInput._commit_chore_mutations(["
+            "DataInput._ChoreMutation('575e2770-e278-4dc5-95a3-e918ecebdc31', die)])\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=Context.project_root)
+        self.assertEqual(result.returncode, 1)
+        # the chores file is unchanged and still fully readable
+        with open("./csvs/chores.csv", 'r') as file:
+            self.assertEqual(file.read(), self.chores_before)
+        self.assertEqual(len(DataInput.get_chores_by_filters()), 5)
+        # the dead writer's temporary file is removed
+        self.assertEqual(len(self.temporary_files()), 1)
+        removed = DataInput.recover_interrupted_writes("./csvs")
+        self.assertEqual(len(removed), 1)
+        self.assertEqual(self.temporary_files(), [])
+        logging.debug("Passed test_killed_writer")
+
+    def test_killed_index_writer(self):
+        """
+        This method tests that the temporary file of a writer killed while saving the chore index
+        is cleaned up by recover_interrupted_writes, like those of the data files.
+        """
+        script = (
+            "import os, json, DataInput\n"
+            "def die(*args, **kwargs):\n"
+            "    os._exit(1)\n"
+            "json.dump = die\n"
+            "filepath = DataInput.CHORES_FILEPATH\n"
+            "DataInput._ChoreOffsetIndex.build(filepath, DataInput._file_signature(filepath)).save()\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=Context.project_root)
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(len(self.temporary_files()), 1)
+        self.assertEqual(len(DataInput.recover_interrupted_writes("./csvs")), 1)
+        self.assertEqual(self.temporary_files(), [])
+        logging.debug("Passed test_killed_index_writer")
+
+    def test_batched_chore_writes(self):
+        """
+        This method tests that the chore writes made in a batch are committed together, when the batch ends.
+        """
+        Metrics.enable()
+        Metrics.reset()
+        try:
+            with DataInput.batched_chore_writes() as batch:
+                DataInput.set_chore_complete("575e2770-e278-4dc5-95a3-e918ecebdc31")
+                failed = batch.mark()
+                DataInput.set_chore_complete("b2c10fdc-f023-4360-9bf6-d62122333039")
+                DataInput.new_chore_by_args("Mow", "The lawn")
+                # nothing is written until the batch ends
+                self.assertEqual(len(DataInput.get_chores_by_filters()), 5)
+            batches = Metrics.GROUP_COMMIT_BATCHES.get()
+        finally:
+            Metrics.enable(False)
+            Metrics.reset()
+        self.assertEqual(batches, 1)
+        self.assertIsNone(batch.error_since(0, failed))
+        self.assertIsInstance(batch.error_since(failed), ValueError)
+        self.assertEqual(DataInput.get_chore_by_id("575e2770-e278-4dc5-95a3-e918ecebdc31").status,
+                         DataInput.CHORE_STATUS.COMPLETED)
+        self.assertEqual(len(DataInput.get_chores_by_filters()), 6)
+        logging.debug("Passed test_batched_chore_writes")
+
+    def test_durability_modes(self):
+        """
+        This method tests that writes succeed in every durability mode, and that unknown modes are rejected.
+        """
+        for mode in DataInput.DURABILITY_MODES:
+            DataInput.set_durability_mode(mode, batch_interval=0.01)
+            chore: DataInput.Chore = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+            chore.name = "Vacuum " + mode
+            DataInput.update_chore_by_object(chore)
+            self.assertEqual(DataInput.get_chore_by_id(chore.id).name, "Vacuum " + mode)
+            DataInput.remove_user("John Johnson", "./csvs/occupants.csv")
+        self.assertNotIn("John Johnson", DataInput.get_username_list("./csvs/occupants.csv"))
+        with self.assertRaises(ValueError):
+            DataInput.set_durability_mode("yolo")
+        logging.debug("Passed test_durability_modes")
+
 if __name__ == "__main__":
     unittest.main()
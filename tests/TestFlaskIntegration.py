@@ -0,0 +1,346 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the endpoints of the flask_integration.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+from unittest import mock
+import os
+import shutil
+import gzip
+import json
+from datetime import date
+
+# module to test
+import flask_integration
+import DataInput
+import login
+import Metrics
+import Profiler
+import ResponseEncoding
+from DataInput import CHORE_STATUS
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+# occupants of the mock database
+FRED = "95454c41-dc2f-451e-97b5-1d53b31cfa16"
+MARIA = "0c9ef357-f312-4f85-93c0-16672244a2b5"
+
+# chores of the mock database
+DISHWASHER = "f79759a1-47ef-42c4-9879-c353c3329f50"
+DUSTING = "575e2770-e278-4dc5-95a3-e918ecebdc31"
+FEED_CATS = "b2c10fdc-f023-4360-9bf6-d62122333039"
+
+
+class TestServeChores(unittest.TestCase):
+    """
+    This class provides unit tests for the formats and compression of the /chore/serve endpoint.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        self.client = flask_integration.app.test_client()
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def test_columnar_gzip(self):
+        """
+        This method tests that the columnar format holds the same chores, and is gzipped when accepted.
+        """
+        objects = self.client.post('/chore/serve', data={'user': ''}).get_json()
+        response = self.client.post('/chore/serve', data={'user': '', 'format': 'columnar'},
+                                    headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        reply = json.loads(gzip.decompress(response.get_data()))
+        self.assertEqual(reply['columns'], DataInput.CHORE_ATTRIBUTES)
+        self.assertEqual([dict(zip(reply['columns'], row)) for row in reply['rows']], objects)
+        self.assertEqual(len(objects), 3)
+        self.assertEqual(self.client.post('/chore/serve', data={'user': '', 'format': 'xml'}).status_code, 400)
+        logging.debug("Passed test_columnar_gzip")
+
+    def test_small_reply_uncompressed(self):
+        """
+        This method tests that replies below the size threshold are not compressed.
+        """
+        response = self.client.get('/user/serve', headers={'Accept-Encoding': 'gzip'})
+        self.assertLess(len(response.get_data()), ResponseEncoding.COMPRESS_MIN_BYTES)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(len(response.get_json()), 3)
+        logging.debug("Passed test_small_reply_uncompressed")
+
+
+class TestSessionTokens(unittest.TestCase):
+    """
+    This class provides unit tests for authenticating requests with the session token from /user/login.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        self.client = flask_integration.app.test_client()
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        # forget the attempts made in the tests
+        login.username_throttle.clear()
+        login.client_throttle.clear()
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def test_login_token(self):
+        """
+        This method tests that the token issued at login serves the occupant's chores,
+        without reading the occupants file again while it is unchanged.
+        """
+        with open("./csvs/occupants.csv", 'w') as file:
+            file.write(f"Occupant UID,Username,Password\n{MARIA},Maria Mariason,secret\n")
+        reply = self.client.post('/user/login', data={'user': 'Maria Mariason', 'pass': 'secret'}).get_json()
+        self.assertTrue(reply['pass_valid'])
+        self.assertEqual(login.verify_token(reply['token']), MARIA)
+
+        with mock.patch.object(DataInput, 'get_user_ids', side_effect=AssertionError("occupants file read")):
+            chores = self.client.post('/chore/serve', data={'user': ''},
+                                      headers={'Authorization': 'Bearer ' + reply['token']}).get_json()
+            self.assertEqual([row['Assignee ID'] for row in chores], [MARIA, MARIA])
+            chores = self.client.post('/chore/serve', data={'token': reply['token']}).get_json()
+            self.assertEqual(len(chores), 2)
+        logging.debug("Passed test_login_token")
+
+    def test_deleted_user_token(self):
+        """
+        This method tests that the token of an occupant is rejected once they are removed.
+        """
+        with open("./csvs/occupants.csv", 'w') as file:
+            file.write(f"Occupant UID,Username,Password\n{FRED},Fred Fredson,fred\n{MARIA},Maria Mariason,secret\n")
+        token = self.client.post('/user/login', data={'user': 'Maria Mariason', 'pass': 'secret'}).get_json()['token']
+        reply = self.client.post('/user/delete', data={'user': 'Maria Mariason', 'pass': 'secret'}).get_json()
+        self.assertTrue(reply['success'])
+        response = self.client.post('/chore/serve', data={'token': token})
+        self.assertEqual(response.status_code, 401)
+        logging.debug("Passed test_deleted_user_token")
+
+    def test_login_throttled(self):
+        """
+        This method tests that password attempts beyond the burst are refused before the password is checked.
+        """
+        with open("./csvs/occupants.csv", 'w') as file:
+            file.write(f"Occupant UID,Username,Password\n{FRED},Fred Fredson,fred\n{MARIA},Maria Mariason,secret\n")
+        for _ in range(login.USERNAME_ATTEMPTS_BURST):
+            response = self.client.post('/user/login', data={'user': 'Maria Mariason', 'pass': 'guess'})
+            self.assertEqual(response.status_code, 200)
+        for path in ('/user/login', '/user/delete'):
+            response = self.client.post(path, data={'user': 'Maria Mariason', 'pass': 'guess'})
+            self.assertEqual(response.status_code, 429)
+            self.assertGreater(int(response.headers['Retry-After']), 0)
+        # another username from the same client is still allowed
+        response = self.client.post('/user/login', data={'user': 'Fred Fredson', 'pass': 'guess'})
+        self.assertEqual(response.status_code, 200)
+        logging.debug("Passed test_login_throttled")
+
+    def test_invalid_token(self):
+        """
+        This method tests that a forged or revoked token is rejected, rather than falling back to the username.
+        """
+        token = login.issue_token(FRED)
+        forged = login.issue_token(MARIA).split(".")[0] + "." + token.split(".")[1]
+        response = self.client.post('/chore/serve', data={'user': 'Maria Mariason', 'token': forged})
+        self.assertEqual(response.status_code, 401)
+        # a token of someone who is not an occupant (e.g. was removed by another process)
+        response = self.client.post('/chore/serve', data={'user': ''}, headers={
+            'Authorization': 'Bearer ' + login.issue_token("95454c41-revoked")})
+        self.assertEqual(response.status_code, 401)
+        logging.debug("Passed test_invalid_token")
+
+
+class TestBatch(unittest.TestCase):
+    """
+    This class provides unit tests for running several operations with the /batch endpoint.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        DataInput.set_clock(lambda: date(2024, 3, 15))
+        self.client = flask_integration.app.test_client()
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        DataInput.set_clock(None)
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def test_batch(self):
+        """
+        This method tests that the operations of a batch read the same snapshot, and that their writes are made.
+        """
+        reply = self.client.post('/batch', json={'operations': [
+            {'op': 'chore/complete', 'chore_id': DUSTING},
+            {'op': 'chore/serve', 'user': 'Maria Mariason'},
+            {'op': 'user/serve'},
+            {'op': 'chore/create', 'Chore Name': 'Mow', 'Description': 'The lawn',
+             'Frequency': '7', 'Expected Duration': '60'},
+        ]}).get_json()
+        self.assertTrue(reply['success'])
+        self.assertEqual([result['success'] for result in reply['results']], [True] * 4)
+        # the chores are served as they were before the batch, by deadline
+        self.assertEqual([row['Chore ID'] for row in reply['results'][1]['result']],
+                         [DUSTING, "9e4fe3a0-aa47-40e0-9efd-eb4f62c5f922"])
+        self.assertEqual(len(reply['results'][2]['result']), 3)
+        self.assertEqual(DataInput.get_chore_by_id(DUSTING).status, CHORE_STATUS.COMPLETED)
+        mow = [chore for chore in DataInput.iter_chores() if chore.name == "Mow"]
+        self.assertEqual(len(mow), 1)
+        # the new chore was assigned after the batch
+        self.assertEqual(mow[0].status, CHORE_STATUS.ASSIGNED)
+        logging.debug("Passed test_batch")
+
+    def test_batch_reads_before_writes(self):
+        """
+        This method tests that the reads of a batch do not see its writes, which the next request sees.
+        """
+        operations = [
+            {'op': 'chore/complete', 'chore_id': DUSTING},
+            {'op': 'chore/serve', 'user': 'Maria Mariason'},
+            {'op': 'chore/create', 'Chore Name': 'Mow', 'Description': 'The lawn',
+             'Frequency': '7', 'Expected Duration': '60'},
+            {'op': 'chore/serve', 'user': ''},
+        ]
+        results = self.client.post('/batch', json={'operations': operations}).get_json()['results']
+        served = {row['Chore ID']: row['Status'] for row in results[1]['result']}
+        self.assertEqual(served[DUSTING], CHORE_STATUS.ASSIGNED.value)
+        self.assertNotIn('Mow', [row['Chore Name'] for row in results[3]['result']])
+        # the next request sees them
+        served = self.client.post('/chore/serve', data={'user': 'Maria Mariason'}).get_json()
+        self.assertNotIn(DUSTING, [row['Chore ID'] for row in served])
+        served = self.client.post('/chore/serve', data={'user': ''}).get_json()
+        self.assertIn('Mow', [row['Chore Name'] for row in served])
+        logging.debug("Passed test_batch_reads_before_writes")
+
+    def test_batch_errors(self):
+        """
+        This method tests that failed operations are reported without affecting the others.
+        """
+        reply = self.client.post('/batch', json={'operations': [
+            {'op': 'chore/complete', 'chore_id': FEED_CATS},
+            {'op': 'chore/complete', 'chore_id': DISHWASHER},
+            {'op': 'chore/serve', 'user': 'Nobody'},
+            {'op': 'chore/complete'},
+            {'op': 'chore/delete'},
+        ]}).get_json()
+        results = reply['results']
+        self.assertEqual([result['success'] for result in results], [False, True, False, False, False])
+        self.assertEqual(results[0]['error'], "Chore must first be assigned to be completed")
+        # the dishwasher repeats and is past its deadline, so it was renewed after the batch
+        self.assertEqual(DataInput.get_chore_by_id(DISHWASHER).status, CHORE_STATUS.RENEWED)
+        self.assertEqual(self.client.post('/batch', json={}).status_code, 400)
+        logging.debug("Passed test_batch_errors")
+
+
+class TestAdminProfiles(unittest.TestCase):
+    """
+    This class provides unit tests for the access control of the /admin/profiles endpoints.
+    """
+
+    def setUp(self):
+        self.enabled, Profiler.enabled = Profiler.enabled, True
+        self.metrics_enabled = Metrics.is_enabled()
+        self.client = flask_integration.app.test_client()
+
+    def tearDown(self):
+        Profiler.enabled = self.enabled
+        Metrics.enable(self.metrics_enabled)
+        flask_integration.ADMIN_TOKEN = ''
+
+    def test_token_required(self):
+        """
+        This method tests that while profiling is enabled, the profiles are refused without an admin token,
+        even to requests from this machine (e.g. forwarded by a reverse proxy).
+        """
+        self.assertEqual(self.client.get('/admin/profiles').status_code, 403)
+        self.assertEqual(self.client.get('/admin/profiles/1').status_code, 403)
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        logging.debug("Passed test_token_required")
+
+    def test_local_only(self):
+        """
+        This method tests that with profiling and metrics disabled and no admin token,
+        only requests from this machine are answered.
+        """
+        Profiler.enabled = False
+        Metrics.enable(False)
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+        remote = {'REMOTE_ADDR': '192.0.2.1'}
+        self.assertEqual(self.client.get('/metrics', environ_base=remote).status_code, 403)
+        self.assertEqual(self.client.get('/admin/profiles', environ_base=remote).status_code, 403)
+        logging.debug("Passed test_local_only")
+
+    def test_admin_token(self):
+        """
+        This method tests that with an admin token, every request must carry it.
+        """
+        flask_integration.ADMIN_TOKEN = 'secret'
+        self.assertEqual(self.client.get('/admin/profiles').status_code, 403)
+        self.assertEqual(self.client.get('/admin/profiles', headers={'X-Haus-Admin-Token': 'wrong'}).status_code, 403)
+        reply = self.client.get('/admin/profiles', headers={'X-Haus-Admin-Token': 'secret'},
+                                environ_base={'REMOTE_ADDR': '192.0.2.1'})
+        self.assertEqual(reply.status_code, 200)
+        logging.debug("Passed test_admin_token")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the Forecast.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import os
+import shutil
+from datetime import date
+
+# module to test
+import AutoAssign
+import DataInput
+import Forecast
+from DataInput import CHORE_STATUS
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+# day the mock chores are forecast from
+TODAY = date(2024, 3, 15)
+
+# occupants of the mock database
+FRED = "95454c41-dc2f-451e-97b5-1d53b31cfa16"
+JOHN = "c55b4c05-2f74-4bfb-8077-03192dd74aab"
+MARIA = "0c9ef357-f312-4f85-93c0-16672244a2b5"
+
+
+class TestForecast(unittest.TestCase):
+    """
+    This class provides unit tests for projecting and incrementally updating workloads.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        # a forecast of the next seven days, kept up to date by the writes made in the tests
+        self.forecast = Forecast.WorkloadForecast(horizon_days=7)
+        DataInput.register_chore_listener(self.forecast.chores_changed)
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        DataInput.unregister_chore_listener(self.forecast.chores_changed)
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def test_loads(self):
+        """
+        This method tests the projected workload of each occupant.
+        """
+        self.assertEqual(self.forecast.loads(TODAY), {FRED: 15, JOHN: 7 * 15, MARIA: 20, None: 2 * 30})
+        self.assertEqual(self.forecast.load(MARIA, TODAY), 20)
+        # a week later, only the instances after that day are projected
+        self.assertEqual(self.forecast.load(MARIA, date(2024, 3, 22)), 20)
+        self.assertEqual(self.forecast.rebuilds, 1)
+        logging.debug("Passed test_loads")
+
+    def test_incremental_update(self):
+        """
+        This method tests that writes made by this process update the forecast without a rebuild.
+        """
+        self.forecast.loads(TODAY)
+        vacuum = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+        vacuum.assignee_id = FRED
+        vacuum.status = CHORE_STATUS.ASSIGNED
+        DataInput.update_chore_by_object(vacuum)
+        dusting = DataInput.get_chore_by_id("575e2770-e278-4dc5-95a3-e918ecebdc31")
+        dusting.frequency = 7
+        DataInput.update_chore_by_object(dusting)
+        self.assertEqual(self.forecast.loads(TODAY), {FRED: 15 + 2 * 30, JOHN: 7 * 15, MARIA: 20 + 20})
+        self.assertEqual(self.forecast.rebuilds, 1)
+        logging.debug("Passed test_incremental_update")
+
+    def test_external_write(self):
+        """
+        This method tests that the forecast is rebuilt when the chores CSV is written by another process.
+        """
+        self.forecast.loads(TODAY)
+        with open(DataInput.CHORES_FILEPATH, 'a') as file:
+            file.write(f"\nd1d7f0c0-6f4e-4c43-9a0e-3ad6a4a37d0e,Mow,The lawn,Garden,60,assigned,{FRED},2024-03-15,7,")
+        self.assertEqual(self.forecast.load(FRED, TODAY), 15 + 60)
+        self.assertEqual(self.forecast.rebuilds, 2)
+        logging.debug("Passed test_external_write")
+
+    def test_assign_with_forecast(self):
+        """
+        This method tests that the assignment counts the projected workload when asked to.
+        """
+        dishwasher = DataInput.get_chore_by_id("f79759a1-47ef-42c4-9879-c353c3329f50")
+        dishwasher.expected_duration = 30
+        DataInput.update_chore_by_object(dishwasher)
+        # this week, John has the least work (Fred 30, John 15, Maria 40)...
+        AutoAssign.assign_unassigned_chores(today=TODAY, use_forecast=False)
+        self.assertEqual(DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29").assignee_id, JOHN)
+        # ...but he feeds the cats every day, so over the next two weeks Maria has the least (90, 225, 80)
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        DataInput.update_chore_by_object(dishwasher)
+        Forecast.forecast.horizon_days = 14
+        Forecast.forecast.invalidate()
+        AutoAssign.assign_unassigned_chores(today=TODAY, use_forecast=True)
+        self.assertEqual(DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29").assignee_id, MARIA)
+        logging.debug("Passed test_assign_with_forecast")
+
+
+if __name__ == "__main__":
+    unittest.main()
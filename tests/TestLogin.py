@@ -212,4 +212,76 @@ class TestVerifyUserExists(unittest.TestCase):
         ]
         setUpCSV(start_contents)
         self.assertEqual(False, verify_user_exists("C", test_file))
-        tearDownCSV()
\ No newline at end of file
+        tearDownCSV()
+
+class TestSessionTokens(unittest.TestCase):
+    def setUp(self):
+        # tokens are only accepted for the occupants listed in the occupants CSV
+        self.occupants_filepath = DataInput.OCCUPANTS_FILEPATH
+        DataInput.OCCUPANTS_FILEPATH = test_file
+        setUpCSV([["Occupant UID", "Username", "Password"], ["MOCK-UID", "A", "XYZ"],
+                  ["OTHER-UID", "B", "HKJ"], ["REVOKED-UID", "C", "QRS"]])
+
+    def tearDown(self):
+        DataInput.OCCUPANTS_FILEPATH = self.occupants_filepath
+        tearDownCSV()
+
+    def test_valid_token_returns_uid(self):
+        """A token issued for a UID verifies to that UID until it expires"""
+        token = issue_token("MOCK-UID", now=1000)
+        self.assertEqual("MOCK-UID", verify_token(token, now=1000 + TOKEN_LIFETIME_SECONDS - 1))
+        self.assertEqual(None, verify_token(token, now=1000 + TOKEN_LIFETIME_SECONDS))
+
+    def test_tampered_token_returns_none(self):
+        """A token whose UID or signature was changed, or which is malformed, is rejected"""
+        token = issue_token("MOCK-UID")
+        payload, signature = token.split(".")
+        forged_payload = issue_token("OTHER-UID").split(".")[0]
+        self.assertEqual(None, verify_token(forged_payload + "." + signature))
+        self.assertEqual(None, verify_token(payload + "." + signature[:-2]))
+        self.assertEqual(None, verify_token("not a token"))
+        self.assertEqual(None, verify_token(""))
+
+    def test_revoked_token_returns_none(self):
+        """The tokens of a removed occupant are rejected, whichever process removed them"""
+        token = issue_token("REVOKED-UID")
+        self.assertEqual("REVOKED-UID", verify_token(token))
+        # removed by rewriting the occupants CSV, as another process would
+        setUpCSV([["Occupant UID", "Username", "Password"], ["MOCK-UID", "A", "XYZ"], ["OTHER-UID", "B", "HKJ"]])
+        self.assertEqual(None, verify_token(token))
+        self.assertEqual(None, verify_token(issue_token("REVOKED-UID")))
+
+
+class TestAttemptThrottle(unittest.TestCase):
+    def test_burst_then_refill(self):
+        """A key may make burst attempts at once, then regains them at the refill rate"""
+        throttle = AttemptThrottle("test", burst=3, per_minute=6)
+        self.assertEqual([0, 0, 0], [throttle.attempt("A", now=0) for _ in range(3)])
+        self.assertAlmostEqual(10, throttle.attempt("A", now=0))
+        self.assertAlmostEqual(5, throttle.attempt("A", now=5))
+        self.assertEqual(0, throttle.attempt("A", now=10))
+        # other keys are not affected
+        self.assertEqual(0, throttle.attempt("B", now=10))
+
+    def test_least_recently_used_dropped(self):
+        """Beyond max_keys, the least recently used bucket is forgotten"""
+        throttle = AttemptThrottle("test", burst=1, per_minute=1, max_keys=2)
+        throttle.attempt("A", now=0)
+        throttle.attempt("B", now=0)
+        self.assertNotEqual(0, throttle.attempt("A", now=0))
+        throttle.attempt("C", now=0)
+        self.assertEqual(2, len(throttle))
+        # B was dropped, and starts again with a full bucket (which drops A)
+        self.assertEqual(0, throttle.attempt("B", now=0))
+        self.assertNotEqual(0, throttle.attempt("C", now=0))
+
+    def test_client_refused_first(self):
+        """An attempt refused for the client does not count against the username"""
+        username_throttle.clear()
+        client_throttle.clear()
+        for _ in range(CLIENT_ATTEMPTS_BURST):
+            self.assertEqual(0, throttle_password_attempt("user" + str(_ % 3), "client", now=0))
+        self.assertNotEqual(0, throttle_password_attempt("victim", "client", now=0))
+        self.assertNotIn("victim", username_throttle._buckets)
+        username_throttle.clear()
+        client_throttle.clear()
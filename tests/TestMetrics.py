@@ -0,0 +1,87 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the Metrics.py instrumentation module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+
+# module to test
+import Metrics
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    This class provides unit tests for counters, histograms and their Prometheus rendering.
+    """
+
+    def setUp(self):
+        """Start every test with empty, enabled metrics."""
+        self.was_enabled = Metrics.is_enabled()
+        Metrics.reset()
+        Metrics.enable()
+
+    def tearDown(self):
+        """Restore the metrics to their state before the test."""
+        Metrics.reset()
+        Metrics.enable(self.was_enabled)
+
+    def test_disabled(self):
+        """
+        This method tests that nothing is recorded while metrics are disabled.
+        """
+        Metrics.enable(False)
+        Metrics.FILE_READS.inc(file="chores.csv")
+        with Metrics.timer("something"):
+            pass
+        self.assertEqual(Metrics.FILE_READS.get(file="chores.csv"), 0)
+        self.assertEqual(Metrics.OPERATION_SECONDS.count(operation="something"), 0)
+        logging.debug("Passed test_disabled")
+
+    def test_timed(self):
+        """
+        This method tests that the timed decorator records each call, including failing ones.
+        """
+        @Metrics.timed("test_operation")
+        def operation(fail: bool) -> int:
+            if fail:
+                raise ValueError("failed")
+            return 42
+
+        self.assertEqual(operation(False), 42)
+        with self.assertRaises(ValueError):
+            operation(True)
+        self.assertEqual(Metrics.OPERATION_SECONDS.count(operation="test_operation"), 2)
+        logging.debug("Passed test_timed")
+
+    def test_render_prometheus(self):
+        """
+        This method tests the Prometheus text format of counters and histograms.
+        """
+        Metrics.ROWS_SCANNED.inc(5, file="chores.csv")
+        Metrics.ROWS_SCANNED.inc(3, file="chores.csv")
+        Metrics.REQUEST_SECONDS.observe(0.003, endpoint="serve", method="GET", status="200")
+        Metrics.REQUEST_SECONDS.observe(20, endpoint="serve", method="GET", status="200")
+        lines = Metrics.render_prometheus().splitlines()
+        self.assertIn('# TYPE haus_rows_scanned_total counter', lines)
+        self.assertIn('haus_rows_scanned_total{file="chores.csv"} 8', lines)
+        labels = 'endpoint="serve",method="GET",status="200"'
+        self.assertIn('haus_request_seconds_bucket{%s,le="0.0025"} 0' % labels, lines)
+        self.assertIn('haus_request_seconds_bucket{%s,le="0.005"} 1' % labels, lines)
+        self.assertIn('haus_request_seconds_bucket{%s,le="+Inf"} 2' % labels, lines)
+        self.assertIn('haus_request_seconds_count{%s} 2' % labels, lines)
+        logging.debug("Passed test_render_prometheus")
+
+
+if __name__ == "__main__":
+    unittest.main()
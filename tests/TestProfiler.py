@@ -0,0 +1,114 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the Profiler.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import os
+import tempfile
+import time
+from collections import Counter
+
+# module to test
+import Profiler
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+def busy_wait(seconds: float) -> None:
+    """Keep the current thread busy (rather than sleeping) for the given time."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfiler(unittest.TestCase):
+    """
+    This class provides unit tests for stack sampling and the slowest-profiles buffer.
+    """
+
+    def test_request_profiler(self):
+        """
+        This method tests that the samples of a profiled request point at the busy function,
+        and are written to a collapsed-stack file.
+        """
+        slowest, Profiler.slowest = Profiler.slowest, Profiler.SlowestProfiles()
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = Profiler.RequestProfiler("POST", "/chore/complete")
+            busy_wait(0.1)
+            profile = profiler.finish(directory)
+            Profiler.slowest = slowest
+            self.assertGreater(profile.duration, 0.1)
+            self.assertGreater(sum(profile.stacks.values()), 0)
+            # the innermost frames are in busy_wait, called by this test
+            busiest_stack = profile.stacks.most_common(1)[0][0]
+            self.assertIn("TestProfiler:test_request_profiler;TestProfiler:busy_wait", busiest_stack)
+            with open(os.path.join(directory, f"{profile.id}.collapsed")) as file:
+                lines = file.read().splitlines()
+            stack, count = lines[0].rsplit(" ", 1)
+            self.assertEqual(stack, busiest_stack)
+            self.assertEqual(int(count), profile.stacks[busiest_stack])
+        logging.debug("Passed test_request_profiler")
+
+    def test_slowest_profiles(self):
+        """
+        This method tests that only the slowest profiles are kept, slowest first.
+        """
+        slowest = Profiler.SlowestProfiles(capacity=3)
+        for i, duration in enumerate([0.5, 0.1, 0.9, 0.3, 0.7]):
+            slowest.add(Profiler.RequestProfile(str(i), "GET", "/", 0, duration, Counter()))
+        self.assertEqual([profile.duration for profile in slowest.profiles()], [0.9, 0.7, 0.5])
+        self.assertIsNotNone(slowest.get("2"))
+        self.assertIsNone(slowest.get("1"))
+        logging.debug("Passed test_slowest_profiles")
+
+    def test_profile_files(self):
+        """
+        This method tests that only the kept profiles have a file, and that evicted profiles lose theirs.
+        """
+        slowest, Profiler.slowest = Profiler.slowest, Profiler.SlowestProfiles(capacity=1)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                profiler = Profiler.RequestProfiler("GET", "/user/serve")
+                busy_wait(0.05)
+                slow = profiler.finish(directory)
+                fast = Profiler.RequestProfiler("GET", "/user/serve").finish(directory)
+                self.assertIsNone(fast.filepath)
+                self.assertEqual(os.listdir(directory), [f"{slow.id}.collapsed"])
+                profiler = Profiler.RequestProfiler("GET", "/user/serve")
+                busy_wait(0.1)
+                slower = profiler.finish(directory)
+                self.assertEqual(os.listdir(directory), [f"{slower.id}.collapsed"])
+        finally:
+            Profiler.slowest = slowest
+        logging.debug("Passed test_profile_files")
+
+    def test_should_profile(self):
+        """
+        This method tests when requests are picked for profiling.
+        """
+        enabled, sample_rate = Profiler.enabled, Profiler.sample_rate
+        try:
+            Profiler.enabled, Profiler.sample_rate = False, 1.0
+            self.assertFalse(Profiler.should_profile({Profiler.PROFILE_HEADER: "1"}))
+            Profiler.enabled, Profiler.sample_rate = True, 0.0
+            self.assertTrue(Profiler.should_profile({Profiler.PROFILE_HEADER: "1"}))
+            self.assertFalse(Profiler.should_profile({}))
+            Profiler.sample_rate = 1.0
+            self.assertTrue(Profiler.should_profile({}))
+        finally:
+            Profiler.enabled, Profiler.sample_rate = enabled, sample_rate
+        logging.debug("Passed test_should_profile")
+
+
+if __name__ == "__main__":
+    unittest.main()
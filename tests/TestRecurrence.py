@@ -0,0 +1,154 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the Recurrence.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import os
+import shutil
+from datetime import date
+
+# module to test
+import AutoAssign
+import DataInput
+import Recurrence
+from DataInput import CHORE_STATUS
+from Recurrence import RecurrenceRule
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+# day the mock chores are planned from (a Friday)
+TODAY = date(2024, 3, 15)
+
+
+class TestRecurrenceRule(unittest.TestCase):
+    """
+    This class provides unit tests for parsing recurrence rules and computing their occurrences.
+    """
+
+    def test_parse(self):
+        """
+        This method tests that rules round-trip through their text form and invalid rules are rejected.
+        """
+        for text in ("days:3", "weekly:mon,thu", "monthly:15", "monthly:-1"):
+            self.assertEqual(str(RecurrenceRule.parse(text)), text)
+        self.assertEqual(str(RecurrenceRule.parse(" Weekly:Thursday, Monday ")), "weekly:mon,thu")
+        for text in ("", "days:0", "weekly:", "weekly:someday", "monthly:32", "yearly:1"):
+            with self.assertRaises(ValueError):
+                RecurrenceRule.parse(text)
+        logging.debug("Passed test_parse")
+
+    def test_occurrences(self):
+        """
+        This method tests the occurrences of each kind of rule.
+        """
+        self.assertEqual(list(RecurrenceRule.parse("days:3").occurrences(TODAY, date(2024, 3, 21))),
+                         [date(2024, 3, 18), date(2024, 3, 21)])
+        self.assertEqual(list(RecurrenceRule.parse("weekly:mon,thu").occurrences(TODAY, date(2024, 3, 25))),
+                         [date(2024, 3, 18), date(2024, 3, 21), date(2024, 3, 25)])
+        # days past the end of a month fall on its last day
+        self.assertEqual(list(RecurrenceRule.parse("monthly:31").occurrences(date(2024, 1, 31), date(2024, 4, 30))),
+                         [date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)])
+        self.assertEqual(RecurrenceRule.parse("monthly:-1").next_after(date(2023, 12, 31)), date(2024, 1, 31))
+        logging.debug("Passed test_occurrences")
+
+    def test_increment_id(self):
+        """
+        This method tests the IDs given to successive instances of a chore.
+        """
+        self.assertEqual(Recurrence.increment_id("abc-123"), "abc-123(1)")
+        self.assertEqual(Recurrence.increment_id("abc-123(9)"), "abc-123(10)")
+        with self.assertRaises(ValueError):
+            Recurrence.increment_id("not an id")
+        logging.debug("Passed test_increment_id")
+
+
+class TestRecurrencePlanning(unittest.TestCase):
+    """
+    This class provides unit tests for planning repeating chores against the mock database.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def test_projected_workload(self):
+        """
+        This method tests that the workload of upcoming instances is projected without writing any rows.
+        """
+        chores_before = [chore.to_csv_row() for chore in DataInput.iter_chores()]
+        workload = Recurrence.projected_workload(date(2024, 3, 16), date(2024, 3, 22), today=TODAY)
+        self.assertEqual(workload, {
+            "95454c41-dc2f-451e-97b5-1d53b31cfa16": 15,  # dishwasher on the 21st
+            "c55b4c05-2f74-4bfb-8077-03192dd74aab": 7 * 15,  # cats every day
+            "0c9ef357-f312-4f85-93c0-16672244a2b5": 20,  # clothes on the 22nd
+            None: 2 * 30,  # unassigned vacuuming on the 17th and 20th
+        })
+        self.assertEqual([chore.to_csv_row() for chore in DataInput.iter_chores()], chores_before)
+        logging.debug("Passed test_projected_workload")
+
+    def test_materialize_upcoming(self):
+        """
+        This method tests that upcoming instances are stored once, following each chore's rule.
+        """
+        vacuum = DataInput.get_chore_by_id("7cb263c2-52f5-4077-971e-491d3d19ed29")
+        vacuum.recurrence = "weekly:mon,thu"
+        DataInput.update_chore_by_object(vacuum)
+
+        planned = Recurrence.materialize_upcoming(7, today=TODAY)
+        self.assertEqual(len(planned), 1 + 7 + 1 + 2)
+        vacuums = [chore for chore in DataInput.iter_chores() if chore.name == "Vacuum"]
+        self.assertEqual([(chore.id, chore.deadline_date, chore.status) for chore in vacuums[1:]], [
+            ("7cb263c2-52f5-4077-971e-491d3d19ed29(1)", date(2024, 3, 18), CHORE_STATUS.UNASSIGNED),
+            ("7cb263c2-52f5-4077-971e-491d3d19ed29(2)", date(2024, 3, 21), CHORE_STATUS.UNASSIGNED),
+        ])
+        self.assertEqual(vacuums[-1].recurrence, "weekly:mon,thu")
+        # planning again adds nothing
+        self.assertEqual(Recurrence.materialize_upcoming(7, today=TODAY), [])
+        logging.debug("Passed test_materialize_upcoming")
+
+    def test_renew_planned_chore(self):
+        """
+        This method tests that renewing a chore whose next instance was planned ahead does not duplicate it.
+        """
+        Recurrence.materialize_upcoming(1, today=TODAY)
+        AutoAssign.renew_repeating_chores()
+        cats = [chore for chore in DataInput.iter_chores() if chore.name == "Feed the cats"]
+        self.assertEqual([chore.id for chore in cats], ["b2c10fdc-f023-4360-9bf6-d62122333039",
+                                                        "b2c10fdc-f023-4360-9bf6-d62122333039(1)"])
+        self.assertEqual(cats[0].status, CHORE_STATUS.RENEWED)
+        self.assertEqual(cats[1].deadline_date, date(2024, 3, 16))
+        self.assertEqual(cats[1].status, CHORE_STATUS.ASSIGNED)
+        logging.debug("Passed test_renew_planned_chore")
+
+
+if __name__ == "__main__":
+    unittest.main()
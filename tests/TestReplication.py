@@ -0,0 +1,208 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the change log of the DataInput.py module and the Replication.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import os
+import json
+import shutil
+
+# module to test
+import DataInput
+import Metrics
+import Replication
+import flask_integration
+from DataInput import CHORE_STATUS
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+# occupants and chores of the mock database
+FRED = "95454c41-dc2f-451e-97b5-1d53b31cfa16"
+DISHWASHER = "f79759a1-47ef-42c4-9879-c353c3329f50"
+VACUUM = "7cb263c2-52f5-4077-971e-491d3d19ed29"
+
+
+class TestReplication(unittest.TestCase):
+    """
+    This class provides unit tests for the change log and the replicas following it.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files and change log
+        self.replacements = [
+            ("./csvs/chores.csv", "./csvs/tmp_chores.csv"),
+            ("./csvs/occupants.csv", "./csvs/tmp_occupants.csv"),
+            ("./csvs/" + DataInput.CHANGE_LOG_FILENAME, "./csvs/tmp_" + DataInput.CHANGE_LOG_FILENAME),
+        ]
+        for old_name, new_name in self.replacements:
+            try:
+                os.rename(old_name, new_name)
+            except FileNotFoundError:
+                logging.debug(f"No file to preserve: {old_name}")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        self.saved_change_log = DataInput.CHANGE_LOG
+        DataInput.CHANGE_LOG = True
+        DataInput.take_change_sequence()
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        DataInput.CHANGE_LOG = self.saved_change_log
+        for old_name, new_name in self.replacements:
+            try:
+                os.replace(new_name, old_name)
+            except FileNotFoundError:
+                logging.debug(f"No file to restore: {old_name}")
+                if os.path.exists(old_name):
+                    os.remove(old_name)
+        logging.debug("Restored files in tearDown")
+
+    def read_change_log(self) -> list[dict]:
+        with open(DataInput.change_log_filepath()) as file:
+            return [json.loads(line) for line in file]
+
+    def assert_replica_matches(self, replica: Replication.ChoreReplica):
+        """Check that the replica holds the same chores and occupants as the CSV files."""
+        self.assertEqual([chore.to_csv_row() for chore in replica.iter_chores()],
+                         [chore.to_csv_row() for chore in DataInput.iter_chores()])
+        self.assertEqual(replica.occupants_names_and_uids(),
+                         DataInput.retrieve_occupants_names_and_uids(DataInput.OCCUPANTS_FILEPATH))
+
+    def test_change_log(self):
+        """
+        This method tests that every write is logged, in sequence, starting with a snapshot.
+        """
+        DataInput.set_chore_complete(DISHWASHER)
+        self.assertEqual(DataInput.take_change_sequence(), 1)
+        self.assertIsNone(DataInput.take_change_sequence())
+        with DataInput.batched_chore_writes():
+            DataInput.new_chore_by_args("Weed", "Weed the beds", id="weed")
+            DataInput.new_chore_by_args("Mow", "Mow the lawn", id="mow")
+        self.assertEqual(DataInput.take_change_sequence(), 2)
+        DataInput.add_occupant_name(DataInput.OCCUPANTS_FILEPATH, "ann-uid", "Ann", "secret")
+        DataInput.remove_user("Ann", DataInput.OCCUPANTS_FILEPATH)
+        changes = self.read_change_log()
+        self.assertEqual([change['seq'] for change in changes], [1, 2, 3, 4])
+        # the first entry holds the data files, with the write that started the log
+        chores = {row['Chore ID']: row for row in changes[0]['snapshot']['chores']}
+        self.assertEqual(chores[DISHWASHER]['Status'], CHORE_STATUS.COMPLETED.value)
+        self.assertEqual(changes[0]['snapshot']['occupants'][1][0], FRED)
+        self.assertEqual(changes[1]['table'], 'chores')
+        self.assertEqual(sorted(changes[1]['rows']), ["mow", "weed"])
+        self.assertEqual(changes[1]['rows']["weed"]['Assignee ID'], '')
+        self.assertEqual(changes[2]['rows'], {"ann-uid": ["ann-uid", "Ann", "secret"]})
+        self.assertEqual(changes[3]['rows'], {"ann-uid": None})
+        # compaction keeps the numbering
+        self.assertEqual(DataInput.compact_change_log(), 4)
+        DataInput.new_chore_by_args("Rake", "Rake the leaves")
+        self.assertEqual(DataInput.take_change_sequence(), 5)
+        self.assertEqual([change['seq'] for change in self.read_change_log()], [4, 5])
+        # nothing is logged with the change log off
+        DataInput.CHANGE_LOG = False
+        DataInput.new_chore_by_args("Sweep", "Sweep the porch")
+        self.assertIsNone(DataInput.take_change_sequence())
+        self.assertEqual(len(self.read_change_log()), 2)
+        logging.debug("Passed test_change_log")
+
+    def test_follower(self):
+        """
+        This method tests that a replica applies the change log, across compactions and incomplete lines.
+        """
+        replica = Replication.ChoreReplica()
+        self.assertEqual(replica.poll(), 0)
+        DataInput.set_chore_complete(DISHWASHER)
+        metrics_enabled = Metrics.is_enabled()
+        Metrics.enable()
+        Metrics.reset()
+        try:
+            self.assertEqual(replica.poll(), 1)
+            self.assertEqual(Metrics.REPLICA_SEQUENCE.get(), 1)
+            self.assertGreaterEqual(Metrics.REPLICATION_LAG.get(), 0)
+        finally:
+            Metrics.reset()
+            Metrics.enable(metrics_enabled)
+        self.assert_replica_matches(replica)
+        self.assertEqual(replica.get_chore_by_id(DISHWASHER).status, CHORE_STATUS.COMPLETED)
+
+        chore = DataInput.get_chore_by_id(VACUUM)
+        chore.status, chore.assignee_id = CHORE_STATUS.ASSIGNED, FRED
+        DataInput.update_chore_by_object(chore)
+        DataInput.add_occupant_name(DataInput.OCCUPANTS_FILEPATH, "ann-uid", "Ann", "secret")
+        self.assertTrue(replica.wait_for(DataInput.take_change_sequence(), timeout=0))
+        self.assert_replica_matches(replica)
+        fred_assigned = replica.iter_chores(assignee_id=FRED, status=CHORE_STATUS.ASSIGNED)
+        self.assertEqual([chore.name for chore in fred_assigned], ["Vacuum"])
+        self.assertEqual(replica.retrieve_occupant_uid_from_username("Ann"), "ann-uid")
+
+        # a line still being appended is left for the next poll, and dropped by the next writer if abandoned
+        with open(DataInput.change_log_filepath(), 'a') as file:
+            file.write('{"seq": 4, "ti')
+        self.assertEqual(replica.poll(), 0)
+        DataInput.remove_user("Ann", DataInput.OCCUPANTS_FILEPATH)
+        self.assertEqual(DataInput.take_change_sequence(), 4)
+        self.assertEqual(replica.poll(), 1)
+
+        # after compaction, the replica skips what it already has, and a new one starts from the snapshot
+        DataInput.compact_change_log()
+        DataInput.new_chore_by_args("Weed", "Weed the beds", category="Garden")
+        self.assertEqual(replica.poll(), 1)
+        self.assert_replica_matches(replica)
+        new_replica = Replication.ChoreReplica()
+        self.assertEqual(new_replica.poll(), 2)
+        self.assertEqual(new_replica.sequence, 5)
+        self.assert_replica_matches(new_replica)
+        self.assertFalse(new_replica.wait_for(6, timeout=0))
+        replica.stop()
+        new_replica.stop()
+        logging.debug("Passed test_follower")
+
+    def test_read_your_writes(self):
+        """
+        This method tests that a follower serves a client's write once its replica has applied it.
+        """
+        client = flask_integration.app.test_client()
+        saved_replica, saved_timeout = flask_integration.replica, Replication.WAIT_TIMEOUT
+        flask_integration.replica = Replication.ChoreReplica().start(interval=0.01)
+        Replication.WAIT_TIMEOUT = 0.05
+        try:
+            response = client.post('/chore/complete', data={'chore_id': DISHWASHER})
+            sequence = response.headers['X-Haus-Sequence']
+            chores = client.post('/chore/serve', data={'user': ''},
+                                 headers={'X-Haus-Min-Sequence': sequence}).get_json()
+            self.assertEqual(chores, [chore.to_csv_row() for chore in
+                                      DataInput.iter_chores(status=CHORE_STATUS.ASSIGNED)])
+            self.assertNotIn(DISHWASHER, [chore['Chore ID'] for chore in chores])
+            users = client.get('/user/serve').get_json()
+            self.assertIn({"name": "Fred Fredson", "UserID": FRED}, users)
+            # reads without a sequence number are not held up by writes the replica has not seen
+            response = client.post('/chore/serve', data={'user': '', 'min_sequence': int(sequence) + 1})
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(client.post('/chore/serve', data={'user': ''}).status_code, 200)
+        finally:
+            flask_integration.replica.stop()
+            flask_integration.replica, Replication.WAIT_TIMEOUT = saved_replica, saved_timeout
+        logging.debug("Passed test_read_your_writes")
+
+
+if __name__ == "__main__":
+    unittest.main()
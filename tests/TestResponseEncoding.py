@@ -0,0 +1,86 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the ResponseEncoding.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import gzip
+import json
+from datetime import date
+
+# module to test
+import ResponseEncoding
+import flask_integration
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+ROWS = [{"Chore ID": "a", "Chore Name": "Vacuum", "Expected Duration": "30"},
+        {"Chore ID": "b", "Chore Name": "Dusting", "Expected Duration": "20"}]
+COLUMNS = ["Chore ID", "Chore Name", "Expected Duration"]
+
+
+class TestResponseEncoding(unittest.TestCase):
+    """
+    This class provides unit tests for serializing and compressing replies.
+    """
+
+    def test_stream_formats(self):
+        """
+        This method tests that both formats stream valid JSON, whatever the number of rows.
+        """
+        for count in (0, 1, 2 * ResponseEncoding.STREAM_CHUNK_ROWS + 1):
+            rows = [dict(ROWS[0], **{"Chore ID": str(i)}) for i in range(count)]
+            self.assertEqual(json.loads(b''.join(ResponseEncoding.stream_objects(rows))), rows)
+            self.assertEqual(json.loads(b''.join(ResponseEncoding.stream_columnar(COLUMNS, rows))),
+                             ResponseEncoding.columnar(COLUMNS, rows))
+        self.assertEqual(ResponseEncoding.columnar(COLUMNS, ROWS)["rows"][1], ["b", "Dusting", "20"])
+        logging.debug("Passed test_stream_formats")
+
+    def test_json_provider(self):
+        """
+        This method tests that jsonify replies the same with the fast provider as with Flask's own.
+        """
+        value = {"b": [1, None, "é"], "a": date(2024, 3, 15)}
+        provider = ResponseEncoding.FastJSONProvider(flask_integration.app)
+        default = ResponseEncoding.DefaultJSONProvider(flask_integration.app)
+        self.assertEqual(json.loads(provider.dumps(value)), json.loads(default.dumps(value)))
+        self.assertEqual(list(json.loads(provider.dumps(value))), ["a", "b"])
+        logging.debug("Passed test_json_provider")
+
+    def test_negotiate_encoding(self):
+        """
+        This method tests choosing the content coding from the Accept-Encoding header.
+        """
+        self.assertEqual(ResponseEncoding.negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(ResponseEncoding.negotiate_encoding("*"), ResponseEncoding.ENCODINGS[0])
+        self.assertIsNone(ResponseEncoding.negotiate_encoding("gzip;q=0, identity"))
+        self.assertIsNone(ResponseEncoding.negotiate_encoding(""))
+        logging.debug("Passed test_negotiate_encoding")
+
+    def test_compress_stream(self):
+        """
+        This method tests that a compressed stream decompresses to the original chunks.
+        """
+        chunks = [b'[', b'"' + b'x' * 5000 + b'"', ',', b'1]']
+        for encoding in ResponseEncoding.ENCODINGS:
+            compressed = b''.join(ResponseEncoding.compress_stream(chunks, encoding))
+            self.assertEqual(compressed, ResponseEncoding.compress(b''.join(
+                chunk.encode() if isinstance(chunk, str) else chunk for chunk in chunks), encoding))
+        self.assertEqual(gzip.decompress(b''.join(ResponseEncoding.compress_stream(chunks, 'gzip'))),
+                         b'["' + b'x' * 5000 + b'",1]')
+        with self.assertRaises(ValueError):
+            ResponseEncoding.compress(b'', 'deflate')
+        logging.debug("Passed test_compress_stream")
+
+
+if __name__ == "__main__":
+    unittest.main()
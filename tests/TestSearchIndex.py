@@ -0,0 +1,126 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the SearchIndex.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import os
+import shutil
+
+# module to test
+import SearchIndex
+import DataInput
+import flask_integration
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+# chores of the mock database
+FEED_CATS = "b2c10fdc-f023-4360-9bf6-d62122333039"
+VACUUM = "7cb263c2-52f5-4077-971e-491d3d19ed29"
+DUSTING = "575e2770-e278-4dc5-95a3-e918ecebdc31"
+
+
+class TestSearchIndex(unittest.TestCase):
+    """
+    This class provides unit tests for searching chores and keeping the index up to date.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        self.index = SearchIndex.ChoreSearchIndex()
+        DataInput.register_chore_listener(self.index.chores_changed)
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        DataInput.unregister_chore_listener(self.index.chores_changed)
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def matches(self, query: str) -> list[str]:
+        return [chore_id for chore_id, _ in self.index.search(query)[1]]
+
+    def test_search(self):
+        """
+        This method tests matching every word of a query, by prefix, in any field.
+        """
+        self.assertEqual(sorted(self.matches("General")), sorted([VACUUM, DUSTING]))
+        self.assertEqual(self.matches("vac ALL"), [VACUUM])
+        self.assertEqual(self.matches("dust"), [DUSTING])
+        self.assertEqual(self.matches("vacuum dust"), [])
+        self.assertEqual(self.index.search("  "), (0, []))
+        self.assertEqual(SearchIndex.words("Throw 'em in, add soap"), ["throw", "em", "in", "add", "soap"])
+        logging.debug("Passed test_search")
+
+    def test_ranking(self):
+        """
+        This method tests that exact matches in the name rank above others, and that pages follow the ranking.
+        """
+        DataInput.new_chore_by_args("Brush", "Brush the cats", id="brush")
+        DataInput.new_chore_by_args("Catch mice", "Before the cats do", id="mice")
+        # the name counts more than the description, and ties keep the order of the CSV
+        self.assertEqual(self.matches("cats"), [FEED_CATS, "brush", "mice"])
+        # by prefix, "cat" also matches "catch", which is rarer than "cats" and so counts more
+        self.assertEqual(self.matches("cat"), ["mice", FEED_CATS, "brush"])
+        total, page = self.index.search("cats", limit=1, offset=1)
+        self.assertEqual((total, [chore_id for chore_id, _ in page]), (3, ["brush"]))
+        # the new chores were indexed without rebuilding the index
+        self.assertEqual(self.index.rebuilds, 1)
+        logging.debug("Passed test_ranking")
+
+    def test_update_and_external_write(self):
+        """
+        This method tests that changed chores are indexed again, and that writes of other processes rebuild the index.
+        """
+        self.matches("vacuum")
+        vacuum = DataInput.get_chore_by_id(VACUUM)
+        vacuum.name = "Hoover"
+        DataInput.update_chore_by_object(vacuum)
+        self.assertEqual(self.matches("vacuum"), [VACUUM])  # still in the description
+        self.assertEqual(self.matches("hoover"), [VACUUM])
+        self.assertEqual(self.index.rebuilds, 1)
+        with open(DataInput.CHORES_FILEPATH, 'a') as file:
+            file.write("\nd1d7f0c0-6f4e-4c43-9a0e-3ad6a4a37d0e,Mow,The lawn,Garden,60,unassigned,,2024-03-15,7,")
+        self.assertEqual(self.matches("lawn"), ["d1d7f0c0-6f4e-4c43-9a0e-3ad6a4a37d0e"])
+        self.assertEqual(self.index.rebuilds, 2)
+        logging.debug("Passed test_update_and_external_write")
+
+    def test_search_endpoint(self):
+        """
+        This method tests the pages of results of the /chore/search endpoint.
+        """
+        client = flask_integration.app.test_client()
+        reply = client.post('/chore/search', data={'q': 'all', 'per_page': 1, 'page': 2}).get_json()
+        self.assertEqual(reply['total'], 2)
+        self.assertEqual(len(reply['results']), 1)
+        self.assertIn(reply['results'][0]['Chore ID'], [VACUUM, DUSTING])
+        self.assertIn('Score', reply['results'][0])
+        self.assertEqual(client.post('/chore/search', data={'q': 'all', 'page': 0}).status_code, 400)
+        logging.debug("Passed test_search_endpoint")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Author: Haus Team
+Date: 10/19/2026
+
+This file provides tests for the StaticJSON.py module.
+"""
+
+# fix import path
+import Context
+
+# modules
+import unittest
+import os
+import json
+import shutil
+import tempfile
+
+# module to test
+import DataInput
+import StaticJSON
+import flask_integration
+
+# logging configuration
+import logging
+
+logging.basicConfig(level=logging.DEBUG)
+
+# occupants and chores of the mock database
+FRED = "95454c41-dc2f-451e-97b5-1d53b31cfa16"
+JOHN = "c55b4c05-2f74-4bfb-8077-03192dd74aab"
+MARIA = "0c9ef357-f312-4f85-93c0-16672244a2b5"
+DISHWASHER = "f79759a1-47ef-42c4-9879-c353c3329f50"
+VACUUM = "7cb263c2-52f5-4077-971e-491d3d19ed29"
+
+
+class TestStaticJSON(unittest.TestCase):
+    """
+    This class provides unit tests for generating the static JSON files and keeping them up to date.
+    """
+
+    def setUp(self):
+        """
+        Rename database files in the csvs directory to preserve them.
+        They will be restored to their original names after testing.
+        Replace them with mockup database files for testing.
+        """
+        # preserve the original database CSV files
+        os.rename("./csvs/chores.csv", "./csvs/tmp_chores.csv")
+        os.rename("./csvs/occupants.csv", "./csvs/tmp_occupants.csv")
+        # use mockup files
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        shutil.copyfile("./tests/mock_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Replaced files with mockups in setUp")
+        self.directory = tempfile.mkdtemp()
+        self.snapshots = StaticJSON.StaticJSONSnapshots(self.directory)
+        self.client = flask_integration.app.test_client()
+
+    def tearDown(self):
+        """
+        Remove the files generated during these unit tests,
+        Replace them with the versions available prior to testing
+        """
+        self.snapshots.stop()
+        shutil.rmtree(self.directory)
+        os.replace("./csvs/tmp_chores.csv", "./csvs/chores.csv")
+        os.replace("./csvs/tmp_occupants.csv", "./csvs/occupants.csv")
+        logging.debug("Restored files in tearDown")
+
+    def read_json(self, filename: str):
+        with open(os.path.join(self.directory, filename)) as file:
+            return json.load(file)
+
+    def assert_files_match_endpoints(self):
+        """Check that every file holds what the endpoint it stands for serves."""
+        users = self.client.get('/user/serve').get_json()
+        self.assertEqual(self.read_json('users.json'), users)
+        self.assertEqual(self.read_json('chores.json'), self.client.post('/chore/serve', data={'user': ''}).get_json())
+        for user in users:
+            served = self.client.post('/chore/serve', data={'user': user['name']}).get_json()
+            self.assertEqual(self.read_json(f"chores/{user['UserID']}.json"), served)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.directory, 'chores'))),
+                         sorted(f"{user['UserID']}.json" for user in users))
+
+    def test_materialize(self):
+        """
+        This method tests that every file is generated, and that nothing is rewritten while nothing changed.
+        """
+        # users.json, chores.json, the three occupants' files and version.json
+        self.assertEqual(self.snapshots.materialize(), 6)
+        self.assert_files_match_endpoints()
+        self.assertEqual(self.read_json('chores/' + JOHN + '.json'), [])
+        self.assertEqual(self.read_json('version.json')['chores'], DataInput._chore_signature())
+        self.assertEqual(self.snapshots.materialize(), 0)
+        # changes made while no process followed them are noticed
+        shutil.copyfile("./tests/mock_chores.csv", "./csvs/chores.csv")
+        self.assertEqual(self.snapshots.materialize(), 6)
+        logging.debug("Passed test_materialize")
+
+    def test_incremental(self):
+        """
+        This method tests that a write only rewrites the files of the occupants whose chores it changed.
+        """
+        self.snapshots.materialize()
+        self.snapshots.start()
+        fred_file = os.path.join(self.directory, 'chores', FRED + '.json')
+        maria_file = os.path.join(self.directory, 'chores', MARIA + '.json')
+        maria_inode = os.stat(maria_file).st_ino
+        DataInput.set_chore_complete(DISHWASHER)
+        self.assertTrue(self.snapshots.flush(timeout=5))
+        # Fred's file, chores.json and version.json
+        self.assertEqual(self.snapshots.files_written, 6 + 3)
+        self.assertEqual(os.stat(maria_file).st_ino, maria_inode)
+        with open(fred_file) as file:
+            self.assertEqual(json.load(file), [])
+        # a chore nobody is assigned to changes no occupant's file: only chores.json and version.json
+        chore = DataInput.get_chore_by_id(VACUUM)
+        chore.description = "Vacuum the stairs too"
+        DataInput.update_chore_by_object(chore)
+        self.assertTrue(self.snapshots.flush(timeout=5))
+        self.assertEqual(self.snapshots.files_written, 6 + 3 + 2)
+        # nor does a new chore
+        DataInput.new_chore_by_args("Water the plants", "Every plant in the living room")
+        self.assertTrue(self.snapshots.flush(timeout=5))
+        self.assertEqual(self.snapshots.files_written, 6 + 3 + 2 + 2)
+        self.assertEqual(os.stat(maria_file).st_ino, maria_inode)
+        self.assertEqual(self.read_json('version.json')['chores'], DataInput._chore_signature())
+        # occupants who join get a file, those who leave lose theirs
+        DataInput.add_occupant_name(DataInput.OCCUPANTS_FILEPATH, "ann-uid", "Ann", "secret")
+        DataInput.remove_user("John Johnson", DataInput.OCCUPANTS_FILEPATH)
+        self.snapshots.stop()
+        self.snapshots.materialize()
+        self.assert_files_match_endpoints()
+        logging.debug("Passed test_incremental")
+
+
+if __name__ == "__main__":
+    unittest.main()